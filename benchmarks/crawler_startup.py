@@ -0,0 +1,105 @@
+'''
+Per-run startup overhead: `scrapy crawl` subprocess vs in-process CrawlerService.
+
+Both variants run the same no-op spider (no start URLs), so the measured time
+is pure runtime overhead: interpreter start, Scrapy/Twisted imports, settings
+loading, crawler/engine setup and teardown.
+
+Item pipelines are disabled by default so the benchmark runs without a broker;
+pass --with-broker to include the RabbitMQ connection (opened per subprocess,
+shared across in-process runs). The seen-URL index, crawl metrics and listing
+state of both variants are written to a temporary directory, not to `meta/`.
+
+Usage:
+    python -m benchmarks.crawler_startup --runs 5
+'''
+import os
+import time
+import shutil
+import tempfile
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List
+
+import scrapy
+from scrapy.utils.project import get_project_settings
+
+
+class NoopSpider(scrapy.Spider):
+    '''Spider without start URLs: opens and closes immediately.'''
+    name = 'noop'
+    start_urls: List[str] = []
+
+
+def state_settings(state_dir: str) -> Dict[str, str]:
+    '''Settings redirecting the crawl state and metrics files into `state_dir`.'''
+    return {
+        'SEEN_URL_INDEX_PATH': os.path.join(state_dir, 'seen_urls.bloom'),
+        'CRAWL_METRICS_FILE': os.path.join(state_dir, 'metrics', 'crawl_runs.jsonl'),
+        'LISTING_STATE_DIR': state_dir,
+    }
+
+
+def measure_subprocess(runs: int, with_broker: bool, state_dir: str) -> List[float]:
+    '''Time `scrapy runspider` of the no-op spider in a fresh process per run.'''
+    cmd = ['scrapy', 'runspider', os.path.abspath(__file__), '-s', 'LOG_LEVEL=WARNING']
+    for name, value in state_settings(state_dir).items():
+        cmd += ['-s', f'{name}={value}']
+    if not with_broker:
+        cmd += ['-s', 'ITEM_PIPELINES={}']
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def measure_in_process(runs: int, with_broker: bool, state_dir: str) -> List[float]:
+    '''Time runs of the no-op spider inside one long-lived CrawlerService.'''
+    from scheduler.crawler_service import CrawlerService
+
+    settings = get_project_settings()
+    settings.set('LOG_LEVEL', 'WARNING', priority='cmdline')
+    for name, value in state_settings(state_dir).items():
+        settings.set(name, value, priority='cmdline')
+    if not with_broker:
+        settings.set('ITEM_PIPELINES', {}, priority='cmdline')
+
+    service = CrawlerService(settings)
+    service.start()
+
+    timings = []
+    for _ in range(runs):
+        timings.append(service.crawl(NoopSpider)['duration'])
+    service.stop()
+    return timings
+
+
+def report(label: str, timings: List[float]) -> None:
+    print(f'[Benchmark] {label:<12} median {statistics.median(timings) * 1000:8.1f} ms  '
+          f'min {min(timings) * 1000:8.1f} ms  max {max(timings) * 1000:8.1f} ms')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure per-run crawler startup overhead.')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per variant.')
+    parser.add_argument('--with-broker', action='store_true', help='Keep the RabbitMQ pipeline enabled.')
+    args = parser.parse_args()
+
+    state_dir = tempfile.mkdtemp(prefix='crawler-startup-')
+    try:
+        sub = measure_subprocess(args.runs, args.with_broker, state_dir)
+        inproc = measure_in_process(args.runs, args.with_broker, state_dir)
+    finally:
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+    report('subprocess', sub)
+    report('in-process', inproc)
+    print(f'[Benchmark] Saved per run: {(statistics.median(sub) - statistics.median(inproc)) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+'''
+Benchmark of the listing date parsers.
+
+Compares, over listing date strings:
+    - legacy: the previous `parse_date` (chained replaces, substring sniffing,
+      linear month-name scan)
+    - registry: the per-site compiled parser, without the per-string cache
+    - cached: the per-site compiled parser with its string LRU cache (as used by the spiders)
+
+The strings are either captured listing dates (`--strings-file`, one
+`<site>\t<date string>` per line) or rendered from the publication dates of
+`data/raw` the way each site prints them (Jalali month-name dates in `time`
+elements, ISO 8601 in tarafdari's `abbr/@title`).
+
+Usage:
+    python -m benchmarks.date_parser_benchmark
+    python -m benchmarks.date_parser_benchmark --raw-dir data/raw --limit 20000
+    python -m benchmarks.date_parser_benchmark --strings-file listing_dates.tsv
+'''
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+
+import jdatetime
+
+from benchmarks.corpus import load_raw_corpus
+from scrapy_app.spiders.isna import IsnaSpider
+from scrapy_app.spiders.khabaronline import KhabaronlineSpider
+from scrapy_app.spiders.mashreghnews import MashreghnewsSpider
+from scrapy_app.spiders.mehrnews import MehrnewsSpider
+from scrapy_app.spiders.tarafdari import TarafdariSpider
+from utils.date_parser import DATE_PARSERS, month_map
+
+# site -> DATE_FORMAT of its spider
+SITE_FORMATS = {
+    spider.name: spider.DATE_FORMAT
+    for spider in (IsnaSpider, KhabaronlineSpider, MashreghnewsSpider, MehrnewsSpider, TarafdariSpider)
+}
+
+_FA_DIGITS = str.maketrans('0123456789', '۰۱۲۳۴۵۶۷۸۹')
+_MONTH_NAMES = {number: name for name, number in month_map.items()}
+
+
+def legacy_parse_date(date_str: str) -> datetime:
+    '''
+    The `parse_date` implementation replaced by the parser registry (reference only).
+    '''
+    for f, e in zip("۰۱۲۳۴۵۶۷۸۹", "0123456789"):
+        date_str = date_str.replace(f, e)
+    date_str = date_str.strip()
+
+    if "T" in date_str:
+        return datetime.fromisoformat(date_str).replace(tzinfo=None)
+
+    if "-" in date_str and any(m in date_str for m in month_map):
+        date_part, time_part = date_str.split(" - ")
+        day_str, month_name, year_str = date_part.split()
+        year = int(year_str)
+        if year < 100:
+            year += 1400
+        hour, minute = map(int, time_part.split(":"))
+        return jdatetime.datetime(year, month_map[month_name], int(day_str), hour, minute).togregorian()
+
+    if "-" in date_str and " " in date_str:
+        date_part, time_part = date_str.split(" ")
+        year, month, day = map(int, date_part.split("-"))
+        if year < 100:
+            year += 1400
+        hour, minute = map(int, time_part.split(":"))
+        return jdatetime.datetime(year, month, day, hour, minute).togregorian()
+
+    raise ValueError(f"Unrecognized date format: {date_str}")
+
+
+def render_listing_date(site: str, dt: datetime) -> str:
+    '''
+    Render a publication datetime the way the site's listing page shows it.
+
+    Args:
+        site: Site (spider) name.
+        dt: Naive Tehran-time publication datetime.
+
+    Returns:
+        The listing date string.
+    '''
+    if SITE_FORMATS.get(site) == 'iso':
+        return dt.strftime('%Y-%m-%dT%H:%M:%S') + '+03:30'
+    j = jdatetime.datetime.fromgregorian(datetime=dt)
+    text = f'{j.day} {_MONTH_NAMES[j.month]} {j.year % 100:02d} - {j.hour:02d}:{j.minute:02d}'
+    return text.translate(_FA_DIGITS)
+
+
+def sample_strings(raw_dir: str, limit: int, synthetic_size: int) -> List[Tuple[str, str]]:
+    '''
+    Build (site, listing date string) pairs from `data/raw`, or synthetic ones.
+
+    Args:
+        raw_dir: Raw JSON directory.
+        limit: Maximum raw articles to read.
+        synthetic_size: Number of strings to generate when no raw article exists.
+
+    Returns:
+        List of (site, date string).
+    '''
+    pairs = []
+    for article in load_raw_corpus(raw_dir, limit):
+        site = article.get('site_name')
+        published = article.get('publication_date')
+        if site in SITE_FORMATS and published:
+            pairs.append((site, render_listing_date(site, datetime.fromisoformat(published))))
+    if pairs:
+        return pairs
+
+    # Publication minutes spread over three days: busy listings repeat minutes
+    rng = random.Random(42)
+    start = datetime(2025, 12, 1)
+    sites = list(SITE_FORMATS)
+    return [
+        (site, render_listing_date(site, start + timedelta(minutes=rng.randrange(3 * 24 * 60))))
+        for site in (rng.choice(sites) for _ in range(synthetic_size))
+    ]
+
+
+def load_strings_file(path: str) -> List[Tuple[str, str]]:
+    '''Read `<site>\\t<date string>` lines.'''
+    with open(path, 'r', encoding='utf-8') as f:
+        return [tuple(line.rstrip('\n').split('\t', 1)) for line in f if '\t' in line]
+
+
+def measure(parse: Callable[[str, str], datetime], pairs: List[Tuple[str, str]], repeat: int) -> Tuple[float, int]:
+    '''
+    Time a parser over all pairs.
+
+    Returns:
+        (best seconds per pass, failures in one pass)
+    '''
+    best, failures = float('inf'), 0
+    for _ in range(repeat):
+        failures = 0
+        start = time.perf_counter()
+        for site, date_str in pairs:
+            try:
+                parse(site, date_str)
+            except (ValueError, KeyError):
+                failures += 1
+        best = min(best, time.perf_counter() - start)
+    return best, failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Listing date parser benchmark')
+    parser.add_argument('--raw-dir', default='data/raw', help='raw JSON directory')
+    parser.add_argument('--limit', type=int, default=20000, help='maximum raw articles to read')
+    parser.add_argument('--synthetic-size', type=int, default=20000, help='strings generated when data/raw is empty')
+    parser.add_argument('--strings-file', help='captured "<site>\\t<date string>" lines')
+    parser.add_argument('--repeat', type=int, default=5, help='passes per parser (best is reported)')
+    args = parser.parse_args()
+
+    pairs = load_strings_file(args.strings_file) if args.strings_file else \
+        sample_strings(args.raw_dir, args.limit, args.synthetic_size)
+    distinct = len({s for _, s in pairs})
+    print(f'[Benchmark] {len(pairs)} listing dates ({distinct} distinct)')
+
+    uncached = {fmt: fn.__wrapped__ for fmt, fn in DATE_PARSERS.items()}
+
+    def registry(site: str, date_str: str) -> datetime:
+        return uncached[SITE_FORMATS.get(site, 'auto')](date_str)
+
+    def cached(site: str, date_str: str) -> datetime:
+        return DATE_PARSERS[SITE_FORMATS.get(site, 'auto')](date_str)
+
+    results = {}
+    for name, fn in (('legacy', lambda site, s: legacy_parse_date(s)), ('registry', registry)):
+        results[name] = measure(fn, pairs, args.repeat)
+
+    # The cache is cleared so the reported pass includes its misses
+    for fn in DATE_PARSERS.values():
+        fn.cache_clear()
+    results['cached'] = measure(cached, pairs, 1)
+
+    baseline = results['legacy'][0]
+    for name, (seconds, failures) in results.items():
+        print(f'[Benchmark] {name:9s} {len(pairs) / seconds:12,.0f} dates/sec '
+              f'({baseline / seconds:5.1f}x legacy), {failures} failures')
+
+
+if __name__ == '__main__':
+    main()
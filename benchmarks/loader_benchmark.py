@@ -0,0 +1,161 @@
+'''
+Offline benchmark of the dashboard DataFrame construction.
+
+Builds the dashboard DataFrame from a synthetic set of sentiment articles held
+in memory (file reading excluded) with:
+    - records:  one dict per article, `pd.DataFrame(records)` and the former
+                `.apply` passes over the `sentiment` dicts (object columns)
+    - columns:  `MetadataColumns`, the typed column-wise build of the JSON backend
+    - arrow:    `SentimentDataLoader._arrow_frame`, the build of the columnar backend
+
+and reports for each:
+    - build time (best of `--repeat` runs)
+    - peak Python memory during the build (tracemalloc, numpy buffers included;
+      Arrow buffers are allocated outside of it)
+    - memory of the resulting DataFrame (`memory_usage(deep=True)`)
+
+Usage:
+    python -m benchmarks.loader_benchmark
+    python -m benchmarks.loader_benchmark --size 50000 --strategies columns arrow
+'''
+import time
+import random
+import argparse
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.corpus import BOILERPLATE, WORDS
+from storage.columnar_store import ARTICLE_SCHEMA, to_row
+from streamlit_app.services.data_loader import METADATA_COLUMNS, MetadataColumns, SentimentDataLoader
+
+
+def synthetic_sentiments(size: int = 500_000, seed: int = 42) -> List[Tuple[str, Dict[str, Any]]]:
+    '''
+    Build a deterministic set of stored sentiment articles.
+
+    Bodies are kept short so half a million articles fit in memory; the
+    metadata columns have realistic cardinalities (a few sites and labels,
+    unique titles and URLs).
+
+    Args:
+        size: Number of articles to generate.
+        seed: Random seed (the same seed always yields the same set).
+
+    Returns:
+        (key, article) pairs.
+    '''
+    rng = random.Random(seed)
+    sites = list(BOILERPLATE)
+    labels = ['positive', 'negative', 'neutral']
+    articles = []
+    for i in range(size):
+        site = sites[i % len(sites)]
+        timestamp = 1764570600 + i * 60
+        articles.append((f'{site}-{i:032x}', {
+            'title': ' '.join(rng.choice(WORDS) for _ in range(8)),
+            'publication_date': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(timestamp)),
+            'publication_timestamp': timestamp,
+            'content': ' '.join(rng.choice(WORDS) for _ in range(20)),
+            'summary': None,
+            'category': [rng.choice(['سیاسی', 'اقتصادی', 'ورزشی'])],
+            'tags': [rng.choice(WORDS)],
+            'url': f'https://example.com/{site}/news/{i}',
+            'site_name': site,
+            'sentiment': {
+                'sentiment': rng.choice(labels),
+                'confidence': str(rng.randint(0, 100)),
+                'reason': ' '.join(rng.choice(WORDS) for _ in range(6)),
+            },
+        }))
+    return articles
+
+
+def build_records(articles: List[Tuple[str, Dict[str, Any]]]) -> pd.DataFrame:
+    '''Former construction: full records, then one `.apply` pass per sentiment field.'''
+    df = pd.DataFrame([dict(doc, filename=f'{key}.json') for key, doc in articles])
+    df['publication_date'] = pd.to_datetime(df['publication_date'], errors='coerce')
+    df['sentiment_label'] = df['sentiment'].apply(lambda x: x.get('sentiment') if isinstance(x, dict) else None)
+    df['sentiment_confidence'] = df['sentiment'].apply(lambda x: int(x.get('confidence', 0)) if isinstance(x, dict) else 0)
+    df['sentiment_reason'] = df['sentiment'].apply(lambda x: x.get('reason') if isinstance(x, dict) else None)
+    return df
+
+
+def build_columns(articles: List[Tuple[str, Dict[str, Any]]]) -> pd.DataFrame:
+    '''JSON backend construction: typed columns accumulated while reading.'''
+    columns = MetadataColumns()
+    for key, doc in articles:
+        columns.append(f'{key}.json', doc)
+    return columns.frame()
+
+
+def arrow_table(articles: List[Tuple[str, Dict[str, Any]]]) -> pa.Table:
+    '''Columnar store table of the articles, as read by the loader (metadata columns only).'''
+    table = pa.Table.from_pylist([to_row(key, doc) for key, doc in articles], schema=ARTICLE_SCHEMA)
+    return table.select(['key', 'site_name', 'publication_date', 'publication_timestamp', 'title', 'url', 'sentiment'])
+
+
+def measure(build: Callable[[], pd.DataFrame], repeat: int) -> Dict[str, float]:
+    '''
+    Time a build, then trace its peak memory in a separate run.
+
+    Args:
+        build: Builds the DataFrame.
+        repeat: Timed runs (best is reported).
+
+    Returns:
+        `seconds`, `peak_mb` and `frame_mb`.
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = build()
+        best = min(best, time.perf_counter() - start)
+        del df
+
+    tracemalloc.start()
+    try:
+        df = build()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'seconds': best,
+        'peak_mb': peak / 2**20,
+        'frame_mb': df.memory_usage(deep=True).sum() / 2**20,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the dashboard DataFrame construction.')
+    parser.add_argument('--size', type=int, default=500_000, help='Number of articles.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs (best is reported).')
+    parser.add_argument('--strategies', nargs='+', default=['records', 'columns', 'arrow'],
+                        choices=['records', 'columns', 'arrow'], help='Constructions to measure.')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    articles = synthetic_sentiments(args.size)
+    print(f'[Benchmark] Corpus: {len(articles)} articles (synthetic, {time.perf_counter() - start:.1f}s)')
+
+    builds: Dict[str, Callable[[], pd.DataFrame]] = {
+        'records': lambda: build_records(articles),
+        'columns': lambda: build_columns(articles),
+    }
+    if 'arrow' in args.strategies:
+        table = arrow_table(articles)
+        builds['arrow'] = lambda: SentimentDataLoader._arrow_frame(table)
+
+    print(f'[Benchmark] {"strategy":<10} {"build s":>9} {"peak MB":>9} {"frame MB":>9}')
+    for name in args.strategies:
+        result = measure(builds[name], args.repeat)
+        print(f'[Benchmark] {name:<10} {result["seconds"]:>9.2f} {result["peak_mb"]:>9.1f} {result["frame_mb"]:>9.1f}')
+
+    print(f'[Benchmark] Metadata columns: {", ".join(METADATA_COLUMNS)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+'''
+Offline benchmark of the preprocessing stage.
+
+Runs `PreprocessPipeline` (boilerplate stripping, `TextCleaner`, quality gate)
+end to end over a fixed corpus without RabbitMQ and reports:
+    - articles/sec
+    - time spent in each stage and each cleaning step
+    - peak Python memory (tracemalloc)
+
+Usage:
+    python -m benchmarks.preprocess_benchmark
+    python -m benchmarks.preprocess_benchmark --raw-dir data/raw --limit 1000
+    python -m benchmarks.preprocess_benchmark --synthetic --profile preprocess.prof
+
+For a sampling profile, run the same command under an external sampler, e.g.
+    py-spy record -o preprocess.svg -- python -m benchmarks.preprocess_benchmark --no-memory
+'''
+import time
+import pstats
+import argparse
+import cProfile
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+from benchmarks.corpus import load_raw_corpus, synthetic_corpus
+from preprocessing.pipeline import PreprocessPipeline
+from utils.config_manager import ConfigManager
+
+
+def run_pipeline(pipeline: PreprocessPipeline, articles: List[Dict[str, Any]]) -> float:
+    '''
+    Run the pipeline over copies of the articles.
+
+    Args:
+        pipeline: Freshly built pipeline (its boilerplate model starts empty).
+        articles: Raw articles.
+
+    Returns:
+        Elapsed wall time in seconds.
+    '''
+    batch = [dict(a) for a in articles]
+
+    start = time.perf_counter()
+    for article in batch:
+        pipeline.process(article)
+    return time.perf_counter() - start
+
+
+def time_steps(articles: List[Dict[str, Any]], preprocess_config: dict) -> Dict[str, float]:
+    '''
+    Measure the time spent in each stage and in each `TextCleaner` step.
+
+    Args:
+        articles: Raw articles.
+        preprocess_config: The `preprocessing` settings section.
+
+    Returns:
+        Mapping of stage/step name to accumulated seconds.
+    '''
+    pipeline = PreprocessPipeline(preprocess_config)
+    totals: Dict[str, float] = defaultdict(float)
+
+    def timed(name: str, fn: Callable) -> Callable:
+        def wrapper(*args: Any) -> Any:
+            start = time.perf_counter()
+            result = fn(*args)
+            totals[name] += time.perf_counter() - start
+            return result
+        return wrapper
+
+    cleaner = pipeline.text_cleaner
+    cleaner.steps = [(name, timed(f'clean.{name}', step)) for name, step in cleaner.steps]
+
+    strip_boilerplate = timed('boilerplate', pipeline.strip_boilerplate)
+    check_quality = timed('quality_gate', pipeline.check_quality)
+
+    for article in (dict(a) for a in articles):
+        strip_boilerplate(article)
+        pipeline.clean_fields(article)
+        check_quality(article)
+
+    return dict(totals)
+
+
+def peak_memory(articles: List[Dict[str, Any]], preprocess_config: dict) -> int:
+    '''
+    Measure peak traced Python memory while running the pipeline.
+
+    Building the pipeline (hazm lexicons) is excluded; only processing is traced.
+
+    Args:
+        articles: Raw articles.
+        preprocess_config: The `preprocessing` settings section.
+
+    Returns:
+        Peak allocated bytes.
+    '''
+    pipeline = PreprocessPipeline(preprocess_config)
+    tracemalloc.start()
+    try:
+        run_pipeline(pipeline, articles)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the preprocessing stage offline.')
+    parser.add_argument('--raw-dir', default='data/raw', help='Directory of saved raw article JSON files.')
+    parser.add_argument('--limit', type=int, default=2000, help='Number of articles in the sample.')
+    parser.add_argument('--synthetic', action='store_true', help='Use the bundled synthetic corpus.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs (best is reported).')
+    parser.add_argument('--config', default='config/settings.yaml', help='Settings file.')
+    parser.add_argument('--profile', help='Write cProfile stats to this file.')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass.')
+    args = parser.parse_args()
+
+    preprocess_config = ConfigManager(args.config).get_preprocessing_config()
+
+    articles = [] if args.synthetic else load_raw_corpus(args.raw_dir, args.limit)
+    source = args.raw_dir
+    if not articles:
+        articles = synthetic_corpus(args.limit)
+        source = 'synthetic'
+
+    print(f'[Benchmark] Corpus: {len(articles)} articles ({source})')
+
+    start = time.perf_counter()
+    pipeline = PreprocessPipeline(preprocess_config)
+    print(f'[Benchmark] Pipeline build time: {time.perf_counter() - start:.2f}s')
+
+    # Warm up hazm and the regex caches
+    run_pipeline(pipeline, articles[:50])
+
+    best = min(
+        run_pipeline(PreprocessPipeline(preprocess_config), articles)
+        for _ in range(args.repeat)
+    )
+    print(f'[Benchmark] Throughput: {len(articles) / best:.1f} articles/sec '
+          f'(best of {args.repeat}, {best:.3f}s)')
+
+    steps = time_steps(articles, preprocess_config)
+    total = sum(steps.values()) or 1.0
+    print('[Benchmark] Time per step:')
+    for name, seconds in sorted(steps.items(), key=lambda kv: kv[1], reverse=True):
+        print(f'    {name:<28} {seconds * 1000:10.1f} ms  {seconds / total:6.1%}')
+
+    if not args.no_memory:
+        print(f'[Benchmark] Peak memory: {peak_memory(articles, preprocess_config) / 1024 / 1024:.1f} MiB')
+
+    if args.profile:
+        pipeline = PreprocessPipeline(preprocess_config)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        run_pipeline(pipeline, articles)
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+        print(f'[Benchmark] Profile written to {args.profile}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,39 @@
 import asyncio
 from utils.config_manager import ConfigManager
 from scheduler.scrapy_scheduler import ScrapyScheduler
+from scheduler.crawler_service import CrawlerService
+from scheduler.backfill_manager import BackfillManager
+from scheduler.adaptive_interval import AdaptiveIntervalPolicy
 from scheduler.write_last_timestamp import write_last_timestamp
+from storage.compaction import CompactionService
 from workers.preprocess_worker import PreprocessWorker
 from workers.sentiment_worker import SentimentWorker
 import logging
-import subprocess
 import datetime
 
 
 class ServiceRunner:
-    def __init__(self, config: ConfigManager):
-        self.scheduler = ScrapyScheduler(config.get_spider_configs())
-        self.preprocess_worker = PreprocessWorker()
-        self.sentiment_worker = SentimentWorker(config.get_model_info())
+    def __init__(self, config: ConfigManager, crawler_service: CrawlerService, backfill: BackfillManager):
+        adaptive_config = config.get_adaptive_interval_config()
+        adaptive = None
+        if adaptive_config.get('enabled', False):
+            adaptive = AdaptiveIntervalPolicy(
+                target_articles_per_poll=adaptive_config.get('target_articles_per_poll', 1.0),
+                lookback_hours=adaptive_config.get('lookback_hours', 6),
+                history_days=adaptive_config.get('history_days', 7),
+            )
+        self.scheduler = ScrapyScheduler(config.get_spider_configs(), crawler_service, adaptive=adaptive)
+        self.backfill = backfill
+        storage_config = config.get_storage_config()
+        self.preprocess_worker = PreprocessWorker(preprocess_config=config.get_preprocessing_config(), storage_config=storage_config)
+        live_config = config.get_live_updates_config()
+        self.sentiment_worker = SentimentWorker(
+            config.get_model_info(),
+            storage_config=storage_config,
+            updates_exchange=live_config.get('exchange', 'sentiment_updates') if live_config.get('enabled', False) else None,
+        )
+        compaction_config = config.get_compaction_config()
+        self.compaction = CompactionService(compaction_config) if compaction_config.get('enabled', False) else None
 
     async def start_Preprocess_worker(self) -> None:
         print("[Main] Starting PreprocessWorker...")
@@ -23,11 +43,23 @@ class ServiceRunner:
         print("[Main] Starting SentimentWorker...")
         await asyncio.to_thread(self.sentiment_worker.start)
 
+    async def start_backfill(self) -> None:
+        print("[Main] Starting BackfillManager...")
+        await asyncio.to_thread(self.backfill.run)
+
+    async def start_compaction(self) -> None:
+        if self.compaction is None:
+            return
+        print("[Main] Starting CompactionService...")
+        await asyncio.to_thread(self.compaction.run_forever)
+
     async def run(self) -> None:
-        # Run both scheduler and worker concurrently
+        # Run backfill, scheduler, workers and compaction concurrently
         await asyncio.gather(
+            self.start_backfill(),
             self.start_Preprocess_worker(),
             self.start_Sentiment_worker(),
+            self.start_compaction(),
             self.scheduler.start(),
         )
 
@@ -41,20 +73,31 @@ if __name__ == "__main__":
     config = ConfigManager(config_path)
     website_date_config = config.get_website_date_config()
 
+    # One Twisted reactor for all spider runs of this process
+    crawler_service = CrawlerService()
+
+    backfill_sites = []
     for cfg in website_date_config:
         if cfg['start_date']:
             if cfg['end_date']:
-                subprocess.run([
-                    "scrapy",
-                    "crawl",
-                    cfg['name'],
-                    "-a", f"start_date={int(cfg['start_date'].timestamp())}",
-                    "-a", f"end_date={int(cfg['end_date'].timestamp())}",
-                ])
+                backfill_sites.append({
+                    'name': cfg['name'],
+                    'start_date': int(cfg['start_date'].timestamp()),
+                    'end_date': int(cfg['end_date'].timestamp()),
+                })
             else:
                 write_last_timestamp(cfg['name'], timestamp=int(cfg['start_date'].timestamp()))
         else:
                 write_last_timestamp(cfg['name'], timestamp=int(datetime.datetime.now().timestamp()))
 
-    runner = ServiceRunner(config)
+    backfill_config = config.get_backfill_config()
+    backfill = BackfillManager(
+        crawler_service,
+        backfill_sites,
+        checkpoint_path=backfill_config.get('checkpoint_path', 'meta/backfill_checkpoint.json'),
+        window_hours=backfill_config.get('window_hours', 24),
+        max_workers=backfill_config.get('max_workers', 4),
+    )
+
+    runner = ServiceRunner(config, crawler_service, backfill)
     asyncio.run(runner.run())
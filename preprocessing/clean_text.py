@@ -1,5 +1,6 @@
 import re
 from hazm import Normalizer
+from typing import Callable, List, Tuple
 
 
 class TextCleaner:
@@ -31,6 +32,30 @@ class TextCleaner:
         self.emoji_pattern = re.compile(r'[^\w\sآ-ی]')
         self.space_pattern = re.compile(r'\s+')
 
+        # Ordered cleaning steps (named so they can be timed individually)
+        self.steps: List[Tuple[str, Callable[[str], str]]] = [
+            ('remove_html', self.remove_html),
+            ('normalize', self.normalize),
+            ('remove_non_persian', self.remove_non_persian),
+            ('remove_extra_spaces', self.remove_extra_spaces),
+        ]
+
+    def remove_html(self, text: str) -> str:
+        '''Replace HTML tags with spaces.'''
+        return self.html_pattern.sub(' ', text)
+
+    def normalize(self, text: str) -> str:
+        '''Normalize Persian text with the hazm normalizer.'''
+        return self.normalizer.normalize(text)
+
+    def remove_non_persian(self, text: str) -> str:
+        '''Replace emojis and non-Persian characters with spaces.'''
+        return self.emoji_pattern.sub(' ', text)
+
+    def remove_extra_spaces(self, text: str) -> str:
+        '''Collapse whitespace runs and strip leading/trailing spaces.'''
+        return self.space_pattern.sub(' ', text).strip()
+
     def clean(self, text: str) -> str:
         '''
         Clean the input Persian text.
@@ -50,16 +75,7 @@ class TextCleaner:
         if not text:
             return ''
 
-        # Remove HTML tags
-        text = self.html_pattern.sub(' ', text)
-
-        # Normalize Persian text
-        text = self.normalizer.normalize(text)
-
-        # Remove emojis & non-Persian characters
-        text = self.emoji_pattern.sub(' ', text)
-
-        # Remove extra spaces
-        text = self.space_pattern.sub(' ', text).strip()
+        for _, step in self.steps:
+            text = step(text)
 
         return text
@@ -0,0 +1,126 @@
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+
+class QualityGate:
+    '''
+    Pre-LLM quality gate for cleaned news articles.
+
+    Every article that reaches the sentiment stage costs a full LLM call, so items
+    that cannot produce a meaningful sentiment (empty bodies, gallery or video pages
+    with only a caption, mostly non-Persian text) are rejected here with a reason code.
+
+    Checks, in order:
+        1. Non-article URL patterns (e.g. '/photo/', '/video/')
+        2. Presence of required fields
+        3. Minimum content length (characters of title + summary + content)
+        4. Minimum Persian character ratio of the text
+
+    Attributes:
+        required_fields: Fields that must be present and non-empty.
+        min_chars: Minimum total text length.
+        min_persian_ratio: Minimum share of Persian letters among non-space characters.
+        non_article_url_patterns: URL substrings identifying non-article pages.
+        rejections: Per-site rejection counters keyed by reason code.
+        accepted: Per-site counters of articles that passed.
+    '''
+
+    REASON_NON_ARTICLE = 'non_article_url'
+    REASON_MISSING_FIELD = 'missing_field'
+    REASON_TOO_SHORT = 'too_short'
+    REASON_LOW_PERSIAN_RATIO = 'low_persian_ratio'
+
+    def __init__(
+        self,
+        required_fields: Optional[List[str]] = None,
+        min_chars: int = 150,
+        min_persian_ratio: float = 0.5,
+        non_article_url_patterns: Optional[List[str]] = None,
+    ) -> None:
+        '''
+        Initialize the gate.
+
+        Args:
+            required_fields: Fields that must be non-empty. Defaults to title and content.
+            min_chars: Minimum total length of title, summary and content.
+            min_persian_ratio: Minimum share of Persian letters in the text (0..1).
+            non_article_url_patterns: URL substrings that mark gallery/video pages.
+        '''
+        self.required_fields: List[str] = required_fields or ['title', 'content']
+        self.min_chars = min_chars
+        self.min_persian_ratio = min_persian_ratio
+        self.non_article_url_patterns: List[str] = non_article_url_patterns or []
+
+        self.rejections: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.accepted: Dict[str, int] = defaultdict(int)
+
+        # Precompile regex patterns (faster)
+        self.persian_pattern = re.compile(r'[\u0600-\u06FF]')
+        self.space_pattern = re.compile(r'\s+')
+
+    def score(self, article: Dict[str, Any]) -> Dict[str, float]:
+        '''
+        Compute the quality metrics of an article.
+
+        Args:
+            article: Cleaned article dictionary.
+
+        Returns:
+            Dictionary with the total text length (`chars`) and the Persian letter ratio (`persian_ratio`).
+        '''
+        text = ' '.join(article.get(f) or '' for f in ('title', 'summary', 'content'))
+        compact = self.space_pattern.sub('', text)
+        if not compact:
+            return {'chars': 0, 'persian_ratio': 0.0}
+
+        persian = len(self.persian_pattern.findall(compact))
+        return {'chars': len(compact), 'persian_ratio': round(persian / len(compact), 3)}
+
+    def check(self, article: Dict[str, Any]) -> Optional[str]:
+        '''
+        Decide whether an article should be sent to the LLM.
+
+        Args:
+            article: Cleaned article dictionary.
+
+        Returns:
+            None if the article passes, otherwise the reason code of the first failed check.
+        '''
+        reason = self._reason(article)
+        site = article.get('site_name', '')
+        if reason:
+            self.rejections[site][reason] += 1
+        else:
+            self.accepted[site] += 1
+        return reason
+
+    def _reason(self, article: Dict[str, Any]) -> Optional[str]:
+        '''Run the checks and return the first failing reason code, if any.'''
+        url = article.get('url') or ''
+        if any(p in url for p in self.non_article_url_patterns):
+            return self.REASON_NON_ARTICLE
+
+        if any(not article.get(f) for f in self.required_fields):
+            return self.REASON_MISSING_FIELD
+
+        metrics = self.score(article)
+        if metrics['chars'] < self.min_chars:
+            return self.REASON_TOO_SHORT
+        if metrics['persian_ratio'] < self.min_persian_ratio:
+            return self.REASON_LOW_PERSIAN_RATIO
+
+        return None
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        '''
+        Summarize the rejections per site.
+
+        Returns:
+            Mapping of site name to reason-code counts plus an `accepted` count.
+        '''
+        sites = set(self.rejections) | set(self.accepted)
+        return {
+            site: {'accepted': self.accepted.get(site, 0), **self.rejections.get(site, {})}
+            for site in sites
+        }
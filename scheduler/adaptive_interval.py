@@ -0,0 +1,118 @@
+import time
+import datetime
+from typing import Dict, List, Optional
+
+
+class AdaptiveIntervalPolicy:
+    '''
+    Choose each spider's next crawl interval from its observed publication rate.
+
+    The rate is estimated from the arrivals the Scrapy pipeline records in
+    `meta/<spider>_arrivals.json` ([publication_timestamp, crawled_timestamp] pairs):
+        - recent rate: articles published during the last `lookback_hours`
+        - time-of-day rate: average articles published in the current hour of
+          the day over the last `history_days` days
+
+    The larger of the two is used, so a site ramping up in the morning is
+    polled faster even before the recent window reflects it. The interval is
+    the time expected for `target_articles_per_poll` new articles, clamped to
+    the site's `[min_interval, max_interval]` (minutes).
+
+    The policy also keeps per-site statistics: realized latency between
+    publication and crawl, polls made, and polls saved compared with polling
+    at the fixed `interval`.
+
+    Attributes:
+        target_articles_per_poll: Expected new articles per poll.
+        lookback_hours: Window of the recent-rate estimate.
+        history_days: Window of the time-of-day estimate.
+        stats: Per-site statistics.
+    '''
+
+    def __init__(self, target_articles_per_poll: float = 1.0, lookback_hours: float = 6, history_days: int = 7):
+        '''
+        Initialize the policy.
+
+        Args:
+            target_articles_per_poll: Expected new articles per poll.
+            lookback_hours: Window of the recent-rate estimate in hours.
+            history_days: Window of the time-of-day estimate in days.
+        '''
+        self.target_articles_per_poll = target_articles_per_poll
+        self.lookback_hours = lookback_hours
+        self.history_days = history_days
+        self.started_at: float = time.time()
+        self.stats: Dict[str, dict] = {}
+
+    def publication_rate(self, arrivals: List[list], now: Optional[float] = None) -> float:
+        '''
+        Estimate the current publication rate of a site.
+
+        Args:
+            arrivals: [publication_timestamp, crawled_timestamp] pairs.
+            now: Reference UNIX time (defaults to the current time).
+
+        Returns:
+            Articles per hour.
+        '''
+        now = now or time.time()
+
+        recent_since = now - self.lookback_hours * 3600
+        recent = sum(1 for pub, _ in arrivals if pub >= recent_since) / self.lookback_hours
+
+        history_since = now - self.history_days * 86400
+        current_hour = datetime.datetime.fromtimestamp(now).hour
+        same_hour = sum(
+            1 for pub, _ in arrivals
+            if pub >= history_since and datetime.datetime.fromtimestamp(pub).hour == current_hour
+        )
+        days_covered = min(self.history_days, max(1.0, (now - min((a[0] for a in arrivals), default=now)) / 86400))
+        time_of_day = same_hour / days_covered
+
+        return max(recent, time_of_day)
+
+    def next_interval(self, spider_cfg: dict, arrivals: List[list], now: Optional[float] = None) -> float:
+        '''
+        Compute the next interval of a spider and update its statistics.
+
+        Args:
+            spider_cfg: Scheduler spider config with `spider`, `interval`,
+                `min_interval` and `max_interval` (minutes).
+            arrivals: [publication_timestamp, crawled_timestamp] pairs.
+            now: Reference UNIX time (defaults to the current time).
+
+        Returns:
+            Minutes until the next run.
+        '''
+        now = now or time.time()
+        min_interval = spider_cfg.get('min_interval', spider_cfg['interval'])
+        max_interval = spider_cfg.get('max_interval', spider_cfg['interval'])
+
+        rate = self.publication_rate(arrivals, now)
+        if rate > 0:
+            interval = 60 * self.target_articles_per_poll / rate
+        else:
+            interval = max_interval
+        interval = min(max_interval, max(min_interval, interval))
+
+        self._update_stats(spider_cfg, arrivals, rate, interval, now)
+        return interval
+
+    def _update_stats(self, spider_cfg: dict, arrivals: List[list], rate: float, interval: float, now: float) -> None:
+        '''Record the latency and request savings of a site.'''
+        site = spider_cfg['spider']
+        stats = self.stats.setdefault(site, {'polls': 0})
+        stats['polls'] += 1
+
+        recent_since = now - self.lookback_hours * 3600
+        latencies = [crawled - pub for pub, crawled in arrivals if crawled >= recent_since]
+
+        fixed_polls = (now - self.started_at) / 60 / spider_cfg['interval'] + 1
+        stats.update({
+            'rate_per_hour': round(rate, 2),
+            'interval_minutes': round(interval, 2),
+            'mean_latency_seconds': round(sum(latencies) / len(latencies), 1) if latencies else None,
+            'max_latency_seconds': max(latencies) if latencies else None,
+            'fixed_interval_polls': int(fixed_polls),
+            'polls_saved': max(0, int(fixed_polls) - stats['polls']),
+        })
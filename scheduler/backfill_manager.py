@@ -0,0 +1,184 @@
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from scheduler.crawler_service import CrawlerService
+from scheduler.write_last_timestamp import atomic_write_json
+
+
+class BackfillManager:
+    '''
+    Parallel, sharded and resumable historical backfill.
+
+    Each site's `[start_date, end_date]` range is split into fixed-size windows
+    that are crawled as spider runs inside the shared `CrawlerService`. Sites
+    are backfilled concurrently; the windows of one site are crawled in one
+    sequential pass, newest first, which also keeps a single run per domain.
+
+    Archive listings are paginated from the newest article backwards, so a
+    window starting at the newest listing page would re-fetch every listing
+    page of the newer windows. Instead each window resumes from the listing
+    page on which the previous (newer) window reached its start
+    (`stop_listing_url`), and every window only fetches its own listing pages.
+
+    Every finished window and the site's listing cursor are checkpointed to
+    disk, so a restart only crawls the windows that are still missing and
+    continues from the saved listing page.
+
+    Attributes:
+        crawler_service: Shared in-process Scrapy runtime executing the runs.
+        sites: List of {'name', 'start_date', 'end_date'} with UNIX timestamps.
+        checkpoint_path: JSON file with the finished windows and cursors per site.
+        window_seconds: Window size.
+        max_workers: Sites backfilled concurrently.
+        done: Finished windows per site.
+        cursors: Per site, {'url': listing page, 'before': timestamp}: the
+            listing page holding the newest articles older than `before`.
+    '''
+
+    def __init__(
+        self,
+        crawler_service: CrawlerService,
+        sites: List[dict],
+        checkpoint_path: str = 'meta/backfill_checkpoint.json',
+        window_hours: float = 24,
+        max_workers: int = 4,
+    ):
+        '''
+        Initialize the manager and load the checkpoint.
+
+        Args:
+            crawler_service: Shared in-process Scrapy runtime.
+            sites: Sites to backfill:
+                [
+                    {'name': 'isna', 'start_date': 1733000000, 'end_date': 1733600000},
+                    ...
+                ]
+            checkpoint_path: JSON file with the finished windows and cursors per site.
+            window_hours: Window size in hours (checkpoint granularity).
+            max_workers: Sites backfilled concurrently.
+        '''
+        self.crawler_service = crawler_service
+        self.sites = sites
+        self.checkpoint_path = checkpoint_path
+        self.window_seconds = int(window_hours * 3600)
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self.done: Dict[str, List[List[int]]] = {}
+        self.cursors: Dict[str, Dict[str, Any]] = {}
+        self._load_checkpoint()
+
+    def _load_checkpoint(self) -> None:
+        '''Load the finished windows and cursors (a plain site -> windows mapping is accepted too).'''
+        if not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if 'windows' in checkpoint:
+            self.done = checkpoint['windows']
+            self.cursors = checkpoint.get('cursors', {})
+        else:
+            self.done = checkpoint
+
+    def _mark_done(self, site: str, window: Tuple[int, int], stop_url: Optional[str]) -> None:
+        '''
+        Record a finished window and its listing cursor, and persist the checkpoint atomically.
+
+        Args:
+            site: Site name.
+            window: The finished (window_start, window_end).
+            stop_url: Listing page on which the run reached `window_start`
+                (None if the archive ended first: the cursor is dropped).
+        '''
+        with self._lock:
+            self.done.setdefault(site, []).append(list(window))
+            if stop_url:
+                self.cursors[site] = {'url': stop_url, 'before': window[0]}
+            else:
+                self.cursors.pop(site, None)
+            atomic_write_json(self.checkpoint_path, {'windows': self.done, 'cursors': self.cursors}, indent=2)
+
+    def split_windows(self, start_ts: int, end_ts: int) -> List[Tuple[int, int]]:
+        '''
+        Split an inclusive timestamp range into windows, newest first.
+
+        Args:
+            start_ts: First timestamp of the range.
+            end_ts: Last timestamp of the range.
+
+        Returns:
+            List of inclusive (window_start, window_end) pairs.
+        '''
+        windows = []
+        window_end = end_ts
+        while window_end >= start_ts:
+            window_start = max(start_ts, window_end - self.window_seconds + 1)
+            windows.append((window_start, window_end))
+            window_end = window_start - 1
+        return windows
+
+    def pending_windows(self) -> Dict[str, List[Tuple[int, int]]]:
+        '''
+        Return the windows that still need crawling.
+
+        Returns:
+            Per site, its pending (window_start, window_end) pairs, newest first.
+        '''
+        pending = {}
+        for site in self.sites:
+            done = {tuple(w) for w in self.done.get(site['name'], [])}
+            windows = [w for w in self.split_windows(site['start_date'], site['end_date']) if w not in done]
+            if windows:
+                pending[site['name']] = windows
+        return pending
+
+    def _resume_url(self, site: str, window_end: int) -> Optional[str]:
+        '''Return the saved listing page to start a window from, if it lies before the window.'''
+        cursor = self.cursors.get(site)
+        if cursor and window_end < cursor['before']:
+            return cursor['url']
+        return None
+
+    def _crawl_site(self, site: str, windows: List[Tuple[int, int]]) -> None:
+        '''
+        Crawl a site's pending windows in order, each from the previous one's listing cursor.
+
+        The pass stops at the first window that does not finish: the windows
+        after it would have no valid cursor, and a restart retries from there.
+
+        Args:
+            site: Site name.
+            windows: Pending windows, newest first.
+        '''
+        for window_start, window_end in windows:
+            resume_url = self._resume_url(site, window_end)
+            kwargs = {'resume_url': resume_url} if resume_url else {}
+            try:
+                result = self.crawler_service.crawl(site, start_date=window_start, end_date=window_end, **kwargs)
+            except Exception as e:
+                print(f'[Backfill] {site} window {window_start}-{window_end} failed: {e}')
+                return
+
+            if result.get('finish_reason') != 'finished':
+                print(f'[Backfill] {site} window {window_start}-{window_end} '
+                      f'ended with {result.get("finish_reason")}; will retry on restart')
+                return
+            self._mark_done(site, (window_start, window_end), result.get('stop_listing_url'))
+
+    def run(self) -> None:
+        '''
+        Crawl all pending windows and block until they are finished.
+        '''
+        pending = self.pending_windows()
+        print(f'[Backfill] {sum(len(w) for w in pending.values())} windows pending for {len(pending)} sites')
+        if not pending:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='backfill') as pool:
+            for site, windows in pending.items():
+                pool.submit(self._crawl_site, site, windows)
+
+        print('[Backfill] Finished')
@@ -0,0 +1,136 @@
+import time
+import threading
+from typing import Any, Dict, Optional, Type, Union
+
+from scrapy import Spider, signals
+from scrapy.settings import Settings
+from scrapy.utils.project import get_project_settings
+from scrapy.utils.reactor import install_reactor
+
+
+class CrawlerService:
+    '''
+    Long-lived in-process Scrapy runtime.
+
+    Instead of starting a `scrapy crawl` subprocess per run, one Twisted reactor
+    is kept alive in a background thread and spider runs are scheduled inside it
+    through a `CrawlerRunner`. Every run therefore reuses:
+        - The interpreter, Scrapy/Twisted imports and loaded project settings
+        - Scrapy's process-wide DNS cache
+        - Parsed robots.txt files (`SharedRobotsTxtMiddleware`)
+        - The RabbitMQ connection of `RawSaveAndPublishPipeline`
+
+    `crawl` is thread-safe and blocks the calling thread (e.g. an APScheduler
+    worker) until the run finishes, so several spiders can run concurrently.
+
+    Attributes:
+        settings: Project settings shared by all runs.
+        reactor: The running Twisted reactor (set once started).
+        runner: The `CrawlerRunner` creating crawlers inside the reactor.
+        last_runs: Per-spider summary of the latest run.
+    '''
+
+    def __init__(self, settings: Optional[Settings] = None):
+        '''
+        Initialize the service. The reactor is started lazily on first use.
+
+        Args:
+            settings: Scrapy settings. Defaults to the project settings.
+        '''
+        self.settings: Settings = settings or get_project_settings()
+        # One broker connection for all runs in this process
+        self.settings.set('RABBITMQ_SHARED_CONNECTION', True, priority='cmdline')
+
+        self.reactor: Any = None
+        self.runner: Any = None
+        self.last_runs: Dict[str, Dict[str, Any]] = {}
+
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        '''
+        Start the reactor thread if it is not running yet.
+        '''
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run_reactor, name='crawler-reactor', daemon=True)
+                self._thread.start()
+        self._ready.wait()
+
+    def _run_reactor(self) -> None:
+        '''
+        Install and run the reactor (runs in the background thread).
+        '''
+        reactor_path = self.settings.get('TWISTED_REACTOR')
+        if reactor_path:
+            install_reactor(reactor_path, self.settings.get('ASYNCIO_EVENT_LOOP'))
+
+        from twisted.internet import reactor
+        from scrapy.crawler import CrawlerRunner
+
+        self.reactor = reactor
+        self.runner = CrawlerRunner(self.settings)
+
+        reactor.callWhenRunning(self._ready.set)
+        print('[CrawlerService] Reactor is running...')
+        reactor.run(installSignalHandlers=False)
+
+    def crawl(self, spider: Union[str, Type[Spider]], **spider_kwargs: Any) -> Dict[str, Any]:
+        '''
+        Run a spider inside the shared reactor and wait for it to finish.
+
+        Args:
+            spider: Spider name or class.
+            **spider_kwargs: Spider arguments (e.g. `start_date`, `end_date`).
+
+        Returns:
+            Summary of the run:
+                {
+                    'startup': seconds from the call until the spider opened,
+                    'duration': seconds from the call until the spider closed,
+                    'finish_reason': Scrapy's close reason (e.g. 'finished'),
+                    'stop_listing_url': archive listing page on which the run
+                                        reached `start_date` (None if it did not)
+                }
+        '''
+        from twisted.internet.threads import blockingCallFromThread
+
+        self.start()
+        requested_at = time.perf_counter()
+        timing: Dict[str, Any] = {}
+        crawlers: list = []
+
+        def schedule() -> Any:
+            crawler = self.runner.create_crawler(spider)
+            crawler.signals.connect(
+                lambda spider: timing.setdefault('startup', time.perf_counter() - requested_at),
+                signal=signals.spider_opened, weak=False)
+            crawlers.append(crawler)
+            return self.runner.crawl(crawler, **spider_kwargs)
+
+        blockingCallFromThread(self.reactor, schedule)
+        timing['duration'] = time.perf_counter() - requested_at
+        stats = crawlers[0].stats if crawlers else None
+        timing['finish_reason'] = stats.get_value('finish_reason') if stats else None
+        timing['stop_listing_url'] = stats.get_value('crawl/stop_listing_url') if stats else None
+
+        name = spider if isinstance(spider, str) else spider.name
+        self.last_runs[name] = timing
+        print(f'[CrawlerService] {name} finished in {timing["duration"]:.2f}s '
+              f'(startup {timing.get("startup", 0.0):.3f}s)')
+        return timing
+
+    def stop(self) -> None:
+        '''
+        Stop all running crawls and the reactor.
+        '''
+        if self.reactor is None:
+            return
+
+        from twisted.internet.threads import blockingCallFromThread
+
+        blockingCallFromThread(self.reactor, self.runner.stop)
+        self.reactor.callFromThread(self.reactor.stop)
+        self._thread.join(timeout=10)
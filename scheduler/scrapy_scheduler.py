@@ -1,7 +1,11 @@
 import json
-import subprocess
+import threading
+from typing import Optional
 from apscheduler.schedulers.blocking import BlockingScheduler
 import datetime
+from scheduler.crawler_service import CrawlerService
+from scheduler.adaptive_interval import AdaptiveIntervalPolicy
+from scheduler.write_last_timestamp import atomic_write_json, read_arrivals
 
 class ScrapyScheduler:
     '''
@@ -9,12 +13,13 @@ class ScrapyScheduler:
 
     Features:
     - Each spider has its own independent interval
-    - Each spider is executed via subprocess
+    - Optionally, intervals adapt to each site's observed publication rate
+    - Each spider is executed inside a long-lived in-process CrawlerService
     - Fully asynchronous (asyncio + APScheduler)
     - Spiders can run in parallel
     '''
 
-    def __init__(self, spider_configs: list[dict], meta_dir: str = 'meta'):
+    def __init__(self, spider_configs: list[dict], crawler_service: CrawlerService, meta_dir: str = 'meta', adaptive: Optional[AdaptiveIntervalPolicy] = None):
         '''
         Initialize the scheduler.
 
@@ -22,13 +27,22 @@ class ScrapyScheduler:
             spider_configs: List of dictionaries containing:
                 {
                     'spider': 'spider_name',
-                    'interval': minutes_between_runs
+                    'interval': minutes_between_runs,
+                    'min_interval': minutes (adaptive mode),
+                    'max_interval': minutes (adaptive mode),
+                    'discovery': 'auto' | 'feed' | 'archive'
                 }
+            crawler_service: Shared in-process Scrapy runtime executing the runs
             meta_dir: Directory where timestamp files are stored
+            adaptive: Policy adjusting intervals to publication rates, or None for fixed intervals
         '''
         self.spider_configs = spider_configs
+        self.crawler_service = crawler_service
         self.meta_dir = meta_dir
+        self.adaptive = adaptive
         self.scheduler = BlockingScheduler()
+        # Jobs run concurrently in APScheduler's pool and share `adaptive.stats`
+        self._stats_lock = threading.Lock()
 
     def ts_file(self, spider_name: str) -> str:
         '''Return the path to the timestamp file for the given spider.'''
@@ -52,19 +66,29 @@ class ScrapyScheduler:
             data = json.load(f)
             return data.get('last_timestamp', 0)
 
-    def run_single_spider(self, spider_name: str) -> None:
+    def run_single_spider(self, spider_cfg: dict) -> None:
         '''
         Callback function that runs a single spider when triggered by APScheduler.
 
+        In adaptive mode the spider's job is rescheduled afterwards using its
+        recent arrival rate, and the per-site statistics are written to
+        `meta/scheduler_stats.json`.
+
         Args:
-            spider_name: name of spider that want to start
+            spider_cfg: scheduler config of the spider that want to start
         '''
-        subprocess.run([
-            'scrapy',
-            'crawl',
-            spider_name,
-            '-a', f'start_date={self.load_last_ts(spider_name)}',
-        ])
+        spider_name = spider_cfg['spider']
+        self.crawler_service.crawl(spider_name, start_date=self.load_last_ts(spider_name),
+                                   discovery=spider_cfg.get('discovery', 'auto'))
+
+        if self.adaptive:
+            arrivals = read_arrivals(spider_name, self.meta_dir)
+            # Dumping the stats while another job adds a site to them would fail mid-iteration
+            with self._stats_lock:
+                interval = self.adaptive.next_interval(spider_cfg, arrivals)
+                atomic_write_json(f'{self.meta_dir}/scheduler_stats.json', self.adaptive.stats, indent=2)
+            self.scheduler.reschedule_job(spider_name, trigger='interval', seconds=int(interval * 60))
+            print(f'[Scheduler] Next {spider_name} run in {interval:.1f} minutes')
 
     async def start(self) -> None:
         '''
@@ -78,7 +102,8 @@ class ScrapyScheduler:
                 'interval',
                 minutes=cfg['interval'],
                 next_run_time=datetime.datetime.now(),
-                args=[cfg['spider']],
+                args=[cfg],
+                id=cfg['spider'],
                 max_instances=1,
                 coalesce=True
             )
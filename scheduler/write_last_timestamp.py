@@ -1,5 +1,63 @@
 import json
 import os
+import tempfile
+from typing import Optional
+
+
+def atomic_write_json(file_path: str, data: dict, indent: Optional[int] = 4) -> None:
+    '''
+    Atomically replace a JSON file.
+
+    The data is written to a temporary file in the same directory, flushed and
+    fsynced, then renamed over the target. Readers see either the old or the new
+    content, never a partially written file, even if the process crashes mid-write.
+
+    Args:
+        file_path: Destination file path.
+        data: JSON-serializable dictionary.
+        indent: Indentation of the written JSON (None for a compact file).
+    '''
+    directory = os.path.dirname(file_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # Persist the rename itself
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def read_last_timestamp(spider_name: str, meta_dir: str = 'meta') -> int:
+    '''
+    Read the timestamp stored in the meta directory.
+
+    Args:
+        spider_name: The name of the spider
+        meta_dir: Directory containing the timestamp file
+
+    Returns:
+        The stored timestamp, or 0 if the file does not exist.
+    '''
+    file_path = f'{meta_dir}/{spider_name}_last.json'
+
+    if not os.path.exists(file_path):
+        return 0
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return int(json.load(f).get('last_timestamp', 0))
 
 
 def write_last_timestamp(spider_name: str, timestamp: int, meta_dir: str = 'meta') -> None:
@@ -11,14 +69,9 @@ def write_last_timestamp(spider_name: str, timestamp: int, meta_dir: str = 'meta
         timestamp: The timestamp value to be saved
         meta_dir: Directory to save the timestamp file
     '''
-    if not os.path.exists(meta_dir):
-        os.makedirs(meta_dir)
-
     file_path = f'{meta_dir}/{spider_name}_last.json'
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump({'last_timestamp': timestamp},
-                  f, ensure_ascii=False, indent=4)
+    atomic_write_json(file_path, {'last_timestamp': timestamp})
 
     print(
         f'[Timestamp] Written timestamp {timestamp} for {spider_name} in {file_path}')
@@ -32,9 +85,43 @@ def write_real_last_timestamp(spider_name: str, timestamp: int, meta_dir: str =
         timestamp: The timestamp value to be saved
         meta_dir: Directory to save the timestamp file
     '''
-    file_path = f'{meta_dir}/{spider_name}_last.json'
+    if read_last_timestamp(spider_name, meta_dir) < timestamp:
+        write_last_timestamp(spider_name, timestamp, meta_dir)
+
+
+def read_arrivals(spider_name: str, meta_dir: str = 'meta') -> list:
+    '''
+    Read the recent article arrivals recorded for a spider.
+
+    Args:
+        spider_name: The name of the spider
+        meta_dir: Directory containing the arrivals file
+
+    Returns:
+        List of [publication_timestamp, crawled_timestamp] pairs, oldest first.
+    '''
+    file_path = f'{meta_dir}/{spider_name}_arrivals.json'
+
+    if not os.path.exists(file_path):
+        return []
 
     with open(file_path, 'r', encoding='utf-8') as f:
-        file_timestamp = json.loads(f.read())['last_timestamp']
-        if int(file_timestamp) < timestamp:
-            write_last_timestamp(spider_name, timestamp, meta_dir)
+        return json.load(f).get('arrivals', [])
+
+
+def append_arrivals(spider_name: str, arrivals: list, meta_dir: str = 'meta', max_entries: int = 2000) -> None:
+    '''
+    Append article arrivals to the spider's bounded arrivals file.
+
+    Args:
+        spider_name: The name of the spider
+        arrivals: New [publication_timestamp, crawled_timestamp] pairs
+        meta_dir: Directory to save the arrivals file
+        max_entries: Number of most recent arrivals to keep
+    '''
+    file_path = f'{meta_dir}/{spider_name}_arrivals.json'
+
+    merged = read_arrivals(spider_name, meta_dir) + [list(a) for a in arrivals]
+    merged.sort(key=lambda a: a[0])
+
+    atomic_write_json(file_path, {'arrivals': merged[-max_entries:]}, indent=None)
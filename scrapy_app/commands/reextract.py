@@ -0,0 +1,137 @@
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Set, Tuple
+
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+from scrapy.http import HtmlResponse, Request
+from scrapy.spiderloader import SpiderLoader
+from scrapy.utils.project import get_project_settings
+
+from storage.columnar_store import ColumnarStore
+from storage.segment_archive import SegmentReader
+from utils.batch_writer import BatchWriter
+from utils.sanitize_filename import sanitize_filename
+
+
+def reextract_segment(spider_name: str, segment_path: str, offsets: Set[int], out_dir: str,
+                      writer_options: Dict[str, Any]) -> Tuple[int, int]:
+    '''
+    Re-run `parse_article` over the archived responses of one segment.
+
+    Runs in a worker process, so the spider is loaded from the project settings
+    here. Items are written through a `BatchWriter` in the project's
+    `RAW_WRITER_MODE`, with the same keys and layout as `RawSaveAndPublishPipeline`.
+
+    Args:
+        spider_name: Name of the spider whose extraction is used.
+        segment_path: Segment file to scan.
+        offsets: Offsets of the records to process (the latest copy of each URL).
+        out_dir: Raw output directory.
+        writer_options: `BatchWriter` mode, fsync and batch options.
+
+    Returns:
+        (items written, records that failed to parse or to be written)
+    '''
+    spider_cls = SpiderLoader.from_settings(get_project_settings()).load(spider_name)
+    spider = spider_cls()
+    reader = SegmentReader(os.path.dirname(segment_path))
+    writer = BatchWriter(out_dir, segment_prefix=f'reextract-{spider_name}', **writer_options)
+
+    failed = 0
+    for offset, meta, body in reader.iter_records(segment_path):
+        if offset not in offsets:
+            continue
+
+        request = Request(meta['url'], meta=meta.get('request_meta') or {}, callback=spider.parse_article)
+        response = HtmlResponse(meta['url'], status=meta.get('status', 200), body=body,
+                                encoding=meta.get('encoding') or 'utf-8', request=request)
+        try:
+            for item in spider.parse_article(response):
+                data = dict(item)
+                data['site_name'] = spider_name
+                writer.put(f'{spider_name}-{sanitize_filename(data["url"])}.json', data)
+        except Exception as e:
+            print(f'[Reextract] Failed on {meta["url"]}: {e}')
+            failed += 1
+
+    writer.close()
+    return writer.written, failed + writer.errors
+
+
+class Command(ScrapyCommand):
+    '''
+    `scrapy reextract <spider>`: rebuild raw items from the HTML archive.
+
+    Reads the segments written by `HtmlArchiveSpiderMiddleware` and runs the
+    spider's current `parse_article` over them offline, one process per
+    segment, so changed XPaths can be applied without recrawling.
+    '''
+
+    requires_project = True
+    requires_crawler_process = False
+    default_settings = {'LOG_ENABLED': False}
+
+    def syntax(self) -> str:
+        return '[options] <spider>'
+
+    def short_desc(self) -> str:
+        return 'Re-extract articles from the compressed HTML archive'
+
+    def add_options(self, parser) -> None:
+        super().add_options(parser)
+        parser.add_argument('-o', '--output', metavar='DIR', default='data/raw',
+                            help='raw output directory, written in RAW_WRITER_MODE (default: data/raw)')
+        parser.add_argument('--archive-dir', metavar='DIR', default=None,
+                            help='archive root directory (default: HTML_ARCHIVE_DIR)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='number of worker processes (default: CPU count)')
+
+    def run(self, args: List[str], opts) -> None:
+        if len(args) != 1:
+            raise UsageError()
+        spider_name = args[0]
+
+        archive_root = opts.archive_dir or self.settings.get('HTML_ARCHIVE_DIR', 'data/archive')
+        reader = SegmentReader(os.path.join(archive_root, spider_name))
+        segments = reader.segments()
+        if not segments:
+            print(f'[Reextract] No archived segments for {spider_name} in {reader.directory}')
+            return
+
+        # Only the latest copy of each URL is re-extracted
+        latest: Dict[str, Set[int]] = defaultdict(set)
+        for segment_path, offset, _ in reader.load_index().values():
+            latest[segment_path].add(offset)
+
+        writer_options = {
+            'mode': self.settings.get('RAW_WRITER_MODE', 'files'),
+            'batch_size': self.settings.getint('RAW_WRITER_BATCH_SIZE', 100),
+            'fsync': self.settings.getbool('RAW_WRITER_FSYNC', False),
+        }
+        if writer_options['mode'] not in BatchWriter.MODES:
+            raise UsageError(f'Unknown RAW_WRITER_MODE: {writer_options["mode"]}')
+
+        os.makedirs(opts.output, exist_ok=True)
+        started = time.perf_counter()
+        written, failed = 0, 0
+
+        with ProcessPoolExecutor(max_workers=opts.workers) as pool:
+            futures = [
+                pool.submit(reextract_segment, spider_name, path, latest[path], opts.output, writer_options)
+                for path in segments if latest.get(path)
+            ]
+            for future in as_completed(futures):
+                w, f = future.result()
+                written += w
+                failed += f
+
+        if writer_options['mode'] == 'columnar':
+            # Merge the workers' micro-batches into the site/day partitions
+            ColumnarStore(opts.output, compact_every=0).compact()
+
+        elapsed = time.perf_counter() - started
+        print(f'[Reextract] {spider_name}: {written} items written to {opts.output} ({writer_options["mode"]}), '
+              f'{failed} failed, {len(segments)} segments in {elapsed:.1f}s')
@@ -0,0 +1,142 @@
+# Define here your extensions
+#
+# See documentation in:
+# https://docs.scrapy.org/en/latest/topics/extensions.html
+
+import os
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from scrapy import Spider, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Request, Response
+
+
+class CrawlMetricsExtension:
+    '''
+    Per-run crawl instrumentation.
+
+    Collects, for every spider run:
+        - Listing pages fetched, article requests and items scraped
+        - Listing entries dropped for a missing date and `parse_date` failures
+          (counted by `BaseNewsSpider.parse`)
+        - Time spent downloading (sum of download latencies), in spider
+          callbacks (`CrawlTimingSpiderMiddleware`) and in item pipelines
+        - Lag between `publication_timestamp` and crawl time (live runs only)
+
+    When the spider closes, a one-line JSON summary is appended to
+    CRAWL_METRICS_FILE (JSON Lines, one run per line) so it can be loaded
+    into pandas or any charting tool.
+
+    Settings:
+        CRAWL_METRICS_ENABLED: Enable the extension (default True).
+        CRAWL_METRICS_FILE: Run summary file.
+    '''
+
+    def __init__(self, crawler: Crawler, metrics_file: str):
+        '''
+        Initialize the extension.
+
+        Args:
+            crawler: The running crawler.
+            metrics_file: JSON Lines file receiving the run summaries.
+        '''
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.metrics_file = metrics_file
+
+        self.started_at: float = 0.0
+        self.download_seconds: float = 0.0
+        self.responses: int = 0
+        self.lags: List[int] = []
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> 'CrawlMetricsExtension':
+        if not crawler.settings.getbool('CRAWL_METRICS_ENABLED', True):
+            raise NotConfigured
+
+        ext = cls(crawler, crawler.settings.get('CRAWL_METRICS_FILE', 'meta/metrics/crawl_runs.jsonl'))
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.response_received, signal=signals.response_received)
+        crawler.signals.connect(ext.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        return ext
+
+    def spider_opened(self, spider: Spider) -> None:
+        self.started_at = time.time()
+
+    def response_received(self, response: Response, request: Request, spider: Spider) -> None:
+        latency = request.meta.get('download_latency')
+        if latency is not None:
+            self.download_seconds += latency
+            self.responses += 1
+
+    def item_scraped(self, item: Any, response: Response, spider: Spider) -> None:
+        # Freshness is only meaningful for live runs, not historical backfills
+        if getattr(spider, 'end_date', None):
+            return
+        published = item.get('publication_timestamp')
+        if published:
+            self.lags.append(int(time.time()) - int(published))
+
+    @staticmethod
+    def _percentile(values: List[int], q: float) -> Optional[int]:
+        if not values:
+            return None
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self, spider: Spider, reason: str) -> Dict[str, Any]:
+        '''
+        Build the summary of the finished run.
+
+        Args:
+            spider: The closed spider.
+            reason: Scrapy's close reason.
+
+        Returns:
+            JSON-serializable run summary.
+        '''
+        stats = self.stats
+        finished_at = time.time()
+        duration = finished_at - self.started_at
+        items = stats.get_value('item_scraped_count', 0)
+
+        return {
+            'spider': spider.name,
+            'mode': 'backfill' if getattr(spider, 'end_date', None) else 'live',
+            'started_at': int(self.started_at),
+            'finished_at': int(finished_at),
+            'duration_seconds': round(duration, 3),
+            'finish_reason': reason,
+            'listing_pages': stats.get_value('crawl/listing_pages', 0),
+            'article_requests': stats.get_value('crawl/article_requests', 0),
+            'items': items,
+            'items_per_minute': round(items / duration * 60, 2) if duration > 0 else None,
+            'missing_date': stats.get_value('crawl/missing_date', 0),
+            'date_parse_errors': stats.get_value('crawl/date_parse_errors', 0),
+            'responses': self.responses,
+            'download_seconds': round(self.download_seconds, 3),
+            'parse_seconds': round(stats.get_value('crawl/parse_seconds', 0.0), 3),
+            'pipeline_seconds': round(stats.get_value('crawl/pipeline_seconds', 0.0), 3),
+            'lag_p50_seconds': self._percentile(self.lags, 0.5),
+            'lag_p90_seconds': self._percentile(self.lags, 0.9),
+            'lag_max_seconds': max(self.lags) if self.lags else None,
+        }
+
+    def spider_closed(self, spider: Spider, reason: str) -> None:
+        summary = self.summary(spider, reason)
+
+        os.makedirs(os.path.dirname(self.metrics_file) or '.', exist_ok=True)
+        with open(self.metrics_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + '\n')
+
+        # No lag when the run scraped no items
+        lag = summary['lag_p50_seconds']
+        lag_text = f'{lag}s' if lag is not None else 'n/a'
+        print(f'[CrawlMetrics] {spider.name}: {summary["items"]} items in {summary["duration_seconds"]:.1f}s '
+              f'(download {summary["download_seconds"]:.1f}s, parse {summary["parse_seconds"]:.1f}s, '
+              f'pipeline {summary["pipeline_seconds"]:.1f}s), '
+              f'{summary["date_parse_errors"]} date errors, p50 lag {lag_text}')
@@ -3,11 +3,27 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import os
+import json
+import time
+import hashlib
+from email.utils import parsedate_to_datetime
+
 from scrapy import signals
+from scrapy.http import Request
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.downloadermiddlewares.robotstxt import RobotsTxtMiddleware
+from twisted.internet.defer import Deferred
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 
+from utils.seen_url_index import SeenUrlIndex
+from utils.sanitize_filename import sanitize_filename
+from scheduler.write_last_timestamp import atomic_write_json
+from utils.config_manager import ConfigManager
+from storage.segment_archive import SegmentWriter
+
 
 class ScrapyAppSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
@@ -54,36 +70,96 @@ class ScrapyAppSpiderMiddleware:
 
 
 class ScrapyAppDownloaderMiddleware:
-    # Not all methods need to be defined. If a method is not defined,
-    # scrapy acts as if the downloader middleware does not modify the
-    # passed objects.
+    '''
+    Listing-page change detection with conditional requests.
+
+    For live runs (no `end_date`), the archive listing pages (`start_urls`)
+    and feeds (`FEED_URLS`) are requested with `If-None-Match`/`If-Modified-Since` built from the
+    validators stored by the previous run. A listing is considered unchanged
+    when the server answers 304, or when the hash of its article links equals
+    the stored one. Unchanged listings are dropped with IgnoreRequest, so no
+    pagination or article requests are made and a quiet run ends right away.
+
+    The new validators are persisted to `meta/<spider>_listing.json` only when
+    the run finishes normally, so an interrupted run is retried in full.
+    Listings with a failed article download (`spider.failed_listings`) keep
+    their previous state, so the next run does not skip them and retries the
+    failed articles.
+
+    Settings:
+        LISTING_CHANGE_DETECTION_ENABLED: Enable the middleware (default True).
+        LISTING_STATE_DIR: Directory of the per-spider state files.
+    '''
+
+    def __init__(self, crawler, state_dir='meta'):
+        self.crawler = crawler
+        self.state_dir = state_dir
+        self.state = {}
+        self.pending = {}
 
     @classmethod
     def from_crawler(cls, crawler):
         # This method is used by Scrapy to create your spiders.
-        s = cls()
+        if not crawler.settings.getbool('LISTING_CHANGE_DETECTION_ENABLED', True):
+            raise NotConfigured
+        s = cls(crawler, crawler.settings.get('LISTING_STATE_DIR', 'meta'))
         crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
         return s
 
+    def _state_file(self, spider):
+        return os.path.join(self.state_dir, f'{spider.name}_listing.json')
+
+    def _is_listing(self, request, spider):
+        # Only the entry listing pages and feeds of live (non-backfill) runs
+        if getattr(spider, 'end_date', None):
+            return False
+        return request.url in getattr(spider, 'start_urls', []) or request.url in getattr(spider, 'FEED_URLS', [])
+
     def process_request(self, request, spider):
-        # Called for each request that goes through the downloader
-        # middleware.
+        # Attach the validators of the previous run to listing requests
+        if not self._is_listing(request, spider):
+            return None
 
-        # Must either:
-        # - return None: continue processing this request
-        # - or return a Response object
-        # - or return a Request object
-        # - or raise IgnoreRequest: process_exception() methods of
-        #   installed downloader middleware will be called
+        known = self.state.get(request.url, {})
+        if known.get('etag'):
+            request.headers.setdefault('If-None-Match', known['etag'])
+        if known.get('last_modified'):
+            request.headers.setdefault('If-Modified-Since', known['last_modified'])
         return None
 
     def process_response(self, request, response, spider):
-        # Called with the response returned from the downloader.
+        # Stop the run early when the listing did not change
+        if not self._is_listing(request, spider):
+            return response
+
+        stats = self.crawler.stats
+        if response.status == 304:
+            stats.inc_value('listing_change/not_modified')
+            raise IgnoreRequest(f'Listing not modified: {request.url}')
+
+        if response.status != 200 or not hasattr(response, 'xpath'):
+            return response
 
-        # Must either;
-        # - return a Response object
-        # - return a Request object
-        # - or raise IgnoreRequest
+        if request.url in getattr(spider, 'FEED_URLS', []):
+            links = response.xpath('//item/link/text() | //*[local-name()="loc"]/text()').getall()
+        else:
+            links = [
+                b.xpath(spider.URL_XPATH).get() or ''
+                for b in response.xpath(spider.LIST_BLOCK_XPATH)
+            ]
+        content_hash = hashlib.md5('\n'.join(links).encode('utf-8')).hexdigest()
+
+        if links and content_hash == self.state.get(request.url, {}).get('hash'):
+            stats.inc_value('listing_change/unchanged')
+            raise IgnoreRequest(f'Listing unchanged: {request.url}')
+
+        stats.inc_value('listing_change/changed')
+        self.pending[request.url] = {
+            'etag': response.headers.get('ETag', b'').decode('latin-1') or None,
+            'last_modified': response.headers.get('Last-Modified', b'').decode('latin-1') or None,
+            'hash': content_hash,
+        }
         return response
 
     def process_exception(self, request, exception, spider):
@@ -98,3 +174,397 @@ class ScrapyAppDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+        path = self._state_file(spider)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def spider_closed(self, spider, reason):
+        # Persist only after a complete run, so interrupted runs are retried
+        if reason != 'finished' or not self.pending:
+            return
+        failed = getattr(spider, 'failed_listings', set())
+        for url in failed & self.pending.keys():
+            self.crawler.stats.inc_value('listing_change/kept_after_failures')
+            spider.logger.info(f'Not saving the state of {url}: some of its articles failed')
+        self.state.update({url: validators for url, validators in self.pending.items() if url not in failed})
+        atomic_write_json(self._state_file(spider), self.state, indent=2)
+
+
+class SeenUrlSpiderMiddleware:
+    '''
+    Drop article requests for URLs that were already crawled in earlier runs.
+
+    Consults a persistent `SeenUrlIndex` (keyed by the same MD5 that
+    `sanitize_filename` produces) before `parse_article` requests reach the
+    scheduler, so overlapping runs and boundary articles sharing the
+    watermark's timestamp are not downloaded and published again.
+
+    URLs are only marked as seen once their item has passed every pipeline
+    (`item_scraped`), so articles that failed to save are retried next run.
+
+    Settings:
+        SEEN_URL_INDEX_ENABLED: Enable the middleware (default True).
+        SEEN_URL_INDEX_PATH: Index file path.
+        SEEN_URL_INDEX_CAPACITY: Expected number of distinct article URLs.
+        SEEN_URL_INDEX_ERROR_RATE: Target false-positive rate at capacity.
+    '''
+
+    def __init__(self, index: SeenUrlIndex, stats):
+        self.index = index
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool('SEEN_URL_INDEX_ENABLED', True):
+            raise NotConfigured
+
+        index = SeenUrlIndex(
+            settings.get('SEEN_URL_INDEX_PATH', 'meta/seen_urls.bloom'),
+            capacity=settings.getint('SEEN_URL_INDEX_CAPACITY', 5_000_000),
+            error_rate=settings.getfloat('SEEN_URL_INDEX_ERROR_RATE', 1e-4),
+        )
+        s = cls(index, crawler.stats)
+        crawler.signals.connect(s.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def process_spider_output(self, response, result, spider):
+        # Filter article requests whose URL is already in the index
+        for i in result:
+            if not self._is_seen(i, spider):
+                yield i
+
+    async def process_spider_output_async(self, response, result, spider):
+        async for i in result:
+            if not self._is_seen(i, spider):
+                yield i
+
+    def _is_seen(self, obj, spider):
+        if (isinstance(obj, Request)
+                and obj.callback == getattr(spider, 'parse_article', None)
+                and sanitize_filename(obj.url) in self.index):
+            self.stats.inc_value('seen_url_index/skipped')
+            return True
+        return False
+
+    def item_scraped(self, item, response, spider):
+        # Mark the final URL, the requested URL and any redirect hops as seen
+        urls = {ItemAdapter(item).get('url'), response.url, response.request.url if response.request else None}
+        urls.update(response.meta.get('redirect_urls', []))
+        for url in filter(None, urls):
+            self.index.add(sanitize_filename(url))
+
+    def spider_closed(self, spider):
+        self.stats.set_value('seen_url_index/size', len(self.index))
+        self.index.close()
+
+
+class CrawlTimingSpiderMiddleware:
+    '''
+    Measure the time spent inside spider callbacks.
+
+    Placed closest to the spider, so iterating the callback output here only
+    runs the callback itself. The accumulated seconds are stored in the
+    `crawl/parse_seconds` stat, reported by `CrawlMetricsExtension`.
+    '''
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('CRAWL_METRICS_ENABLED', True):
+            raise NotConfigured
+        return cls(crawler.stats)
+
+    def process_spider_output(self, response, result, spider):
+        it = iter(result)
+        while True:
+            started = time.perf_counter()
+            try:
+                i = next(it)
+            except StopIteration:
+                return
+            finally:
+                self.stats.inc_value('crawl/parse_seconds', time.perf_counter() - started)
+            yield i
+
+    async def process_spider_output_async(self, response, result, spider):
+        it = result.__aiter__()
+        while True:
+            started = time.perf_counter()
+            try:
+                i = await it.__anext__()
+            except StopAsyncIteration:
+                return
+            finally:
+                self.stats.inc_value('crawl/parse_seconds', time.perf_counter() - started)
+            yield i
+
+
+class SharedRobotsTxtMiddleware(RobotsTxtMiddleware):
+    '''
+    RobotsTxtMiddleware whose parsed robots.txt files outlive a single crawl.
+
+    When spiders run repeatedly inside one long-lived process (`CrawlerService`),
+    the stock middleware refetches robots.txt on every run. This subclass seeds
+    each new crawler with the parsers fetched by earlier runs and publishes its
+    own parsers when the spider closes. Entries expire after ROBOTSTXT_CACHE_TTL
+    seconds; failed fetches are never shared.
+    '''
+
+    # netloc -> (parser, fetched_at), shared by every crawler of the process
+    _shared_parsers: dict = {}
+
+    def __init__(self, crawler):
+        super().__init__(crawler)
+        self.ttl = crawler.settings.getfloat('ROBOTSTXT_CACHE_TTL', 86400)
+
+        now = time.time()
+        for netloc, (parser, fetched_at) in list(self._shared_parsers.items()):
+            if now - fetched_at > self.ttl:
+                del self._shared_parsers[netloc]
+            else:
+                self._parsers[netloc] = parser
+
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    def spider_closed(self, spider):
+        now = time.time()
+        for netloc, parser in self._parsers.items():
+            if parser is None or isinstance(parser, Deferred) or netloc in self._shared_parsers:
+                continue
+            self._shared_parsers[netloc] = (parser, now)
+
+
+class HtmlArchiveSpiderMiddleware:
+    '''
+    Archive article response bodies so they can be re-extracted offline.
+
+    Every response handled by `parse_article` is appended to a zstd-compressed
+    segment archive (`SegmentWriter`) under `HTML_ARCHIVE_DIR/<spider>/`, keyed
+    by the same URL hash as the raw JSON file. The request meta extracted from
+    the listing page (title, date, timestamp) is stored with the body, so the
+    `reextract` command can rebuild the items without any network access.
+
+    Settings:
+        HTML_ARCHIVE_ENABLED: Enable the middleware (default False).
+        HTML_ARCHIVE_DIR: Archive root directory.
+        HTML_ARCHIVE_SEGMENT_MB: Segment rotation size in MB.
+        HTML_ARCHIVE_COMPRESSION_LEVEL: zstd compression level.
+    '''
+
+    META_KEYS = ('title', 'date', 'timestamp')
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        self.archive_dir = settings.get('HTML_ARCHIVE_DIR', 'data/archive')
+        self.max_segment_bytes = settings.getint('HTML_ARCHIVE_SEGMENT_MB', 256) * 1024 * 1024
+        self.compression_level = settings.getint('HTML_ARCHIVE_COMPRESSION_LEVEL', 3)
+        self.stats = crawler.stats
+        self.writer = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('HTML_ARCHIVE_ENABLED', False):
+            raise NotConfigured
+
+        s = cls(crawler)
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def process_spider_input(self, response, spider):
+        request = response.request
+        if (self.writer is None or request is None
+                or request.callback != getattr(spider, 'parse_article', None)):
+            return None
+
+        meta = {
+            'url': response.url,
+            'status': response.status,
+            'encoding': getattr(response, 'encoding', None),
+            'crawled_at': int(time.time()),
+            'spider': spider.name,
+            'request_meta': {k: response.meta.get(k) for k in self.META_KEYS},
+        }
+        self.writer.append(sanitize_filename(response.url), response.body, meta)
+        self.stats.inc_value('html_archive/records')
+        self.stats.inc_value('html_archive/bytes', len(response.body))
+        return None
+
+    def spider_opened(self, spider):
+        self.writer = SegmentWriter(
+            os.path.join(self.archive_dir, spider.name),
+            prefix=spider.name,
+            max_segment_bytes=self.max_segment_bytes,
+            compression_level=self.compression_level,
+        )
+
+    def spider_closed(self, spider):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class AdaptiveThrottleMiddleware:
+    '''
+    Latency-aware per-domain throttling of the downloader slots.
+
+    Adjusts the delay and concurrency of each downloader slot (one per
+    domain) from the responses it receives:
+        - 429/503 responses and download errors: halve the concurrency and
+          double the delay, waiting at least `Retry-After` when it is sent
+        - latency rising above `slow_factor` times the fastest smoothed
+          latency seen: remove one concurrent request and slow down
+        - `increase_after` consecutive fast responses: add one concurrent
+          request and shorten the delay
+
+    Values stay within per-site floors and ceilings read from the site's
+    `throttle` block in `settings.yaml` (keyed by spider name), falling back to
+    the ADAPTIVE_THROTTLE_* settings. Per-domain delay, concurrency, smoothed
+    latency and back-off counts are recorded in the crawl stats.
+
+    Must run before RetryMiddleware (priority above 550) so that it sees the
+    429/503 responses that are retried.
+
+    Settings:
+        ADAPTIVE_THROTTLE_ENABLED: Enable the middleware (default True).
+        ADAPTIVE_THROTTLE_SITE_CONFIG: YAML file with the per-site bounds.
+        ADAPTIVE_THROTTLE_MIN_DELAY / ADAPTIVE_THROTTLE_MAX_DELAY: Default delay bounds in seconds.
+        ADAPTIVE_THROTTLE_MIN_CONCURRENCY / ADAPTIVE_THROTTLE_MAX_CONCURRENCY: Default concurrency bounds.
+        ADAPTIVE_THROTTLE_SLOW_FACTOR: Latency ratio treated as strain.
+        ADAPTIVE_THROTTLE_INCREASE_AFTER: Fast responses needed before speeding up.
+    '''
+
+    BACKOFF_STATUSES = (429, 503)
+    EWMA_ALPHA = 0.3
+    BASELINE_DRIFT = 0.02
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.site_config_path = settings.get('ADAPTIVE_THROTTLE_SITE_CONFIG', 'config/settings.yaml')
+        self.defaults = {
+            'min_delay': settings.getfloat('ADAPTIVE_THROTTLE_MIN_DELAY', 0.25),
+            'max_delay': settings.getfloat('ADAPTIVE_THROTTLE_MAX_DELAY', 60.0),
+            'min_concurrency': settings.getint('ADAPTIVE_THROTTLE_MIN_CONCURRENCY', 1),
+            'max_concurrency': settings.getint('ADAPTIVE_THROTTLE_MAX_CONCURRENCY', 1),
+        }
+        self.slow_factor = settings.getfloat('ADAPTIVE_THROTTLE_SLOW_FACTOR', 2.0)
+        self.increase_after = settings.getint('ADAPTIVE_THROTTLE_INCREASE_AFTER', 10)
+        self.bounds = dict(self.defaults)
+        # slot key -> {'latency', 'baseline', 'fast', 'backoffs'}
+        self.domains = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('ADAPTIVE_THROTTLE_ENABLED', True):
+            raise NotConfigured
+
+        s = cls(crawler)
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def spider_opened(self, spider):
+        site_bounds = {}
+        if os.path.exists(self.site_config_path):
+            site_bounds = ConfigManager(self.site_config_path).get_throttle_config(spider.name)
+        self.bounds = {**self.defaults, **site_bounds}
+
+    def _get_slot(self, request):
+        key = request.meta.get('download_slot')
+        return key, self.crawler.engine.downloader.slots.get(key)
+
+    def _domain(self, key, slot):
+        domain = self.domains.get(key)
+        if domain is None:
+            domain = self.domains[key] = {'latency': None, 'baseline': None, 'fast': 0, 'backoffs': 0}
+            # Start from the configured slot values, within the site's bounds
+            self._apply(key, slot, slot.delay, slot.concurrency)
+        return domain
+
+    def _apply(self, key, slot, delay, concurrency):
+        b = self.bounds
+        slot.delay = min(b['max_delay'], max(b['min_delay'], delay))
+        slot.concurrency = int(min(b['max_concurrency'], max(b['min_concurrency'], concurrency)))
+        self.stats.set_value(f'throttle/{key}/delay', round(slot.delay, 3))
+        self.stats.set_value(f'throttle/{key}/concurrency', slot.concurrency)
+
+    def _retry_after(self, response):
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        value = value.decode('latin-1').strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _back_off(self, key, slot, domain, wait=None):
+        domain['fast'] = 0
+        domain['backoffs'] += 1
+        self.stats.inc_value(f'throttle/{key}/backoffs')
+        delay = max(slot.delay * 2, self.bounds['min_delay'] * 2, wait or 0)
+        self._apply(key, slot, delay, slot.concurrency // 2)
+
+    def process_response(self, request, response, spider=None):
+        key, slot = self._get_slot(request)
+        if slot is None:
+            return response
+        domain = self._domain(key, slot)
+
+        if response.status in self.BACKOFF_STATUSES:
+            wait = self._retry_after(response)
+            if wait is not None:
+                self.stats.max_value(f'throttle/{key}/retry_after', wait)
+            self._back_off(key, slot, domain, wait)
+            return response
+
+        latency = request.meta.get('download_latency')
+        if latency is None:
+            return response
+
+        # Smoothed latency, compared with the fastest smoothed latency observed
+        # (the baseline drifts up slowly so a lasting change becomes the norm)
+        ewma = latency if domain['latency'] is None else (
+            self.EWMA_ALPHA * latency + (1 - self.EWMA_ALPHA) * domain['latency'])
+        domain['latency'] = ewma
+        baseline = domain['baseline']
+        domain['baseline'] = ewma if baseline is None else min(ewma, baseline + self.BASELINE_DRIFT * (ewma - baseline))
+        self.stats.set_value(f'throttle/{key}/latency_ms', int(ewma * 1000))
+
+        if ewma > domain['baseline'] * self.slow_factor:
+            # Leave at least one response time between requests of each slot
+            domain['fast'] = 0
+            concurrency = slot.concurrency - 1
+            self._apply(key, slot, max(slot.delay, ewma / max(1, concurrency)), concurrency)
+        else:
+            domain['fast'] += 1
+            if domain['fast'] >= self.increase_after:
+                domain['fast'] = 0
+                self._apply(key, slot, slot.delay * 0.75, slot.concurrency + 1)
+
+        return response
+
+    def process_exception(self, request, exception, spider=None):
+        # Timeouts and connection errors are treated like an overloaded server
+        key, slot = self._get_slot(request)
+        if slot is not None:
+            self._back_off(key, slot, self._domain(key, slot))
+        return None
+
+    def spider_closed(self, spider):
+        for key, domain in self.domains.items():
+            slot = self.crawler.engine.downloader.slots.get(key)
+            if slot is None:
+                continue
+            latency = f'{domain["latency"] * 1000:.0f}ms' if domain['latency'] is not None else 'n/a'
+            spider.logger.info(
+                f'[Throttle] {key}: delay={slot.delay:.2f}s concurrency={slot.concurrency} '
+                f'latency={latency} backoffs={domain["backoffs"]}')
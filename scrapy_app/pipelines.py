@@ -6,100 +6,240 @@
 
 # useful for handling different item types with a single interface
 import os
-import json
+import time
+from twisted.internet.defer import Deferred
+from twisted.internet.threads import deferToThread
 from utils.rabbitmq import RabbitMQClient
+from utils.batch_writer import BatchWriter
 from utils.sanitize_filename import sanitize_filename
 from scrapy import Spider
-from typing import Dict, Any
+from scrapy.crawler import Crawler
+from typing import Dict, Any, Optional, Union
 import logging
-from scheduler.write_last_timestamp import write_real_last_timestamp
+from scheduler.write_last_timestamp import write_real_last_timestamp, append_arrivals
 
 
 class RawSaveAndPublishPipeline:
     '''
     Pipeline responsible for:
 
-        1. Saving RAW crawled items to disk as JSON files.
+        1. Saving RAW crawled items to disk as JSON files (or segments),
+           through a background `BatchWriter` so the reactor never blocks on disk.
         2. Publishing RAW items to a RabbitMQ queue for downstream preprocessing.
 
     Workflow:
         - On spider open: initializes RabbitMQ client + queue
         - On item process:
-              * Saves item to disk under `data/raw/<spider-name>-<filename>.json`
+              * Queues the item for `data/raw/<spider-name>-<filename>.json`
+                (written in batches by the writer thread; when its bounded
+                queue is full, the item waits in a reactor worker thread)
               * Publishes JSON to RabbitMQ
-        - On spider close: closes RabbitMQ connection
+              * Tracks the newest `publication_timestamp` in memory
+              * Records (publication, crawl) time pairs of live runs
+        - Every `flush_items` items or `flush_interval` seconds: flushes the
+          watermark atomically to `meta/<spider>_last.json` and the arrivals
+          to `meta/<spider>_arrivals.json` (used by the adaptive scheduler)
+        - On spider close: flushes the watermark, drains the writer,
+          closes RabbitMQ connection
 
     Args:
         raw_dir: Directory path to store raw JSON files.
         queue_name: RabbitMQ queue name for sending items.
+        flush_items: Number of items between watermark flushes.
+        flush_interval: Maximum seconds between watermark flushes.
+        share_connection: Reuse one RabbitMQ connection across spider runs of this process.
+        writer_mode: 'files' (one JSON file per item), 'segment' (append-only segments) or 'columnar' (Parquet micro-batches).
+        writer_queue_size: Maximum items waiting for the writer thread.
+        writer_batch_size: Maximum items written per batch.
+        writer_fsync: Fsync every raw file ('files' mode).
     '''
 
-    def __init__(self, raw_dir: str = 'data/raw', queue_name: str = 'raw_news'):
+    # Process-wide connection used when crawls run in a long-lived CrawlerService
+    _shared_client: Optional[RabbitMQClient] = None
+
+    def __init__(self, raw_dir: str = 'data/raw', queue_name: str = 'raw_news', flush_items: int = 50, flush_interval: float = 10.0, share_connection: bool = False,
+                 writer_mode: str = 'files', writer_queue_size: int = 1000, writer_batch_size: int = 100, writer_fsync: bool = False):
         '''
         Initialize pipeline with directories and queue configuration.
 
         Args:
             raw_dir: Directory where JSON files are saved.
             queue_name: RabbitMQ queue for output publishing.
+            flush_items: Number of items between watermark flushes.
+            flush_interval: Maximum seconds between watermark flushes.
+            share_connection: Reuse one RabbitMQ connection across spider runs of this process.
+            writer_mode: 'files' (one JSON file per item), 'segment' (append-only segments) or 'columnar' (Parquet micro-batches).
+            writer_queue_size: Maximum items waiting for the writer thread.
+            writer_batch_size: Maximum items written per batch.
+            writer_fsync: Fsync every raw file ('files' mode).
         '''
         self.raw_dir = raw_dir
         self.queue_name = queue_name
+        self.flush_items = flush_items
+        self.flush_interval = flush_interval
+        self.share_connection = share_connection
+        self.writer_options = {
+            'mode': writer_mode,
+            'max_queue': writer_queue_size,
+            'batch_size': writer_batch_size,
+            'fsync': writer_fsync,
+        }
+        self.writer: Optional[BatchWriter] = None
+
+        # In-memory crawl watermark
+        self.max_timestamp: int = 0
+        self.flushed_timestamp: int = 0
+        self.pending_items: int = 0
+        self.last_flush: float = time.monotonic()
+        self.arrivals: list = []
+
+        # Crawl stats (set by from_crawler), used for pipeline timing
+        self.stats = None
 
         # Ensure directory exists
         os.makedirs(self.raw_dir, exist_ok=True)
         logging.getLogger('pika').setLevel(logging.ERROR)
 
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> 'RawSaveAndPublishPipeline':
+        '''
+        Create the pipeline using the watermark flush and raw writer settings of the crawler.
+
+        Args:
+            crawler: The running crawler.
+
+        Returns:
+            Configured pipeline instance.
+        '''
+        pipeline = cls(
+            flush_items=crawler.settings.getint('WATERMARK_FLUSH_ITEMS', 50),
+            flush_interval=crawler.settings.getfloat('WATERMARK_FLUSH_INTERVAL', 10.0),
+            share_connection=crawler.settings.getbool('RABBITMQ_SHARED_CONNECTION', False),
+            writer_mode=crawler.settings.get('RAW_WRITER_MODE', 'files'),
+            writer_queue_size=crawler.settings.getint('RAW_WRITER_QUEUE_SIZE', 1000),
+            writer_batch_size=crawler.settings.getint('RAW_WRITER_BATCH_SIZE', 100),
+            writer_fsync=crawler.settings.getbool('RAW_WRITER_FSYNC', False),
+        )
+        pipeline.stats = crawler.stats
+        return pipeline
+
     def open_spider(self, spider: Spider) -> None:
         '''
         Called when the spider starts.
 
-        Initializes RabbitMQ connection and declares queue.
+        Initializes RabbitMQ connection (or reuses the shared one), declares queue
+        and starts the raw writer thread.
 
         Args:
             spider: The running spider instance.
         '''
-        self.client: RabbitMQClient = RabbitMQClient()
+        if self.share_connection:
+            cls = type(self)
+            if cls._shared_client is None:
+                cls._shared_client = RabbitMQClient()
+            cls._shared_client.ensure_connection()
+            self.client: RabbitMQClient = cls._shared_client
+        else:
+            self.client = RabbitMQClient()
         self.client.declare_queue(self.queue_name)
+        self.writer = BatchWriter(self.raw_dir, segment_prefix=spider.name, **self.writer_options)
 
-    def process_item(self, item: Dict[str, Any], spider: Spider) -> Dict[str, Any]:
+    def process_item(self, item: Dict[str, Any], spider: Spider) -> Union[Dict[str, Any], Deferred]:
         '''
-        Save item to disk and publish to RabbitMQ.
+        Queue item for saving and publish to RabbitMQ.
 
         Args:
             item (dict | Item): Extracted news item.
             spider (scrapy.Spider): Spider instance.
 
         Returns:
-            item: The same item, unchanged.
+            item: The same item, unchanged (or a Deferred firing with it once
+            the full writer queue accepted it).
         '''
-        data = dict(item)
-        data['site_name'] = spider.name
-        # Save RAW file
+        started = time.perf_counter()
+        raw = dict(item)
+        raw['site_name'] = spider.name
+        # Save RAW file (in the writer thread)
         filename = f'{spider.name}-{sanitize_filename(item["url"])}.json'
-        filepath = os.path.join(self.raw_dir, filename)
+        queued = self.writer.submit(filename, raw)
+
+        # Add raw filename to item for later use
+        data = dict(raw, raw_filename=filename.removesuffix('.json'))
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Track the watermark in memory, flush it in batches
+        self.max_timestamp = max(self.max_timestamp, int(data['publication_timestamp']))
+        self.pending_items += 1
 
-        # Add raw filename to item for later use        
-        data['raw_filename'] = filename.removesuffix('.json')
+        # Arrival history feeds the adaptive crawl interval (live runs only)
+        if not getattr(spider, 'end_date', None):
+            self.arrivals.append((int(data['publication_timestamp']), int(time.time())))
 
-        # write last timestamp to meta file
-        write_real_last_timestamp(spider.name, data['publication_timestamp'])
+        if (self.pending_items >= self.flush_items
+                or time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush_watermark(spider)
 
         # Publish RAW item to RabbitMQ
         self.client.publish(self.queue_name, data)
 
+        if self.stats is not None:
+            self.stats.inc_value('crawl/pipeline_seconds', time.perf_counter() - started)
+
+        if not queued:
+            # Back-pressure: wait for room off the reactor thread
+            if self.stats is not None:
+                self.stats.inc_value('raw_writer/queue_full')
+            d = deferToThread(self.writer.put, filename, raw)
+            d.addCallback(lambda _: item)
+            return d
+
         return item
 
-    def close_spider(self, spider: Spider) -> None:
+    def flush_watermark(self, spider: Spider) -> None:
+        '''
+        Persist the in-memory watermark if it advanced since the last flush,
+        together with the arrivals recorded since then.
+
+        The meta file is only rewritten when the stored value is older, and the
+        write is atomic, so a crash mid-write cannot corrupt it.
+
+        Args:
+            spider: The running spider instance.
+        '''
+        if self.max_timestamp > self.flushed_timestamp:
+            write_real_last_timestamp(spider.name, self.max_timestamp)
+            self.flushed_timestamp = self.max_timestamp
+
+        if self.arrivals:
+            append_arrivals(spider.name, self.arrivals)
+            self.arrivals = []
+
+        self.pending_items = 0
+        self.last_flush = time.monotonic()
+
+    def close_spider(self, spider: Spider) -> Deferred:
         '''
         Called when the spider finishes.
 
-        Closes the RabbitMQ connection gracefully.
+        Flushes the watermark, drains the raw writer in a worker thread and
+        then closes the RabbitMQ connection gracefully (a shared connection
+        stays open for the next run).
 
         Args:
             spider (scrapy.Spider): The spider that has finished execution
+
+        Returns:
+            Deferred firing once every raw file is written.
         '''
-        if self.client:
-            self.client.close()
+        self.flush_watermark(spider)
+
+        def writer_closed(_: Any) -> None:
+            if self.stats is not None:
+                self.stats.set_value('raw_writer/written', self.writer.written)
+                self.stats.set_value('raw_writer/batches', self.writer.batches)
+                self.stats.set_value('raw_writer/errors', self.writer.errors)
+            if self.client and not self.share_connection:
+                self.client.close()
+
+        d = deferToThread(self.writer.close)
+        d.addCallback(writer_closed)
+        return d
@@ -11,6 +11,7 @@ BOT_NAME = "scrapy_app"
 
 SPIDER_MODULES = ["scrapy_app.spiders"]
 NEWSPIDER_MODULE = "scrapy_app.spiders"
+COMMANDS_MODULE = "scrapy_app.commands"
 
 ADDONS = {}
 
@@ -22,6 +23,7 @@ ADDONS = {}
 ROBOTSTXT_OBEY = True
 
 # Concurrency and throttling settings
+# (initial per-domain values, adapted at runtime by AdaptiveThrottleMiddleware)
 #CONCURRENT_REQUESTS = 16
 CONCURRENT_REQUESTS_PER_DOMAIN = 1
 DOWNLOAD_DELAY = 1
@@ -40,21 +42,68 @@ DOWNLOAD_DELAY = 1
 
 # Enable or disable spider middlewares
 # See https://docs.scrapy.org/en/latest/topics/spider-middleware.html
-#SPIDER_MIDDLEWARES = {
-#    "scrapy_app.middlewares.ScrapyAppSpiderMiddleware": 543,
-#}
+SPIDER_MIDDLEWARES = {
+    "scrapy_app.middlewares.SeenUrlSpiderMiddleware": 543,
+    "scrapy_app.middlewares.HtmlArchiveSpiderMiddleware": 550,
+    # Closest to the spider, so only callback time is measured
+    "scrapy_app.middlewares.CrawlTimingSpiderMiddleware": 990,
+}
+
+# Persistent Bloom filter of crawled article URLs (see SeenUrlSpiderMiddleware)
+SEEN_URL_INDEX_ENABLED = True
+SEEN_URL_INDEX_PATH = "meta/seen_urls.bloom"
+SEEN_URL_INDEX_CAPACITY = 5_000_000
+SEEN_URL_INDEX_ERROR_RATE = 1e-4
+
+# Compressed archive of article response bodies, re-extracted offline with
+# `scrapy reextract <spider>` (see HtmlArchiveSpiderMiddleware)
+HTML_ARCHIVE_ENABLED = False
+HTML_ARCHIVE_DIR = "data/archive"
+HTML_ARCHIVE_SEGMENT_MB = 256
+HTML_ARCHIVE_COMPRESSION_LEVEL = 3
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
-#DOWNLOADER_MIDDLEWARES = {
-#    "scrapy_app.middlewares.ScrapyAppDownloaderMiddleware": 543,
-#}
+DOWNLOADER_MIDDLEWARES = {
+    # Parsed robots.txt files are reused across runs of a long-lived CrawlerService
+    "scrapy.downloadermiddlewares.robotstxt.RobotsTxtMiddleware": None,
+    "scrapy_app.middlewares.SharedRobotsTxtMiddleware": 100,
+    "scrapy_app.middlewares.ScrapyAppDownloaderMiddleware": 543,
+    # Above RetryMiddleware (550) so retried 429/503 responses are seen
+    "scrapy_app.middlewares.AdaptiveThrottleMiddleware": 580,
+}
+ROBOTSTXT_CACHE_TTL = 86400
+
+# Conditional requests + link hashing on listing pages (ScrapyAppDownloaderMiddleware)
+LISTING_CHANGE_DETECTION_ENABLED = True
+LISTING_STATE_DIR = "meta"
+
+# Per-domain delay/concurrency adapted to latency, 429/503 and Retry-After
+# (AdaptiveThrottleMiddleware). Per-site bounds come from the `throttle`
+# block of each website in config/settings.yaml; these are the fallbacks.
+ADAPTIVE_THROTTLE_ENABLED = True
+ADAPTIVE_THROTTLE_SITE_CONFIG = "config/settings.yaml"
+ADAPTIVE_THROTTLE_MIN_DELAY = 0.25
+ADAPTIVE_THROTTLE_MAX_DELAY = 60
+ADAPTIVE_THROTTLE_MIN_CONCURRENCY = 1
+ADAPTIVE_THROTTLE_MAX_CONCURRENCY = 1
+ADAPTIVE_THROTTLE_SLOW_FACTOR = 2.0
+ADAPTIVE_THROTTLE_INCREASE_AFTER = 10
+
+# Reuse one RabbitMQ connection across spider runs (enabled by CrawlerService)
+RABBITMQ_SHARED_CONNECTION = False
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
-#EXTENSIONS = {
+EXTENSIONS = {
 #    "scrapy.extensions.telnet.TelnetConsole": None,
-#}
+    "scrapy_app.extensions.CrawlMetricsExtension": 500,
+}
+
+# Per-run crawl summary (counts, download/parse/pipeline time, publication
+# lag) appended as JSON Lines by CrawlMetricsExtension
+CRAWL_METRICS_ENABLED = True
+CRAWL_METRICS_FILE = "meta/metrics/crawl_runs.jsonl"
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
@@ -62,6 +111,20 @@ ITEM_PIPELINES = {
    "scrapy_app.pipelines.RawSaveAndPublishPipeline": 300,
 }
 
+# Crawl watermark (meta/<spider>_last.json) is kept in memory and flushed
+# atomically every N items or T seconds, and on spider close
+WATERMARK_FLUSH_ITEMS = 50
+WATERMARK_FLUSH_INTERVAL = 10
+
+# Raw items are written by a background thread in batches (BatchWriter):
+# "files" keeps one JSON file per item, "segment" appends them to
+# compressed segments under data/raw/segments/, "columnar" to Parquet
+# micro-batches compacted into data/raw/site=<site>/day=<day>/ partitions
+RAW_WRITER_MODE = "files"
+RAW_WRITER_QUEUE_SIZE = 1000
+RAW_WRITER_BATCH_SIZE = 100
+RAW_WRITER_FSYNC = False
+
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
 #AUTOTHROTTLE_ENABLED = True
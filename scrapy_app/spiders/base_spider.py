@@ -1,8 +1,12 @@
 import scrapy
 from scrapy_app.items import NewsArticleItem
-from utils.date_parser import parse_date
-from typing import Optional, Any, List, Generator
+from utils.date_parser import try_parse
+from typing import Optional, Any, AsyncIterator, List, Generator, Set
+from scrapy.exceptions import IgnoreRequest
 from scrapy.http import Response, Request
+from scrapy.spidermiddlewares.httperror import HttpError
+from scrapy.utils.iterators import xmliter_lxml
+from twisted.python.failure import Failure
 
 
 class BaseNewsSpider(scrapy.Spider):
@@ -10,6 +14,7 @@ class BaseNewsSpider(scrapy.Spider):
     Base spider for crawling news websites with archive-style listing pages.
 
     This class handles:
+        - Feed discovery (RSS or news sitemap) with archive fallback
         - Listing page traversal
         - Extracting title, URL, raw date
         - Date filtering based on start_date and end_date arguments
@@ -20,9 +25,30 @@ class BaseNewsSpider(scrapy.Spider):
         LIST_BLOCK_XPATH, TITLE_XPATH, URL_XPATH, DATE_XPATH, NEXT_PAGE_XPATH  
         CATEGORY_XPATH, SUMMARY_XPATH, BODY_XPATH, TAGS_XPATH
 
+    Child classes should set DATE_FORMAT ('iso' or 'jalali'); the default
+    'auto' detects the format of every string. Sites publishing an RSS feed or
+    a news sitemap list it in FEED_URLS.
+
+    Discovery modes:
+        - 'archive': walk the archive listing pages (`start_urls`)
+        - 'feed': read FEED_URLS only
+        - 'auto' (default): read FEED_URLS on live runs and fall back to the
+          archive when a feed fails or does not reach back to `start_date`
+          (a gap); backfills (`end_date` set) and sites without feeds use the archive
+
+    Archive crawls record the listing page on which they reached `start_date`
+    in the `crawl/stop_listing_url` stat. A later run covering older articles
+    can start there (`resume_url`) instead of at the newest listing page.
+
+    Article requests carry the entry listing or feed they were found on
+    (`listing_url` meta); listings with an article download that failed are
+    collected in `failed_listings`, so their change-detection state is not saved.
+
     Args:
         start_date: Minimum timestamp. Articles older than this will stop crawling.
         end_date: Maximum timestamp. Articles newer than this will be skipped.
+        discovery: 'auto', 'feed' or 'archive'.
+        resume_url: Archive listing page to start from instead of `start_urls`.
     '''
 
     # Listing selectors (override per site)
@@ -32,23 +58,205 @@ class BaseNewsSpider(scrapy.Spider):
     DATE_XPATH: str = ''
     NEXT_PAGE_XPATH: str = ''
 
+    # Format of the listing date strings (see utils.date_parser.DATE_PARSERS)
+    DATE_FORMAT: str = 'auto'
+
+    # RSS feeds or news sitemaps (override per site, empty if none)
+    FEED_URLS: List[str] = []
+
     # Article selectors (override per site)
     CATEGORY_XPATH: str = ''
     SUMMARY_XPATH: str = ''
     BODY_XPATH: str = ''
     TAGS_XPATH: str = ''
 
-    def __init__(self, start_date: Optional[int] = None, end_date: Optional[int] = None, *args: Any, **kwargs: Any) -> None:
+    def __init__(self, start_date: Optional[int] = None, end_date: Optional[int] = None, discovery: str = 'auto',
+                 resume_url: Optional[str] = None, *args: Any, **kwargs: Any) -> None:
         '''
         Initialize spider with optional date filters.
 
         Args:
             start_date: Minimum UNIX timestamp to include.
             end_date: Maximum UNIX timestamp to include.
+            discovery: 'auto', 'feed' or 'archive'.
+            resume_url: Archive listing page to start from (e.g. the
+                `crawl/stop_listing_url` of the run covering newer articles).
         '''
         super().__init__(*args, **kwargs)
         self.start_date = start_date
         self.end_date = end_date
+        self.discovery = discovery
+        self.resume_url = resume_url
+        self.failed_listings: Set[str] = set()
+        self._archive_requested = False
+
+    def use_feeds(self) -> bool:
+        '''
+        Decide whether this run discovers articles from FEED_URLS.
+
+        Returns:
+            True for feed discovery, False for the archive crawl.
+        '''
+        if not self.FEED_URLS or self.discovery == 'archive':
+            return False
+        # Feeds only cover recent articles, so bounded backfills walk the archive
+        return self.discovery == 'feed' or not self.end_date
+
+    async def start(self) -> AsyncIterator[Request]:
+        '''
+        Yield the initial requests of the selected discovery mode.
+
+        Yields:
+            scrapy.Request: Feed requests, or archive listing requests.
+        '''
+        if self.use_feeds():
+            for url in self.FEED_URLS:
+                yield scrapy.Request(url, callback=self.parse_feed, errback=self.feed_failed, dont_filter=True)
+        else:
+            for request in self.archive_requests():
+                yield request
+
+    def archive_requests(self) -> List[Request]:
+        '''
+        Return the archive listing requests, once per run.
+
+        Returns:
+            A request for `resume_url` if set, otherwise requests for
+            `start_urls` (empty if already requested).
+        '''
+        if self._archive_requested:
+            return []
+        self._archive_requested = True
+        if self.resume_url:
+            return [scrapy.Request(self.resume_url, callback=self.parse, dont_filter=True, meta={'resumed': True})]
+        return [scrapy.Request(url, callback=self.parse, dont_filter=True) for url in self.start_urls]
+
+    def fallback_to_archive(self, reason: str) -> List[Request]:
+        '''
+        Switch to the archive crawl in 'auto' mode.
+
+        Args:
+            reason: Why the feed was not sufficient (logged and counted).
+
+        Returns:
+            Archive listing requests (empty in 'feed' mode or if already requested).
+        '''
+        if self.discovery == 'feed':
+            return []
+        requests = self.archive_requests()
+        if requests:
+            self._inc_stat(f'crawl/feed_fallback/{reason}')
+            self.logger.info(f'Falling back to the archive crawl: {reason}')
+        return requests
+
+    def feed_failed(self, failure: Failure) -> List[Request]:
+        '''
+        Errback of feed requests.
+
+        An unchanged feed (IgnoreRequest from the listing change detection)
+        means there is nothing new; other failures fall back to the archive.
+
+        Args:
+            failure: The request failure.
+
+        Returns:
+            Archive listing requests, if falling back.
+        '''
+        # HttpError (non-2xx feed) is an IgnoreRequest too, but a real failure
+        if failure.check(IgnoreRequest) and not failure.check(HttpError):
+            return []
+        self.logger.warning(f'Feed request failed: {failure.value!r}')
+        return self.fallback_to_archive('error')
+
+    def parse_feed(self, response: Response) -> Generator[Request, None, None]:
+        '''
+        Parse an RSS feed or a news sitemap.
+
+        The document is iterated node by node (`xmliter_lxml`), entries are
+        filtered with the same `start_date`/`end_date` window as the archive
+        listings and turned into `parse_article` requests. If the oldest entry
+        is still newer than `start_date`, articles may have been missed
+        between the two, so the archive crawl takes over.
+
+        Yields:
+            scrapy.Request: Requests for individual article pages.
+        '''
+        self._inc_stat('crawl/feed_pages')
+        if b'<urlset' in response.body[:1024]:
+            nodes = xmliter_lxml(response, 'url', namespace='http://www.sitemaps.org/schemas/sitemap/0.9', prefix='s')
+            url_xpath = 's:loc/text()'
+            title_xpath = './/*[local-name()="title"]/text()'
+            date_xpath = './/*[local-name()="publication_date"]/text() | s:lastmod/text()'
+        else:
+            nodes = xmliter_lxml(response, 'item')
+            url_xpath, title_xpath, date_xpath = 'link/text()', 'title/text()', 'pubDate/text()'
+
+        entries, oldest = 0, None
+        try:
+            for node in nodes:
+                entries += 1
+                href: Optional[str] = node.xpath(url_xpath).get()
+                date_str: Optional[str] = node.xpath(date_xpath).get()
+                if not date_str:
+                    self._inc_stat('crawl/missing_date')
+                    continue
+
+                dt = try_parse(date_str, 'feed')
+                if dt is None:
+                    self._inc_stat('crawl/date_parse_errors')
+                    self.logger.warning(f'Cannot parse feed date {date_str!r} on {response.url}')
+                    continue
+
+                ts: int = int(dt.timestamp())
+                oldest = ts if oldest is None else min(oldest, ts)
+
+                # Feed entries are not guaranteed to be ordered, so nothing stops early
+                if self.end_date and ts > int(self.end_date):
+                    continue
+                if self.start_date and ts < int(self.start_date):
+                    continue
+
+                if href:
+                    self._inc_stat('crawl/article_requests')
+                    yield scrapy.Request(
+                        response.urljoin(href.strip()),
+                        callback=self.parse_article,
+                        errback=self.article_failed,
+                        meta={'title': node.xpath(title_xpath).get(), 'date': dt.isoformat(), 'timestamp': ts,
+                              'listing_url': response.url}
+                    )
+        except Exception as e:
+            self.logger.warning(f'Cannot parse feed {response.url}: {e}')
+            yield from self.fallback_to_archive('error')
+            return
+
+        if not entries:
+            yield from self.fallback_to_archive('empty')
+        elif self.start_date and (oldest is None or oldest > int(self.start_date)):
+            yield from self.fallback_to_archive('gap')
+
+    def _inc_stat(self, key: str) -> None:
+        '''
+        Increment a crawl stat (no-op when the spider runs without a crawler).
+
+        Args:
+            key: Stat name.
+        '''
+        crawler = getattr(self, 'crawler', None)
+        if crawler is not None and crawler.stats is not None:
+            crawler.stats.inc_value(key)
+
+    def _set_stat(self, key: str, value: Any) -> None:
+        '''
+        Set a crawl stat (no-op when the spider runs without a crawler).
+
+        Args:
+            key: Stat name.
+            value: Stat value.
+        '''
+        crawler = getattr(self, 'crawler', None)
+        if crawler is not None and crawler.stats is not None:
+            crawler.stats.set_value(key, value)
 
     def parse(self, response: Response) -> Generator[Request, None, None]:
         '''
@@ -58,13 +266,22 @@ class BaseNewsSpider(scrapy.Spider):
             1. Extract article blocks using LIST_BLOCK_XPATH
             2. Extract title, URL, and publication date
             3. Convert date to timestamp and apply filtering
+               (entries without a parsable date are counted and skipped)
             4. Yield article requests to `parse_article`
             5. Follow pagination link if available
 
+        A resumed page (`resume_url`) whose first entry is not newer than
+        `end_date` may have shifted past articles of the range (new articles
+        push older ones down the listing), so the crawl restarts from
+        `start_urls` instead.
+
         Yields:
             scrapy.Request: Requests for individual article pages.
         '''
+        self._inc_stat('crawl/listing_pages')
         blocks = response.xpath(self.LIST_BLOCK_XPATH)
+        # Entry page of this listing walk (pagination keeps it)
+        listing_url: str = response.meta.get('listing_url', response.url)
 
         for b in blocks:
             title: Optional[str] = b.xpath(self.TITLE_XPATH).get()
@@ -72,30 +289,68 @@ class BaseNewsSpider(scrapy.Spider):
             date_str: Optional[str] = b.xpath(self.DATE_XPATH).get()
 
             if not date_str:
+                self._inc_stat('crawl/missing_date')
+                continue
+
+            # An unknown date format skips the entry, not the whole listing page
+            dt = try_parse(date_str, self.DATE_FORMAT)
+            if dt is None:
+                self._inc_stat('crawl/date_parse_errors')
+                self.logger.warning(f'Cannot parse {self.DATE_FORMAT} date {date_str!r} on {response.url}')
                 continue
 
-            dt = parse_date(date_str)
             iso: str = dt.isoformat()
             ts: int = int(dt.timestamp())
 
+            if response.meta.pop('resumed', False) and self.end_date and ts <= int(self.end_date):
+                self._inc_stat('crawl/resume_fallback')
+                self.logger.info(f'Resume page {response.url} starts inside the range, restarting from the newest listing')
+                for url in self.start_urls:
+                    yield scrapy.Request(url, callback=self.parse, dont_filter=True)
+                return
+
             # Date filtering base time
             if self.end_date and ts > int(self.end_date):
                 continue
             if self.start_date and ts < int(self.start_date):
+                self._set_stat('crawl/stop_listing_url', response.url)
                 return
 
             url = response.urljoin(href.strip()) if href else None
 
             if url:
+                self._inc_stat('crawl/article_requests')
                 yield scrapy.Request(
                     url,
                     callback=self.parse_article,
-                    meta={'title': title, 'date': iso, 'timestamp': ts}
+                    errback=self.article_failed,
+                    meta={'title': title, 'date': iso, 'timestamp': ts, 'listing_url': listing_url}
                 )
 
         next_page = response.xpath(self.NEXT_PAGE_XPATH).get()
         if next_page:
-            yield response.follow(next_page, callback=self.parse)
+            yield response.follow(next_page, callback=self.parse, meta={'listing_url': listing_url})
+
+    def article_failed(self, failure: Failure) -> None:
+        '''
+        Errback of article requests.
+
+        Records the listing the article was found on, so its unchanged state
+        is not persisted and the article is requested again on the next run.
+        Deliberately dropped requests (IgnoreRequest) are not failures, but
+        non-2xx responses (HttpError, an IgnoreRequest subclass) are.
+
+        Args:
+            failure: The request failure.
+        '''
+        if failure.check(IgnoreRequest) and not failure.check(HttpError):
+            return
+        request = failure.request
+        self._inc_stat('crawl/article_failures')
+        self.logger.warning(f'Article request {request.url} failed: {failure.value!r}')
+        listing_url = request.meta.get('listing_url')
+        if listing_url:
+            self.failed_listings.add(listing_url)
 
     def parse_article(self, response: Response) -> Generator[NewsArticleItem, None, None]:
         '''
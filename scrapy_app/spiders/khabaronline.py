@@ -17,16 +17,19 @@ class KhabaronlineSpider(BaseNewsSpider):
         name: Spider name used by Scrapy commands.
         allowed_domains: Domain restriction for crawling.
         start_urls: Entry archive page to begin crawling.
+        FEED_URLS: RSS feed polled on live runs.
     '''
     name: str = 'khabaronline'
     allowed_domains: List[str] = ['www.khabaronline.ir']
     start_urls: List[str] = ['https://www.khabaronline.ir/archive']
+    FEED_URLS: List[str] = ['https://www.khabaronline.ir/rss']
 
     # Listing XPaths
     LIST_BLOCK_XPATH = "//div[@class='desc']"
     TITLE_XPATH = ".//h3/a/text()"
     URL_XPATH = ".//h3/a/@href"
     DATE_XPATH = "normalize-space(.//time//text())"
+    DATE_FORMAT = 'jalali'
     NEXT_PAGE_XPATH = "//a[contains(@class,'next') or contains(text(),'بعدی')]/@href"
 
     # Article XPaths
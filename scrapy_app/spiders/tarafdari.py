@@ -27,6 +27,7 @@ class TarafdariSpider(BaseNewsSpider):
     TITLE_XPATH = './/h2//a/text()'
     URL_XPATH = './/h2//a/@href'
     DATE_XPATH = './/abbr[@class="timeago"]/@title'
+    DATE_FORMAT = 'iso'
     NEXT_PAGE_XPATH = "//a[contains(@class,'next') or contains(text(),'بعدی')]/@href"
 
     # Article XPaths
@@ -0,0 +1,111 @@
+import os
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from storage.segment_archive import SegmentReader
+
+SEGMENTS_DIR = 'segments'
+
+
+class ArticleArchive:
+    '''
+    Unified reader of an article directory holding loose JSON files and segments.
+
+    Articles of a directory such as `data/raw` live either in loose
+    `<key>.json` files (freshly written) or in `segments/*.seg`, written by the
+    `BatchWriter` segment mode or packed from loose files by `JsonCompactor`.
+    The segment records carry `{'filename': '<key>.json'}` metadata and are
+    indexed by the URL MD5 of the key. A loose file takes precedence over a
+    segment record of the same key (it is at least as recent), so readers see
+    one consistent set of articles while files are being compacted.
+
+    Attributes:
+        directory: Article directory.
+        segments_dir: Segment directory (`<directory>/segments`).
+    '''
+
+    def __init__(self, directory: str):
+        '''
+        Initialize the reader.
+
+        Args:
+            directory: Article directory.
+        '''
+        self.directory = directory
+        self.segments_dir = os.path.join(directory, SEGMENTS_DIR)
+        self.segments = SegmentReader(self.segments_dir)
+
+    @staticmethod
+    def digest(key: str) -> str:
+        '''Return the URL MD5 part of an article key (`<site>-<md5>`).'''
+        return key.rsplit('-', 1)[-1]
+
+    def loose_files(self) -> List[str]:
+        '''Return the names of the loose `<key>.json` files.'''
+        with os.scandir(self.directory) as entries:
+            return [e.name for e in entries if e.name.endswith('.json') and e.is_file()]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        '''
+        Read one article, from its loose file or from the segments.
+
+        Args:
+            key: Article key (file name without `.json`).
+
+        Returns:
+            The article, or None if it is in neither.
+        '''
+        try:
+            with open(os.path.join(self.directory, f'{key}.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+
+        # Loads the segment index on first use; reload it if segments were added since
+        record = self.segments.get(self.digest(key))
+        if record is None and self.segments.segments():
+            self.segments.load_index()
+            record = self.segments.get(self.digest(key))
+        return json.loads(record[1]) if record is not None else None
+
+    def iter_segment_articles(self, segment_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        '''
+        Iterate over the records of one segment (superseded copies included).
+
+        Args:
+            segment_path: Segment file.
+
+        Yields:
+            (key, article) pairs.
+        '''
+        for _, meta, payload in self.segments.iter_records(segment_path):
+            yield meta['filename'].removesuffix('.json'), json.loads(payload)
+
+    def iter_articles(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        '''
+        Iterate over every article once: loose files first, then the latest
+        segment copy of the keys that have no loose file.
+
+        Yields:
+            (key, article) pairs.
+        '''
+        seen = set()
+        for name in self.loose_files():
+            try:
+                with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as f:
+                    article = json.load(f)
+            except FileNotFoundError:
+                continue        # compacted meanwhile, read from its segment below
+            except Exception as e:
+                print(f'[ArticleArchive] Error reading file {name}: {e}')
+                continue
+            key = name.removesuffix('.json')
+            seen.add(self.digest(key))
+            yield key, article
+
+        latest = {(path, offset) for path, offset, _ in self.segments.load_index().values()}
+        for segment_path in self.segments.segments():
+            for offset, meta, payload in self.segments.iter_records(segment_path):
+                key = meta['filename'].removesuffix('.json')
+                if (segment_path, offset) in latest and self.digest(key) not in seen:
+                    yield key, json.loads(payload)
@@ -0,0 +1,468 @@
+import os
+import json
+import glob
+import time
+import fcntl
+import shutil
+import secrets
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Generator, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+
+# Article fields stored as typed columns; any other field is kept in `extra` (JSON)
+SENTIMENT_TYPE = pa.struct([
+    ('sentiment', pa.string()),
+    ('confidence', pa.string()),
+    ('reason', pa.string()),
+])
+
+ARTICLE_SCHEMA = pa.schema([
+    ('key', pa.string()),
+    ('site_name', pa.string()),
+    ('url', pa.string()),
+    ('title', pa.string()),
+    ('publication_date', pa.string()),
+    ('publication_timestamp', pa.int64()),
+    ('summary', pa.string()),
+    ('content', pa.string()),
+    ('category', pa.list_(pa.string())),
+    ('tags', pa.list_(pa.string())),
+    ('sentiment', SENTIMENT_TYPE),
+    ('extra', pa.string()),
+])
+
+_TEXT_FIELDS = ('url', 'title', 'publication_date', 'summary', 'content')
+_LIST_FIELDS = ('category', 'tags')
+_KNOWN_FIELDS = {'site_name', 'publication_timestamp', 'sentiment', *_TEXT_FIELDS, *_LIST_FIELDS}
+
+INCOMING_DIR = 'incoming'
+LOCK_FILE = '.compact.lock'
+
+
+def to_row(key: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    Convert an article document into a row of `ARTICLE_SCHEMA`.
+
+    Args:
+        key: Article key (the JSON file name without extension, `<site>-<url md5>`).
+        doc: Raw, cleaned or sentiment-enriched article.
+
+    Returns:
+        Row dictionary.
+    '''
+    row: Dict[str, Any] = {'key': key, 'site_name': doc.get('site_name') or key.split('-', 1)[0]}
+    for field in _TEXT_FIELDS:
+        value = doc.get(field)
+        row[field] = None if value is None else str(value)
+    for field in _LIST_FIELDS:
+        value = doc.get(field)
+        row[field] = [str(v) for v in value] if isinstance(value, list) else None
+
+    timestamp = doc.get('publication_timestamp')
+    row['publication_timestamp'] = None if timestamp is None else int(timestamp)
+
+    extra = {k: v for k, v in doc.items() if k not in _KNOWN_FIELDS}
+    sentiment = doc.get('sentiment')
+    if isinstance(sentiment, dict):
+        row['sentiment'] = {k: None if sentiment.get(k) is None else str(sentiment[k]) for k in SENTIMENT_TYPE.names}
+        other = {k: v for k, v in sentiment.items() if k not in SENTIMENT_TYPE.names}
+        if other:
+            extra['sentiment'] = other
+    else:
+        row['sentiment'] = None
+
+    row['extra'] = json.dumps(extra, ensure_ascii=False) if extra else None
+    return row
+
+
+def from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    Convert a row of `ARTICLE_SCHEMA` back into an article document.
+
+    Args:
+        row: Row dictionary (as produced by `pa.Table.to_pylist`).
+
+    Returns:
+        Article document (without its key).
+    '''
+    doc = {k: v for k, v in row.items() if k not in ('key', 'sentiment', 'extra')}
+    extra = json.loads(row['extra']) if row.get('extra') else {}
+    if row.get('sentiment') is not None:
+        doc['sentiment'] = dict(row['sentiment'], **extra.pop('sentiment', {}))
+    doc.update(extra)
+    return doc
+
+
+def partition_day(publication_date: Optional[str]) -> str:
+    '''Return the `YYYY-MM-DD` partition of a publication date string.'''
+    return publication_date[:10] if publication_date and len(publication_date) >= 10 else 'unknown'
+
+
+@contextmanager
+def compaction_lock(root: str) -> Generator[None, None, None]:
+    '''
+    Hold the store's exclusive compaction lock (blocks until it is free).
+
+    Args:
+        root: Store directory.
+    '''
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK_FILE), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def expire_partitions(root: str, before_day: str) -> int:
+    '''
+    Delete the compacted partitions of the days before a given day.
+
+    Runs under the compaction lock, so a concurrent `ColumnarStore.compact`
+    never rewrites a partition while it is being deleted. Partitions of
+    unknown day are kept.
+
+    Args:
+        root: Store directory.
+        before_day: First `YYYY-MM-DD` day kept.
+
+    Returns:
+        Number of deleted partitions.
+    '''
+    deleted = 0
+    with compaction_lock(root):
+        for day_dir in glob.glob(os.path.join(root, 'site=*', 'day=*')):
+            day = os.path.basename(day_dir)[len('day='):]
+            if day != 'unknown' and day < before_day:
+                shutil.rmtree(day_dir)
+                deleted += 1
+    return deleted
+
+
+def latest_rows(table: pa.Table) -> pa.Table:
+    '''
+    Drop superseded rows: for every key only its last row is kept.
+
+    Args:
+        table: Rows in write order.
+
+    Returns:
+        The deduplicated rows, in write order.
+    '''
+    if table.num_rows == 0:
+        return table
+    numbered = table.append_column('_row', pa.array(range(table.num_rows), pa.int64()))
+    last = numbered.group_by('key').aggregate([('_row', 'max')])['_row_max']
+    if len(last) == table.num_rows:
+        return table
+    return table.take(last.take(pc.sort_indices(last)))
+
+
+class ColumnarReader:
+    '''
+    Reader of a columnar article store.
+
+    Layout under `root`:
+        incoming/<ns>-<prefix>-<token>.parquet       append-only micro-batches (not compacted yet)
+        site=<site>/day=<YYYY-MM-DD>/part-*.parquet  compacted partitions
+
+    Site and time filters prune whole partition directories before any file
+    is opened, and only the requested columns are read. A key written more
+    than once (e.g. a redelivered message) resolves to its latest row.
+
+    Attributes:
+        root: Store directory.
+    '''
+
+    def __init__(self, root: str):
+        '''
+        Initialize the reader.
+
+        Args:
+            root: Store directory.
+        '''
+        self.root = root
+
+    def incoming_files(self) -> List[str]:
+        '''Return the uncompacted micro-batch paths, oldest first.'''
+        return sorted(glob.glob(os.path.join(self.root, INCOMING_DIR, '*.parquet')))
+
+    def partitions(self, sites: Optional[Sequence[str]] = None, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> List[Tuple[str, str, List[str]]]:
+        '''
+        List the compacted partitions matching the filters.
+
+        Args:
+            sites: Site names to keep (all if None).
+            start: Earliest publication time (naive local time).
+            end: Latest publication time (naive local time).
+
+        Returns:
+            (site, day, part paths oldest first) tuples.
+        '''
+        first_day = start.strftime('%Y-%m-%d') if start else None
+        last_day = end.strftime('%Y-%m-%d') if end else None
+        result = []
+        for site_dir in sorted(glob.glob(os.path.join(self.root, 'site=*'))):
+            site = os.path.basename(site_dir)[len('site='):]
+            if sites is not None and site not in sites:
+                continue
+            for day_dir in sorted(glob.glob(os.path.join(site_dir, 'day=*'))):
+                day = os.path.basename(day_dir)[len('day='):]
+                if day != 'unknown' and ((first_day and day < first_day) or (last_day and day > last_day)):
+                    continue
+                parts = sorted(glob.glob(os.path.join(day_dir, 'part-*.parquet')))
+                if parts:
+                    result.append((site, day, parts))
+        return result
+
+    def _read_files(self, paths: List[str], columns: Optional[List[str]]) -> pa.Table:
+        '''Read and concatenate Parquet files.'''
+        tables = [pq.read_table(path, columns=columns, schema=ARTICLE_SCHEMA) for path in paths]
+        if not tables:
+            return ARTICLE_SCHEMA.empty_table().select(columns or ARTICLE_SCHEMA.names)
+        return pa.concat_tables(tables)
+
+    def read(self, sites: Optional[Sequence[str]] = None, start: Optional[datetime] = None,
+             end: Optional[datetime] = None, columns: Optional[List[str]] = None,
+             keys: Optional[Sequence[str]] = None) -> pa.Table:
+        '''
+        Read the latest version of every article matching the filters.
+
+        Args:
+            sites: Site names to keep (all if None).
+            start: Earliest publication time (naive local time, inclusive).
+            end: Latest publication time (naive local time, inclusive).
+            columns: Columns to read (all if None).
+            keys: Article keys to keep (all if None); their sites prune the partitions.
+
+        Returns:
+            Arrow table of the matching articles.
+        '''
+        wanted = list(columns) if columns else list(ARTICLE_SCHEMA.names)
+        read_cols = list(dict.fromkeys(wanted + ['key', 'site_name', 'publication_timestamp']))
+        if keys is not None and sites is None:
+            sites = sorted({key.split('-', 1)[0] for key in keys})
+
+        for attempt in range(3):
+            paths = [p for _, _, parts in self.partitions(sites, start, end) for p in parts]
+            try:
+                table = self._read_files(paths + self.incoming_files(), read_cols)
+                break
+            except FileNotFoundError:
+                # A concurrent compaction replaced some files, list them again
+                if attempt == 2:
+                    raise
+
+        mask = None
+        if sites is not None:
+            mask = pc.is_in(table['site_name'], value_set=pa.array(list(sites), pa.string()))
+        for bound, compare in ((start, pc.greater_equal), (end, pc.less_equal)):
+            if bound is not None:
+                cond = compare(table['publication_timestamp'], int(bound.timestamp()))
+                mask = cond if mask is None else pc.and_(mask, cond)
+        if keys is not None:
+            cond = pc.is_in(table['key'], value_set=pa.array(list(keys), pa.string()))
+            mask = cond if mask is None else pc.and_(mask, cond)
+        if mask is not None:
+            table = table.filter(mask)
+
+        return latest_rows(table).select(wanted)
+
+    def iter_documents(self, sites: Optional[Sequence[str]] = None, start: Optional[datetime] = None,
+                       end: Optional[datetime] = None, keys: Optional[Sequence[str]] = None,
+                       columns: Optional[List[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        '''
+        Iterate over the matching articles as JSON-like documents.
+
+        Args:
+            sites: Site names to keep (all if None).
+            start: Earliest publication time (naive local time, inclusive).
+            end: Latest publication time (naive local time, inclusive).
+            keys: Article keys to keep (all if None).
+            columns: Columns to read (all if None; `key` is always read).
+
+        Yields:
+            (key, document) pairs (holding only the read fields).
+        '''
+        if columns is not None and 'key' not in columns:
+            columns = ['key'] + list(columns)
+        for batch in self.read(sites, start, end, columns=columns, keys=keys).to_batches():
+            for row in batch.to_pylist():
+                yield row['key'], from_row(row)
+
+    def read_file(self, path: str, columns: Optional[List[str]] = None) -> pa.Table:
+        '''
+        Read the rows of one micro-batch or partition file (superseded rows included).
+
+        Args:
+            path: Parquet file of the store.
+            columns: Columns to read (all if None).
+
+        Returns:
+            The rows, in file order.
+        '''
+        return pq.read_table(path, columns=columns, schema=ARTICLE_SCHEMA)
+
+    def iter_file_documents(self, path: str, columns: Optional[List[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        '''
+        Iterate over the rows of one micro-batch or partition file.
+
+        Rows superseded by later files are included; callers combining files
+        resolve keys themselves (latest file wins).
+
+        Args:
+            path: Parquet file of the store.
+            columns: Columns to read (all if None; must include `key`).
+
+        Yields:
+            (key, document) pairs.
+        '''
+        for row in self.read_file(path, columns).to_pylist():
+            yield row['key'], from_row(row)
+
+
+class ColumnarStore(ColumnarReader):
+    '''
+    Append-only columnar article store, compacted into Parquet partitions by site and day.
+
+    Writers buffer rows in memory and write them as one Parquet micro-batch
+    under `incoming/` when `batch_rows` rows are buffered or the oldest row
+    is `flush_seconds` old (see `flush_due`). Every `compact_every` flushes
+    (or on demand) the micro-batches are merged into their
+    `site=<site>/day=<day>` partitions: each touched partition is rewritten
+    as a single file and the consumed micro-batches are deleted. Compaction
+    holds an exclusive file lock, so several writers can share a store; a
+    crash mid-compaction at worst leaves duplicate rows, which readers and
+    the next compaction resolve by key.
+
+    Attributes:
+        batch_rows: Rows per micro-batch.
+        flush_seconds: Maximum age of buffered rows.
+        compact_every: Flushes between compactions (0 disables automatic compaction).
+        compression: Parquet compression codec.
+        prefix: File name prefix of this writer's micro-batches.
+        flushes: Micro-batches written so far.
+    '''
+
+    def __init__(self, root: str, batch_rows: int = 200, flush_seconds: float = 30.0, compact_every: int = 20,
+                 compression: str = 'zstd', prefix: str = 'batch'):
+        '''
+        Initialize the store.
+
+        Args:
+            root: Store directory.
+            batch_rows: Rows per micro-batch.
+            flush_seconds: Maximum age of buffered rows before `flush_due` is True.
+            compact_every: Flushes between automatic compactions (0 disables them).
+            compression: Parquet compression codec.
+            prefix: File name prefix of this writer's micro-batches.
+        '''
+        super().__init__(root)
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.compact_every = compact_every
+        self.compression = compression
+        self.prefix = prefix
+        self.flushes: int = 0
+
+        self._rows: List[Dict[str, Any]] = []
+        self._first_buffered: float = 0.0
+
+        os.makedirs(os.path.join(self.root, INCOMING_DIR), exist_ok=True)
+
+    def append(self, key: str, doc: Dict[str, Any]) -> None:
+        '''
+        Buffer one article (written by the next `flush`).
+
+        Args:
+            key: Article key (`<site>-<url md5>`).
+            doc: Article document.
+        '''
+        if not self._rows:
+            self._first_buffered = time.monotonic()
+        self._rows.append(to_row(key, doc))
+
+    @property
+    def buffered(self) -> int:
+        '''Number of rows waiting for the next flush.'''
+        return len(self._rows)
+
+    def flush_due(self) -> bool:
+        '''Return True if the buffer is full or its oldest row exceeded `flush_seconds`.'''
+        return bool(self._rows) and (
+            len(self._rows) >= self.batch_rows
+            or time.monotonic() - self._first_buffered >= self.flush_seconds)
+
+    def _write(self, table: pa.Table, path: str) -> None:
+        '''Write a table durably and atomically (temporary file, fsync, rename).'''
+        tmp = f'{path}.tmp'
+        pq.write_table(table, tmp, compression=self.compression)
+        with open(tmp, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def flush(self) -> int:
+        '''
+        Write the buffered rows as one micro-batch (and compact if due).
+
+        Returns:
+            Number of rows written.
+        '''
+        if not self._rows:
+            return 0
+        rows, self._rows = self._rows, []
+        name = f'{time.time_ns():020d}-{self.prefix}-{secrets.token_hex(3)}.parquet'
+        self._write(pa.Table.from_pylist(rows, schema=ARTICLE_SCHEMA), os.path.join(self.root, INCOMING_DIR, name))
+
+        self.flushes += 1
+        if self.compact_every and self.flushes % self.compact_every == 0:
+            # The micro-batch is already durable, a failed compaction is retried later
+            try:
+                self.compact()
+            except Exception as e:
+                print(f'[ColumnarStore] Compaction of {self.root} failed: {e}')
+        return len(rows)
+
+    def compact(self) -> int:
+        '''
+        Merge the pending micro-batches into their site/day partitions.
+
+        Returns:
+            Number of micro-batch rows compacted.
+        '''
+        with compaction_lock(self.root):
+            incoming = self.incoming_files()
+            if not incoming:
+                return 0
+            new = pa.concat_tables([pq.read_table(p, schema=ARTICLE_SCHEMA) for p in incoming])
+
+            days = pa.array([partition_day(d) for d in new['publication_date'].to_pylist()], pa.string())
+            groups: Dict[Tuple[str, str], List[int]] = {}
+            for i, (site, day) in enumerate(zip(new['site_name'].to_pylist(), days.to_pylist())):
+                groups.setdefault((site or 'unknown', day), []).append(i)
+
+            for (site, day), indices in groups.items():
+                day_dir = os.path.join(self.root, f'site={site}', f'day={day}')
+                os.makedirs(day_dir, exist_ok=True)
+                old_parts = sorted(glob.glob(os.path.join(day_dir, 'part-*.parquet')))
+                tables = [pq.read_table(p, schema=ARTICLE_SCHEMA) for p in old_parts]
+                tables.append(new.take(pa.array(indices, pa.int64())))
+                merged = latest_rows(pa.concat_tables(tables))
+
+                self._write(merged, os.path.join(day_dir, f'part-{time.time_ns():020d}-{secrets.token_hex(3)}.parquet'))
+                for path in old_parts:
+                    os.remove(path)
+
+            for path in incoming:
+                os.remove(path)
+
+        print(f'[ColumnarStore] Compacted {new.num_rows} rows into {len(groups)} partitions of {self.root}')
+        return new.num_rows
+
+    def close(self) -> None:
+        '''Write the remaining buffered rows.'''
+        self.flush()
@@ -0,0 +1,232 @@
+'''
+Small-file compaction and retention of the article directories.
+
+Usage:
+    python -m storage.compaction            # one pass with config/settings.yaml
+    python -m storage.compaction --forever  # run every `interval_minutes`
+'''
+import os
+import glob
+import time
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from storage.article_archive import ArticleArchive
+from storage.columnar_store import expire_partitions
+from storage.segment_archive import SegmentWriter
+from utils.config_manager import ConfigManager
+
+
+class JsonCompactor:
+    '''
+    Packs the loose JSON files of an article directory into segments and applies retention.
+
+    Files are grouped into time windows of `window_hours` by modification time.
+    A window is closed once its end is `grace_hours` old (late rewrites of its
+    files are unlikely); each closed window is written to one zstd segment
+    under `<directory>/segments/` (named `window-<start>-...`), fsynced, and
+    only then are its files deleted. A file modified while it was packed is
+    kept, and `ArticleArchive` prefers it over the segment copy.
+
+    Retention (`retention_days`, None keeps everything) deletes loose files,
+    segments and columnar `site=*/day=*` partitions older than the cutoff.
+    Packed segments get their window end as modification time, so they expire
+    with the age of their data rather than the time they were packed.
+
+    Attributes:
+        directory: Article directory.
+        window_hours: Compaction window size.
+        grace_hours: Age of a window end before the window is compacted.
+        retention_days: Days of data kept, or None.
+    '''
+
+    def __init__(self, directory: str, window_hours: float = 24, grace_hours: float = 2,
+                 retention_days: Optional[float] = None):
+        '''
+        Initialize the compactor.
+
+        Args:
+            directory: Article directory.
+            window_hours: Compaction window size in hours.
+            grace_hours: Age of a window end before the window is compacted.
+            retention_days: Days of data kept (None keeps everything).
+        '''
+        self.directory = directory
+        self.window_hours = window_hours
+        self.grace_hours = grace_hours
+        self.retention_days = retention_days
+
+    def run(self, now: Optional[float] = None) -> Dict[str, int]:
+        '''
+        Apply retention, then compact the closed windows.
+
+        Args:
+            now: Current UNIX time (defaults to the clock).
+
+        Returns:
+            Counters: `packed` files, `segments` written, `expired` files,
+            `expired_segments` and `expired_partitions` deleted.
+        '''
+        now = time.time() if now is None else now
+        stats = {'packed': 0, 'segments': 0, 'expired': 0, 'expired_segments': 0, 'expired_partitions': 0}
+        if not os.path.isdir(self.directory):
+            return stats
+
+        if self.retention_days is not None:
+            self.expire(now - self.retention_days * 86400, stats)
+
+        window = int(self.window_hours * 3600)
+        closed_before = now - self.grace_hours * 3600
+
+        # Windows follow local wall-clock time (daily windows start at midnight)
+        offset = int(datetime.now().astimezone().utcoffset().total_seconds())
+        windows: Dict[int, List[Tuple[str, int, int]]] = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json') or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                start = int(stat.st_mtime + offset) // window * window - offset
+                if start + window <= closed_before:
+                    windows.setdefault(start, []).append((entry.name, stat.st_mtime_ns, stat.st_size))
+
+        for start, files in sorted(windows.items()):
+            stats['packed'] += self.pack(start, files)
+            stats['segments'] += 1
+
+        return stats
+
+    def pack(self, window_start: int, files: List[Tuple[str, int, int]]) -> int:
+        '''
+        Write the files of one window to a new segment, then delete them.
+
+        Args:
+            window_start: UNIX time of the window start.
+            files: (name, mtime_ns, size) of the files to pack.
+
+        Returns:
+            Number of files packed and deleted.
+        '''
+        prefix = f'window-{datetime.fromtimestamp(window_start):%Y%m%d%H}'
+        writer = SegmentWriter(os.path.join(self.directory, 'segments'), prefix=prefix)
+
+        packed: List[Tuple[str, int, int]] = []
+        segments = set()
+        for name, mtime_ns, size in files:
+            try:
+                with open(os.path.join(self.directory, name), 'rb') as f:
+                    payload = f.read()
+            except FileNotFoundError:
+                continue
+            writer.append(ArticleArchive.digest(name.removesuffix('.json')), payload,
+                          {'filename': name, 'mtime': mtime_ns // 1_000_000_000})
+            packed.append((name, mtime_ns, size))
+            segments.add(writer.segment_path)
+        writer.close()
+
+        window_end = window_start + int(self.window_hours * 3600)
+        for segment_path in segments:
+            os.utime(segment_path, (window_end, window_end))
+
+        deleted = 0
+        for name, mtime_ns, size in packed:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+                if (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size):
+                    os.remove(path)
+                    deleted += 1
+            except FileNotFoundError:
+                continue
+        return deleted
+
+    def expire(self, cutoff: float, stats: Dict[str, int]) -> None:
+        '''
+        Delete the data older than the cutoff.
+
+        Args:
+            cutoff: UNIX time; loose files and segments last modified before it,
+                and columnar partitions of earlier days, are deleted.
+            stats: Counters updated in place.
+        '''
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    stats['expired'] += 1
+
+        for segment_path in glob.glob(os.path.join(self.directory, 'segments', '*.seg')):
+            if os.path.getmtime(segment_path) < cutoff:
+                index_path = segment_path[:-len('.seg')] + '.idx'
+                os.remove(segment_path)
+                if os.path.exists(index_path):
+                    os.remove(index_path)
+                stats['expired_segments'] += 1
+
+        # Columnar partitions are deleted under the store's compaction lock
+        if glob.glob(os.path.join(self.directory, 'site=*')):
+            stats['expired_partitions'] += expire_partitions(
+                self.directory, datetime.fromtimestamp(cutoff).strftime('%Y-%m-%d'))
+
+
+class CompactionService:
+    '''
+    Periodic compaction and retention of the configured article directories.
+
+    Attributes:
+        compactors: Compactor per directory name.
+        interval_minutes: Minutes between passes.
+    '''
+
+    def __init__(self, compaction_config: dict):
+        '''
+        Build one compactor per configured directory.
+
+        Args:
+            compaction_config: The `compaction` section of the settings file.
+        '''
+        self.interval_minutes: float = compaction_config.get('interval_minutes', 60)
+        self.compactors: Dict[str, JsonCompactor] = {
+            name: JsonCompactor(
+                cfg['path'],
+                window_hours=compaction_config.get('window_hours', 24),
+                grace_hours=compaction_config.get('grace_hours', 2),
+                retention_days=cfg.get('retention_days'),
+            )
+            for name, cfg in (compaction_config.get('directories') or {}).items()
+        }
+
+    def run_once(self) -> None:
+        '''Compact every directory once.'''
+        for name, compactor in self.compactors.items():
+            try:
+                stats = compactor.run()
+            except Exception as e:
+                print(f'[Compaction] {name} failed: {e}')
+                continue
+            if any(stats.values()):
+                print(f'[Compaction] {name}: ' + ', '.join(f'{k}={v}' for k, v in stats.items()))
+
+    def run_forever(self) -> None:
+        '''Compact every `interval_minutes`, starting after one interval.'''
+        print(f'[Compaction] Running every {self.interval_minutes} minutes')
+        while True:
+            time.sleep(self.interval_minutes * 60)
+            self.run_once()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compact and expire the article directories')
+    parser.add_argument('--config', default='config/settings.yaml', help='settings file')
+    parser.add_argument('--forever', action='store_true', help='keep running every interval_minutes')
+    args = parser.parse_args()
+
+    service = CompactionService(ConfigManager(args.config).get_compaction_config())
+    service.run_once()
+    if args.forever:
+        service.run_forever()
+
+
+if __name__ == '__main__':
+    main()
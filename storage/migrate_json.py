@@ -0,0 +1,89 @@
+'''
+Convert a JSON article directory into a columnar store.
+
+Every article of the directory, loose `<key>.json` file or `segments/*.seg`
+record (`ArticleArchive`), is appended to the store (in micro-batches of
+`--batch-rows`), then the store is compacted into its site/day Parquet
+partitions. The JSON files and segments are only deleted with `--delete`,
+after the compaction succeeded; a segment that grew during the migration is
+kept. Running the migration twice is harmless: rows are keyed by file name
+and the latest one wins.
+
+Usage:
+    python -m storage.migrate_json data/sentiments
+    python -m storage.migrate_json data/cleaned --batch-rows 5000 --delete
+    python -m storage.migrate_json data/raw --root data/raw_columnar
+'''
+import os
+import argparse
+
+from storage.article_archive import ArticleArchive
+from storage.columnar_store import ColumnarStore
+
+
+def migrate(json_dir: str, root: str, batch_rows: int = 5000, delete: bool = False) -> int:
+    '''
+    Migrate a JSON article directory into a columnar store.
+
+    Args:
+        json_dir: Article directory (loose `<key>.json` files and segments).
+        root: Columnar store directory (may be `json_dir` itself).
+        batch_rows: Rows per micro-batch.
+        delete: Delete the JSON files and segments after a successful compaction.
+
+    Returns:
+        Number of migrated articles.
+    '''
+    store = ColumnarStore(root, batch_rows=batch_rows, compact_every=0, prefix='migrate')
+    archive = ArticleArchive(json_dir)
+    # Sizes before reading: a segment still being appended to is not deleted
+    segment_sizes = {path: os.path.getsize(path) for path in archive.segments.segments()}
+    migrated, failed = [], 0
+
+    for key, article in archive.iter_articles():
+        try:
+            store.append(key, article)
+        except Exception as e:
+            failed += 1
+            print(f'[Migrate] Error converting article {key}: {e}')
+            continue
+        migrated.append(key)
+        if store.buffered >= batch_rows:
+            store.flush()
+            print(f'[Migrate] {len(migrated)} articles read')
+
+    store.close()
+    store.compact()
+
+    if delete:
+        for key in migrated:
+            path = os.path.join(json_dir, f'{key}.json')
+            if os.path.exists(path):
+                os.remove(path)
+        for segment_path, size in segment_sizes.items():
+            if os.path.getsize(segment_path) != size:
+                print(f'[Migrate] Keeping {segment_path}: it was written to during the migration')
+                continue
+            index_path = segment_path[:-len('.seg')] + '.idx'
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            os.remove(segment_path)
+
+    print(f'[Migrate] {json_dir} -> {root}: {len(migrated)} articles migrated, {failed} failed'
+          f'{", JSON files and segments deleted" if delete else ""}')
+    return len(migrated)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Convert a JSON article directory into a columnar store')
+    parser.add_argument('json_dir', help='article directory (<key>.json files and segments/)')
+    parser.add_argument('--root', help='columnar store directory (default: the JSON directory itself)')
+    parser.add_argument('--batch-rows', type=int, default=5000, help='rows per micro-batch')
+    parser.add_argument('--delete', action='store_true', help='delete the JSON files and segments after migrating')
+    args = parser.parse_args()
+
+    migrate(args.json_dir, args.root or args.json_dir, args.batch_rows, args.delete)
+
+
+if __name__ == '__main__':
+    main()
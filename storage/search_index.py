@@ -0,0 +1,337 @@
+'''
+Persian full-text search index of the sentiment results.
+
+Usage (index the results that already exist):
+    python -m storage.search_index data/sentiments
+    python -m storage.search_index data/sentiments --backend columnar --db data/search_index.db
+    python -m storage.search_index --db data/search_index.db --query "بانک مرکزی"
+'''
+import os
+import re
+import zlib
+import sqlite3
+import argparse
+from datetime import datetime
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from hazm import Normalizer, Stemmer, stopwords_list, word_tokenize
+
+from storage.sentiment_index import SentimentIndex, iter_results
+
+# Segment of the articles without publication time (searched last)
+UNKNOWN_SEGMENT = -1
+
+
+class PersianAnalyzer:
+    '''
+    Turns Persian text into index terms.
+
+    The text is normalized with the hazm normalizer (character forms,
+    half-spaces, digits), tokenized, and every word is stemmed; stopwords,
+    punctuation and single characters are dropped. Documents and queries go
+    through the same steps, so `کتاب‌ها` matches `کتاب`.
+    '''
+
+    def __init__(self) -> None:
+        '''Initialize the hazm normalizer, tokenizer and stemmer once.'''
+        self.normalizer = Normalizer()
+        self.stemmer = Stemmer()
+        self.word_pattern = re.compile(r'\w')
+        self.stopwords = {self.normalizer.normalize(w) for w in stopwords_list()}
+
+    def terms(self, text: Optional[str]) -> List[str]:
+        '''
+        Analyze a text.
+
+        Args:
+            text: Text to analyze (None or empty yields no term).
+
+        Returns:
+            The terms in text order (repeated terms included).
+        '''
+        if not text:
+            return []
+        terms = []
+        for token in word_tokenize(self.normalizer.normalize(text)):
+            if len(token) < 2 or token in self.stopwords or not self.word_pattern.search(token):
+                continue
+            terms.append((self.stemmer.stem(token) or token).lower())
+        return terms
+
+
+def segment_of(timestamp: Optional[int], offset: int) -> int:
+    '''Return the posting segment (local day number) of a publication timestamp.'''
+    return UNKNOWN_SEGMENT if timestamp is None else (int(timestamp) + offset) // 86400
+
+
+def encode_postings(doc_ids: np.ndarray) -> bytes:
+    '''Compress a sorted array of document ids (zlib-compressed uint32 deltas).'''
+    return zlib.compress(np.diff(doc_ids, prepend=0).astype(np.uint32).tobytes())
+
+
+def decode_postings(data: bytes) -> np.ndarray:
+    '''Decompress the document ids written by `encode_postings`.'''
+    return np.cumsum(np.frombuffer(zlib.decompress(data), dtype=np.uint32), dtype=np.int64)
+
+
+class SearchIndex:
+    '''
+    SQLite (WAL mode) inverted index of the sentiment results, segmented by publication day.
+
+    Every article gets an increasing document id (`docs`, which also holds
+    the metadata the dashboard lists). The title, summary, content and tags
+    are analyzed with `PersianAnalyzer`; each term has one posting list per
+    segment (local publication day) in `postings`: the sorted document ids,
+    stored as zlib-compressed deltas. Since ids only grow, indexing an
+    article appends to the lists of its day.
+
+    A query analyzes its text like the documents, looks up the days where
+    all of its terms occur, newest first, and intersects their posting
+    lists (numpy) day by day; the time, site and label filters are then
+    checked on `docs`, and the scan stops once `limit` articles matched.
+    Query time therefore depends on the days scanned, not on the size of
+    the history.
+
+    Re-indexing a key gives it a new id; the postings of the old id are
+    ignored at query time (it no longer is in `docs`).
+
+    Attributes:
+        db_path: SQLite database file.
+        conn: Open connection.
+        analyzer: Text analyzer shared by indexing and queries.
+    '''
+
+    COLUMNS = ('key', 'site_name', 'url', 'title', 'publication_date', 'publication_timestamp',
+               'sentiment_label', 'sentiment_confidence', 'filename')
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS docs (
+            doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            key TEXT NOT NULL UNIQUE,
+            site_name TEXT NOT NULL,
+            url TEXT,
+            title TEXT,
+            publication_date TEXT,
+            publication_timestamp INTEGER,
+            sentiment_label TEXT,
+            sentiment_confidence INTEGER,
+            filename TEXT NOT NULL,
+            segment INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS terms (
+            term_id INTEGER PRIMARY KEY,
+            term TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS postings (
+            term_id INTEGER NOT NULL,
+            segment INTEGER NOT NULL,
+            doc_count INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            PRIMARY KEY (term_id, segment)
+        ) WITHOUT ROWID;
+    '''
+
+    # Parameters per `IN (...)` list, below SQLite's variable limit
+    CHUNK = 900
+
+    def __init__(self, db_path: str = 'data/search_index.db', readonly: bool = False):
+        '''
+        Open (and create if needed) the index.
+
+        Args:
+            db_path: SQLite database file.
+            readonly: Open an existing database for reading only.
+
+        Raises:
+            sqlite3.OperationalError: If `readonly` is set and the database does not exist.
+        '''
+        self.db_path = db_path
+        if readonly:
+            self.conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True, check_same_thread=False)
+        else:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.executescript(self.SCHEMA)
+        self.analyzer = PersianAnalyzer()
+
+        # Segments are local days, like the dashboard's daily buckets
+        self.offset = int(datetime.now().astimezone().utcoffset().total_seconds())
+
+    def add(self, key: str, article: Dict[str, Any]) -> None:
+        '''
+        Index one article (committed immediately).
+
+        Args:
+            key: Article key (the raw file name without extension).
+            article: Article with its `sentiment` result.
+        '''
+        self.add_many([(key, article)])
+
+    def add_many(self, articles: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        '''
+        Index many articles in one transaction.
+
+        The postings of the batch are grouped per term and segment first, so
+        each posting list is rewritten once per batch.
+
+        Args:
+            articles: (key, article) pairs.
+
+        Returns:
+            Number of articles indexed.
+        '''
+        new_postings: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        count = 0
+        with self.conn:
+            for key, article in articles:
+                row = SentimentIndex.to_row(key, article)
+                # key, site, url, title, date, timestamp, label, confidence (reason, category, tags skipped)
+                values = (*row[:8], f'{key}.json', segment_of(row[5], self.offset))
+                self.conn.execute('DELETE FROM docs WHERE key = ?', (key,))
+                doc_id = self.conn.execute(
+                    f'INSERT INTO docs ({", ".join(self.COLUMNS)}, segment) VALUES ({", ".join("?" * len(values))})',
+                    values).lastrowid
+
+                text = ' '.join(filter(None, [article.get('title'), article.get('summary'), article.get('content'),
+                                              ' '.join(article.get('tags') or [])]))
+                for term in set(self.analyzer.terms(text)):
+                    new_postings[(term, values[-1])].append(doc_id)
+                count += 1
+
+            if new_postings:
+                self._merge(new_postings)
+        return count
+
+    def _merge(self, new_postings: Dict[Tuple[str, int], List[int]]) -> None:
+        '''Append new document ids to their posting lists (inside the caller's transaction).'''
+        terms = sorted({term for term, _ in new_postings})
+        self.conn.executemany('INSERT OR IGNORE INTO terms (term) VALUES (?)', ((t,) for t in terms))
+        term_ids = self._term_ids(terms)
+
+        rows = []
+        for (term, segment), doc_ids in new_postings.items():
+            term_id = term_ids[term]
+            existing = self.conn.execute(
+                'SELECT data FROM postings WHERE term_id = ? AND segment = ?', (term_id, segment)).fetchone()
+            ids = np.asarray(doc_ids, dtype=np.int64)
+            if existing is not None:
+                # New ids are larger than every stored one: the list stays sorted
+                ids = np.concatenate([decode_postings(existing[0]), ids])
+            rows.append((term_id, segment, len(ids), encode_postings(ids)))
+        self.conn.executemany('INSERT OR REPLACE INTO postings VALUES (?, ?, ?, ?)', rows)
+
+    def _term_ids(self, terms: Sequence[str]) -> Dict[str, int]:
+        '''Look up the ids of the known terms.'''
+        ids: Dict[str, int] = {}
+        for i in range(0, len(terms), self.CHUNK):
+            chunk = terms[i:i + self.CHUNK]
+            ids.update(self.conn.execute(
+                f'SELECT term, term_id FROM terms WHERE term IN ({", ".join("?" * len(chunk))})', chunk))
+        return ids
+
+    def search(self, query: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+               sites: Optional[Sequence[str]] = None, labels: Optional[Sequence[str]] = None,
+               limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        '''
+        Find the articles containing every term of a query, newest first.
+
+        Args:
+            query: Search text (analyzed like the documents).
+            start: Earliest publication time (inclusive).
+            end: Latest publication time (inclusive).
+            sites: Site names to keep (all if None).
+            labels: Sentiment labels to keep (all if None).
+            limit: Maximum rows returned (None for all matches).
+
+        Returns:
+            Rows as dictionaries with the `COLUMNS` fields.
+        '''
+        terms = sorted(set(self.analyzer.terms(query)))
+        term_ids = self._term_ids(terms)
+        if not terms or len(term_ids) < len(terms):
+            return []
+
+        # Days where every term occurs, newest first (articles without date last)
+        low = segment_of(int(start.timestamp()), self.offset) if start is not None else None
+        high = segment_of(int(end.timestamp()), self.offset) if end is not None else None
+        segments: Optional[set] = None
+        for term_id in term_ids.values():
+            found = {s for (s,) in self.conn.execute('SELECT segment FROM postings WHERE term_id = ?', (term_id,))
+                     if (low is None or s >= low) and (high is None or s <= high)
+                     and (s != UNKNOWN_SEGMENT or (low is None and high is None))}
+            segments = found if segments is None else segments & found
+
+        placeholders = ', '.join('?' * len(term_ids))
+        rows: List[Dict[str, Any]] = []
+        for segment in sorted(segments, key=lambda s: (s == UNKNOWN_SEGMENT, -s)):
+            lists = [decode_postings(data) for (data,) in self.conn.execute(
+                f'SELECT data FROM postings WHERE segment = ? AND term_id IN ({placeholders}) ORDER BY doc_count',
+                (segment, *term_ids.values()))]
+            doc_ids = lists[0]
+            for other in lists[1:]:
+                doc_ids = np.intersect1d(doc_ids, other, assume_unique=True)
+            if len(doc_ids):
+                rows.extend(self._docs(doc_ids.tolist(), start, end, sites, labels))
+            if limit is not None and len(rows) >= limit:
+                break
+
+        rows.sort(key=lambda r: r['publication_timestamp'] or 0, reverse=True)
+        return rows[:limit] if limit is not None else rows
+
+    def _docs(self, doc_ids: List[int], start: Optional[datetime], end: Optional[datetime],
+              sites: Optional[Sequence[str]], labels: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+        '''Fetch the documents of matching ids that pass the filters.'''
+        where, params = SentimentIndex._where(start, end, sites, labels)
+        where = where.replace(' WHERE ', ' AND ', 1)
+        rows = []
+        for i in range(0, len(doc_ids), self.CHUNK):
+            chunk = doc_ids[i:i + self.CHUNK]
+            cursor = self.conn.execute(
+                f'SELECT {", ".join(self.COLUMNS)} FROM docs '
+                f'WHERE doc_id IN ({", ".join("?" * len(chunk))}){where}', (*chunk, *params))
+            rows.extend(dict(zip(self.COLUMNS, row)) for row in cursor)
+        return rows
+
+    def count(self) -> int:
+        '''Return the number of indexed articles.'''
+        return self.conn.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+
+    def close(self) -> None:
+        '''Close the connection.'''
+        self.conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Build or query the full-text index of the sentiment results')
+    parser.add_argument('sentiments_dir', nargs='?', help='JSON directory or columnar store to index')
+    parser.add_argument('--backend', default='json', choices=['json', 'columnar'], help='storage backend')
+    parser.add_argument('--db', default='data/search_index.db', help='SQLite index file')
+    parser.add_argument('--batch', type=int, default=2000, help='articles per transaction')
+    parser.add_argument('--query', help='search the index and print the matches')
+    args = parser.parse_args()
+
+    index = SearchIndex(args.db)
+    if args.sentiments_dir:
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        total = 0
+        for item in iter_results(args.sentiments_dir, args.backend):
+            batch.append(item)
+            if len(batch) >= args.batch:
+                total += index.add_many(batch)
+                batch = []
+        if batch:
+            total += index.add_many(batch)
+        print(f'[SearchIndex] Indexed {total} articles into {args.db} ({index.count()} documents)')
+
+    if args.query:
+        for row in index.search(args.query, limit=20):
+            print(f"{row['publication_date']}  {row['site_name']:<14} {row['sentiment_label'] or '-':<9} {row['title']}")
+    index.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+import os
+import json
+import glob
+import time
+import struct
+import secrets
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+
+
+class SegmentWriter:
+    '''
+    Append-only writer of zstd-compressed record segments with an offset index.
+
+    Records are appended to `<prefix>-<created>-<token>.seg`; every record gets
+    an entry in the sibling `.idx` file, keyed by a 16-byte hash (the MD5 hex
+    produced by `sanitize_filename`). Each writer creates its own uniquely named
+    segments, so concurrent writers never share a file. A segment is rotated
+    once it exceeds `max_segment_bytes`.
+
+    Record layout (little endian):
+        header: magic b'SEG1', meta length, raw payload length, compressed payload length
+        meta:   UTF-8 JSON object
+        body:   zstd-compressed payload
+
+    Index entry layout: key digest (16 bytes), record offset (uint64), record length (uint32)
+
+    Attributes:
+        directory: Directory of the segment and index files.
+        prefix: File name prefix of new segments.
+        max_segment_bytes: Rotation threshold.
+    '''
+
+    MAGIC = b'SEG1'
+    RECORD_HEADER = struct.Struct('<4sIII')
+    INDEX_ENTRY = struct.Struct('<16sQI')
+
+    def __init__(self, directory: str, prefix: str = 'segment', max_segment_bytes: int = 256 * 1024 * 1024, compression_level: int = 3):
+        '''
+        Initialize the writer. The first segment is created lazily.
+
+        Args:
+            directory: Directory of the segment and index files.
+            prefix: File name prefix of new segments.
+            max_segment_bytes: Size after which a new segment is started.
+            compression_level: zstd compression level.
+        '''
+        self.directory = directory
+        self.prefix = prefix
+        self.max_segment_bytes = max_segment_bytes
+        self.codec = pa.Codec('zstd', compression_level=compression_level)
+
+        self._segment = None
+        self._index = None
+        self.segment_path: Optional[str] = None
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _open_segment(self) -> None:
+        '''Close the current segment and start a new, uniquely named one.'''
+        self.close()
+        name = f'{self.prefix}-{time.strftime("%Y%m%d%H%M%S")}-{secrets.token_hex(3)}'
+        self.segment_path = os.path.join(self.directory, f'{name}.seg')
+        self._segment = open(self.segment_path, 'ab')
+        self._index = open(os.path.join(self.directory, f'{name}.idx'), 'ab')
+
+    def append(self, key: str, payload: bytes, meta: Optional[Dict[str, Any]] = None) -> Tuple[str, int]:
+        '''
+        Append one record.
+
+        Args:
+            key: MD5 hex digest identifying the record.
+            payload: Raw bytes to compress and store.
+            meta: JSON-serializable metadata stored uncompressed next to the payload.
+
+        Returns:
+            (segment path, record offset)
+        '''
+        if self._segment is None or self._segment.tell() >= self.max_segment_bytes:
+            self._open_segment()
+
+        meta_bytes = json.dumps(meta or {}, ensure_ascii=False).encode('utf-8')
+        body = self.codec.compress(payload, asbytes=True)
+        header = self.RECORD_HEADER.pack(self.MAGIC, len(meta_bytes), len(payload), len(body))
+
+        offset = self._segment.tell()
+        self._segment.write(header + meta_bytes + body)
+        length = self._segment.tell() - offset
+        self._index.write(self.INDEX_ENTRY.pack(bytes.fromhex(key), offset, length))
+
+        return self.segment_path, offset
+
+    def flush(self, fsync: bool = False) -> None:
+        '''
+        Flush buffered records (and the index) to the operating system.
+
+        Args:
+            fsync: Also force the data to disk.
+        '''
+        for f in (self._segment, self._index):
+            if f is not None:
+                f.flush()
+                if fsync:
+                    os.fsync(f.fileno())
+
+    def close(self) -> None:
+        '''Flush, fsync and close the current segment.'''
+        if self._segment is None:
+            return
+        self.flush(fsync=True)
+        self._segment.close()
+        self._index.close()
+        self._segment = None
+        self._index = None
+
+
+class SegmentReader:
+    '''
+    Reader of the segments produced by `SegmentWriter`.
+
+    Supports sequential scans of whole segments (for offline reprocessing)
+    and random access by key through the offset index.
+
+    Attributes:
+        directory: Directory of the segment and index files.
+    '''
+
+    def __init__(self, directory: str):
+        '''
+        Initialize the reader.
+
+        Args:
+            directory: Directory of the segment and index files.
+        '''
+        self.directory = directory
+        self.codec = pa.Codec('zstd')
+        self._index: Optional[Dict[bytes, Tuple[str, int, int]]] = None
+
+    def segments(self) -> List[str]:
+        '''Return the segment paths in creation order.'''
+        return sorted(glob.glob(os.path.join(self.directory, '*.seg')))
+
+    def _decode(self, data: bytes) -> Tuple[Dict[str, Any], bytes]:
+        '''Decode one full record into (meta, payload).'''
+        magic, meta_len, raw_len, body_len = SegmentWriter.RECORD_HEADER.unpack_from(data, 0)
+        if magic != SegmentWriter.MAGIC:
+            raise ValueError('[SegmentReader] Corrupt record header')
+        start = SegmentWriter.RECORD_HEADER.size
+        meta = json.loads(data[start:start + meta_len].decode('utf-8'))
+        body = data[start + meta_len:start + meta_len + body_len]
+        return meta, self.codec.decompress(body, decompressed_size=raw_len, asbytes=True)
+
+    def iter_records(self, segment_path: str) -> Iterator[Tuple[int, Dict[str, Any], bytes]]:
+        '''
+        Scan a segment sequentially.
+
+        A truncated trailing record (e.g. after a crash) ends the scan.
+
+        Args:
+            segment_path: Segment file path.
+
+        Yields:
+            (offset, meta, payload) for every complete record.
+        '''
+        header_size = SegmentWriter.RECORD_HEADER.size
+        with open(segment_path, 'rb') as f:
+            while True:
+                offset = f.tell()
+                header = f.read(header_size)
+                if len(header) < header_size:
+                    return
+                _, meta_len, _, body_len = SegmentWriter.RECORD_HEADER.unpack(header)
+                rest = f.read(meta_len + body_len)
+                if len(rest) < meta_len + body_len:
+                    return
+                yield (offset, *self._decode(header + rest))
+
+    def load_index(self) -> Dict[bytes, Tuple[str, int, int]]:
+        '''
+        Load every index file into memory (latest record wins for duplicate keys).
+
+        Returns:
+            Mapping of key digest to (segment path, offset, length).
+        '''
+        index: Dict[bytes, Tuple[str, int, int]] = {}
+        entry = SegmentWriter.INDEX_ENTRY
+        for segment_path in self.segments():
+            idx_path = segment_path[:-len('.seg')] + '.idx'
+            if not os.path.exists(idx_path):
+                continue
+            with open(idx_path, 'rb') as f:
+                data = f.read()
+            for pos in range(0, len(data) - entry.size + 1, entry.size):
+                key, offset, length = entry.unpack_from(data, pos)
+                index[key] = (segment_path, offset, length)
+        self._index = index
+        return index
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        '''
+        Random access to a record by key.
+
+        Args:
+            key: MD5 hex digest of the record.
+
+        Returns:
+            (meta, payload), or None if the key is unknown.
+        '''
+        if self._index is None:
+            self.load_index()
+
+        location = self._index.get(bytes.fromhex(key))
+        if location is None:
+            return None
+
+        segment_path, offset, length = location
+        with open(segment_path, 'rb') as f:
+            f.seek(offset)
+            return self._decode(f.read(length))
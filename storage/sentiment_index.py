@@ -0,0 +1,388 @@
+'''
+Embedded SQLite index of the sentiment results.
+
+Usage (index the results that already exist):
+    python -m storage.sentiment_index data/sentiments
+    python -m storage.sentiment_index data/sentiments --backend columnar --db data/sentiment_index.db
+'''
+import os
+import json
+import time
+import sqlite3
+import argparse
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from storage.article_archive import ArticleArchive
+from storage.columnar_store import ColumnarReader
+
+
+class SentimentIndex:
+    '''
+    SQLite (WAL mode) table of sentiment result metadata, indexed for time, site and label filters.
+
+    One row per article (upserted by key): site, URL, title, publication time,
+    sentiment label, confidence and reason, categories, tags and the file name
+    of the full document. Article bodies are not stored; they stay in the
+    JSON files or the columnar store.
+
+    The `rollup_15m` table holds the article count and confidence sum per
+    15-minute bucket, site and label. Triggers on `articles` keep it exact
+    on inserts, updates (a re-scored article moves between buckets/labels)
+    and deletes, so trend queries read O(buckets) rows; coarser buckets are
+    summed from it (`rollup`).
+
+    WAL mode lets the dashboard read while the sentiment worker writes. A
+    connection may be handed to another thread (the worker is built in the
+    main thread and consumes in a worker thread) but must not be used by two
+    threads at once; concurrent readers open their own `SentimentIndex`.
+
+    Attributes:
+        db_path: SQLite database file.
+        conn: Open connection.
+    '''
+
+    COLUMNS = ('key', 'site_name', 'url', 'title', 'publication_date', 'publication_timestamp',
+               'sentiment_label', 'sentiment_confidence', 'sentiment_reason', 'category', 'tags', 'filename')
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS articles (
+            key TEXT PRIMARY KEY,
+            site_name TEXT NOT NULL,
+            url TEXT,
+            title TEXT,
+            publication_date TEXT,
+            publication_timestamp INTEGER,
+            sentiment_label TEXT,
+            sentiment_confidence INTEGER,
+            sentiment_reason TEXT,
+            category TEXT,
+            tags TEXT,
+            filename TEXT NOT NULL,
+            indexed_at INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_articles_time ON articles (publication_timestamp);
+        CREATE INDEX IF NOT EXISTS idx_articles_site_time ON articles (site_name, publication_timestamp);
+        CREATE INDEX IF NOT EXISTS idx_articles_label_time ON articles (sentiment_label, publication_timestamp);
+    '''
+
+    # Base rollup bucket; every coarser bucket is a multiple of it
+    BUCKET_SECONDS = 15 * 60
+
+    ROLLUP_SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS rollup_15m (
+            bucket INTEGER NOT NULL,
+            site_name TEXT NOT NULL,
+            sentiment_label TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            confidence_sum INTEGER NOT NULL,
+            PRIMARY KEY (bucket, site_name, sentiment_label)
+        );
+        CREATE TRIGGER IF NOT EXISTS rollup_insert AFTER INSERT ON articles
+        WHEN NEW.publication_timestamp IS NOT NULL BEGIN
+            INSERT INTO rollup_15m VALUES (NEW.publication_timestamp / 900 * 900, NEW.site_name,
+                                           COALESCE(NEW.sentiment_label, 'unknown'), 1, NEW.sentiment_confidence)
+            ON CONFLICT (bucket, site_name, sentiment_label) DO UPDATE
+            SET count = count + 1, confidence_sum = confidence_sum + excluded.confidence_sum;
+        END;
+        CREATE TRIGGER IF NOT EXISTS rollup_delete AFTER DELETE ON articles
+        WHEN OLD.publication_timestamp IS NOT NULL BEGIN
+            UPDATE rollup_15m SET count = count - 1, confidence_sum = confidence_sum - OLD.sentiment_confidence
+            WHERE bucket = OLD.publication_timestamp / 900 * 900 AND site_name = OLD.site_name
+              AND sentiment_label = COALESCE(OLD.sentiment_label, 'unknown');
+        END;
+        CREATE TRIGGER IF NOT EXISTS rollup_update_old AFTER UPDATE ON articles
+        WHEN OLD.publication_timestamp IS NOT NULL BEGIN
+            UPDATE rollup_15m SET count = count - 1, confidence_sum = confidence_sum - OLD.sentiment_confidence
+            WHERE bucket = OLD.publication_timestamp / 900 * 900 AND site_name = OLD.site_name
+              AND sentiment_label = COALESCE(OLD.sentiment_label, 'unknown');
+        END;
+        CREATE TRIGGER IF NOT EXISTS rollup_update_new AFTER UPDATE ON articles
+        WHEN NEW.publication_timestamp IS NOT NULL BEGIN
+            INSERT INTO rollup_15m VALUES (NEW.publication_timestamp / 900 * 900, NEW.site_name,
+                                           COALESCE(NEW.sentiment_label, 'unknown'), 1, NEW.sentiment_confidence)
+            ON CONFLICT (bucket, site_name, sentiment_label) DO UPDATE
+            SET count = count + 1, confidence_sum = confidence_sum + excluded.confidence_sum;
+        END;
+    '''
+
+    def __init__(self, db_path: str = 'data/sentiment_index.db', readonly: bool = False):
+        '''
+        Open (and create if needed) the index.
+
+        Args:
+            db_path: SQLite database file.
+            readonly: Open an existing database for reading only.
+
+        Raises:
+            sqlite3.OperationalError: If `readonly` is set and the database does not exist.
+        '''
+        self.db_path = db_path
+        if readonly:
+            self.conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True, check_same_thread=False)
+        else:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.executescript(self.SCHEMA)
+            has_rollup = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollup_15m'").fetchone()
+            self.conn.executescript(self.ROLLUP_SCHEMA)
+            if not has_rollup:
+                # Index created before the rollups existed
+                self.rebuild_rollups()
+        self.conn.row_factory = sqlite3.Row
+
+    @staticmethod
+    def to_row(key: str, article: Dict[str, Any]) -> Tuple[Any, ...]:
+        '''
+        Build the index row of a sentiment-enriched article.
+
+        Args:
+            key: Article key (the raw file name without extension).
+            article: Article with its `sentiment` result.
+
+        Returns:
+            Values in `COLUMNS` order followed by the indexing time.
+        '''
+        sentiment = article.get('sentiment') or {}
+        try:
+            confidence = int(sentiment.get('confidence', 0))
+        except (TypeError, ValueError):
+            confidence = 0
+        timestamp = article.get('publication_timestamp')
+        return (
+            key,
+            article.get('site_name') or key.split('-', 1)[0],
+            article.get('url'),
+            article.get('title'),
+            article.get('publication_date'),
+            None if timestamp is None else int(timestamp),
+            sentiment.get('sentiment'),
+            confidence,
+            sentiment.get('reason'),
+            json.dumps(article.get('category') or [], ensure_ascii=False),
+            json.dumps(article.get('tags') or [], ensure_ascii=False),
+            f'{key}.json',
+            int(time.time()),
+        )
+
+    def upsert(self, key: str, article: Dict[str, Any]) -> None:
+        '''
+        Insert or update the index row of one article (committed immediately).
+
+        Args:
+            key: Article key.
+            article: Article with its `sentiment` result.
+        '''
+        self.upsert_many([(key, article)])
+
+    def upsert_many(self, articles: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        '''
+        Insert or update the index rows of many articles in one transaction.
+
+        An existing key is updated in place (not deleted and re-inserted), so the
+        rollup triggers move its contribution to its new bucket and label.
+
+        Args:
+            articles: (key, article) pairs.
+
+        Returns:
+            Number of rows written.
+        '''
+        columns = (*self.COLUMNS, 'indexed_at')
+        placeholders = ', '.join('?' * len(columns))
+        updates = ', '.join(f'{c} = excluded.{c}' for c in columns if c != 'key')
+        with self.conn:
+            cursor = self.conn.executemany(
+                f'INSERT INTO articles ({", ".join(columns)}) VALUES ({placeholders}) '
+                f'ON CONFLICT (key) DO UPDATE SET {updates}',
+                (self.to_row(key, article) for key, article in articles))
+        return cursor.rowcount
+
+    def rebuild_rollups(self) -> None:
+        '''
+        Recompute the 15-minute rollups from the `articles` table.
+        '''
+        with self.conn:
+            self.conn.execute('DELETE FROM rollup_15m')
+            self.conn.execute(
+                f'''INSERT INTO rollup_15m
+                    SELECT publication_timestamp / {self.BUCKET_SECONDS} * {self.BUCKET_SECONDS}, site_name,
+                           COALESCE(sentiment_label, 'unknown'), COUNT(*), SUM(sentiment_confidence)
+                    FROM articles WHERE publication_timestamp IS NOT NULL
+                    GROUP BY 1, 2, 3''')
+
+    def rollup(self, bucket_seconds: int = BUCKET_SECONDS, start: Optional[datetime] = None,
+               end: Optional[datetime] = None, sites: Optional[Sequence[str]] = None,
+               labels: Optional[Sequence[str]] = None, by_site: bool = False) -> List[Dict[str, Any]]:
+        '''
+        Read article counts and mean confidence per time bucket and label.
+
+        Buckets coarser than 15 minutes are summed from the 15-minute rollups
+        and aligned to local wall-clock time (like `Series.dt.floor` on the
+        naive publication dates), so 1-day buckets start at local midnight.
+
+        Args:
+            bucket_seconds: Bucket size, a multiple of 900 seconds.
+            start: Earliest publication time (naive local time, inclusive, rounded down to its 15-minute bucket).
+            end: Latest publication time (naive local time, inclusive).
+            sites: Site names to keep (all if None).
+            labels: Sentiment labels to keep (all if None).
+            by_site: Keep one row per site instead of summing the sites.
+
+        Returns:
+            Rows ordered by bucket: `bucket` (naive local datetime),
+            `sentiment_label`, `count`, `mean_confidence` (and `site_name`).
+
+        Raises:
+            ValueError: If the bucket size is not a multiple of 900 seconds.
+        '''
+        if bucket_seconds <= 0 or bucket_seconds % self.BUCKET_SECONDS:
+            raise ValueError(f'[SentimentIndex] Bucket size must be a multiple of {self.BUCKET_SECONDS} seconds')
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        if start is not None:
+            clauses.append('bucket >= ?')
+            params.append(int(start.timestamp()) // self.BUCKET_SECONDS * self.BUCKET_SECONDS)
+        if end is not None:
+            clauses.append('bucket <= ?')
+            params.append(int(end.timestamp()))
+        for column, values in (('site_name', sites), ('sentiment_label', labels)):
+            if values is not None:
+                clauses.append(f'{column} IN ({", ".join("?" * len(values))})')
+                params.extend(values)
+        where = (' WHERE ' + ' AND '.join(clauses)) if clauses else ''
+
+        # Shift to local time so coarse buckets follow the wall clock
+        offset = int(datetime.now().astimezone().utcoffset().total_seconds())
+        group = ['coarse', 'sentiment_label'] + (['site_name'] if by_site else [])
+        sql = (f'SELECT (bucket + {offset}) / {bucket_seconds} * {bucket_seconds} - {offset} AS coarse, '
+               f'{", ".join(group[1:])}, SUM(count) AS count, SUM(confidence_sum) AS confidence_sum '
+               f'FROM rollup_15m{where} GROUP BY {", ".join(group)} HAVING SUM(count) > 0 ORDER BY coarse')
+
+        rows = []
+        for row in self.conn.execute(sql, params):
+            record = dict(row)
+            record['bucket'] = datetime.fromtimestamp(record.pop('coarse'))
+            record['mean_confidence'] = record.pop('confidence_sum') / record['count']
+            rows.append(record)
+        return rows
+
+    def query(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              sites: Optional[Sequence[str]] = None, labels: Optional[Sequence[str]] = None,
+              limit: Optional[int] = None, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        '''
+        Select the articles matching time, site and label filters, newest first.
+
+        Args:
+            start: Earliest publication time (naive local time, inclusive).
+            end: Latest publication time (naive local time, inclusive).
+            sites: Site names to keep (all if None).
+            labels: Sentiment labels to keep (all if None).
+            limit: Maximum rows returned.
+            columns: Columns to select, a subset of `COLUMNS` (all if None).
+
+        Returns:
+            Rows as dictionaries (`category` and `tags` decoded to lists).
+
+        Raises:
+            ValueError: If an unknown column is requested.
+        '''
+        columns = list(columns or self.COLUMNS)
+        unknown = set(columns) - set(self.COLUMNS)
+        if unknown:
+            raise ValueError(f'[SentimentIndex] Unknown columns: {sorted(unknown)}')
+
+        where, params = self._where(start, end, sites, labels)
+        sql = f'SELECT {", ".join(columns)} FROM articles{where} ORDER BY publication_timestamp DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        rows = []
+        for row in self.conn.execute(sql, params):
+            record = dict(row)
+            for column in ('category', 'tags'):
+                if column in record:
+                    record[column] = json.loads(record[column] or '[]')
+            rows.append(record)
+        return rows
+
+    def sites(self) -> List[str]:
+        '''Return the indexed site names.'''
+        return [row[0] for row in self.conn.execute('SELECT DISTINCT site_name FROM articles ORDER BY site_name')]
+
+    def count(self) -> int:
+        '''Return the number of indexed articles.'''
+        return self.conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+    @staticmethod
+    def _where(start: Optional[datetime], end: Optional[datetime], sites: Optional[Sequence[str]],
+               labels: Optional[Sequence[str]]) -> Tuple[str, List[Any]]:
+        '''Build the WHERE clause and parameters of a filtered query.'''
+        clauses: List[str] = []
+        params: List[Any] = []
+        if start is not None:
+            clauses.append('publication_timestamp >= ?')
+            params.append(int(start.timestamp()))
+        if end is not None:
+            clauses.append('publication_timestamp <= ?')
+            params.append(int(end.timestamp()))
+        for column, values in (('site_name', sites), ('sentiment_label', labels)):
+            if values is not None:
+                clauses.append(f'{column} IN ({", ".join("?" * len(values))})')
+                params.extend(values)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def close(self) -> None:
+        '''Close the connection.'''
+        self.conn.close()
+
+
+def iter_results(sentiments_dir: str, backend: str = 'json') -> Iterable[Tuple[str, Dict[str, Any]]]:
+    '''
+    Iterate over the stored sentiment results.
+
+    Args:
+        sentiments_dir: JSON directory or columnar store.
+        backend: 'json' or 'columnar'.
+
+    Yields:
+        (key, article) pairs.
+    '''
+    if backend == 'columnar':
+        yield from ColumnarReader(sentiments_dir).iter_documents()
+        return
+
+    # Loose JSON files and the segments they were compacted into
+    yield from ArticleArchive(sentiments_dir).iter_articles()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Index the stored sentiment results')
+    parser.add_argument('sentiments_dir', help='JSON directory or columnar store of the sentiment results')
+    parser.add_argument('--backend', default='json', choices=['json', 'columnar'], help='storage backend')
+    parser.add_argument('--db', default='data/sentiment_index.db', help='SQLite index file')
+    parser.add_argument('--batch', type=int, default=5000, help='rows per transaction')
+    args = parser.parse_args()
+
+    index = SentimentIndex(args.db)
+    batch: List[Tuple[str, Dict[str, Any]]] = []
+    total = 0
+    for item in iter_results(args.sentiments_dir, args.backend):
+        batch.append(item)
+        if len(batch) >= args.batch:
+            total += index.upsert_many(batch)
+            batch = []
+    if batch:
+        total += index.upsert_many(batch)
+
+    print(f'[SentimentIndex] Indexed {total} articles into {args.db} ({index.count()} rows)')
+    index.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,19 @@
+import os
+import sys
 import streamlit as st
 import plotly.express as px
 from datetime import datetime, timedelta
+from typing import Optional
 import pandas as pd
+import pyarrow as pa
+
+# Project packages (storage, utils) live next to streamlit_app/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.data_loader import SentimentDataLoader
+from services.live_feed import LiveFeed
+from services.snapshot import filter_equal, floor_counts, paginate, time_slice, unique_values, value_counts
+from utils.config_manager import ConfigManager
 
 
 st.set_page_config(
@@ -14,74 +24,156 @@ st.set_page_config(
 st.title('📰 News Sentiment Analysis Dashboard')
 
 # Load Data
-loader = SentimentDataLoader('data/sentiments')
+@st.cache_resource
+def get_loader() -> SentimentDataLoader:
+    # One loader per server process: it keeps the loaded articles between reruns
+    storage_config = ConfigManager('config/settings.yaml').get_storage_config()
+    return SentimentDataLoader(
+        'data/sentiments',
+        backend=storage_config.get('backend', 'json'),
+        index_path=storage_config.get('index_path'),
+        snapshot_path=storage_config.get('snapshot_path'),
+        search_index_path=storage_config.get('search_index_path'),
+    )
 
-@st.cache_data(ttl=5)
-def load_data() -> pd.DataFrame:
-    df = loader.load_all()
 
-    # Normalize nested fields
-    df['sentiment_label'] = df['sentiment'].apply(lambda x: x.get('sentiment'))
-    df['sentiment_confidence'] = df['sentiment'].apply(lambda x: int(x.get('confidence', 0)))
-    df['sentiment_reason'] = df['sentiment'].apply(lambda x: x.get('reason'))
+loader = get_loader()
+live_config = ConfigManager('config/settings.yaml').get_live_updates_config()
 
-    # Convert list → string for table display
-    df['category_str'] = df['category'].apply(lambda c: ', '.join(c) if isinstance(c, list) else '')
-    df['tags_str'] = df['tags'].apply(lambda t: ', '.join(t) if isinstance(t, list) else '')
 
-    return df
+@st.cache_resource
+def get_feed() -> Optional[LiveFeed]:
+    # One subscriber per server process, feeding the shared loader
+    if not live_config.get('enabled', False):
+        return None
+    feed = LiveFeed(loader, live_config.get('exchange', 'sentiment_updates'))
+    feed.start()
+    return feed
 
 
-df = load_data()
+feed = get_feed()
+
+if feed is not None:
+    # The page reruns when articles arrive, not on a timer
+    st.session_state['feed_version'] = feed.version
+
+    @st.fragment(run_every=live_config.get('poll_seconds', 2))
+    def watch_feed() -> None:
+        if feed.version != st.session_state.get('feed_version'):
+            st.rerun()
+
+    watch_feed()
+
+
+def load_data(rebuild: bool = False) -> pa.Table:
+    # One shared, memory-mapped snapshot for all sessions (metadata columns only)
+    if rebuild:
+        loader.refresh(rebuild=True)
+    # With the feed, pushed articles are merged in memory and the directory is
+    # re-scanned every resync_minutes; without it, on every run (incremental)
+    max_age = live_config.get('resync_minutes', 10) * 60 if feed is not None else 0
+    return loader.table(max_age_seconds=max_age)
+
+
+# With the feed, cached queries are keyed by its version and expire with the
+# directory re-scan (which can add articles the feed missed); at most
+# QUERY_CACHE_ENTRIES ranges are kept, so minute-resolution keys cannot pile up
+QUERY_CACHE_TTL = live_config.get('resync_minutes', 10) * 60 if feed is not None else 5
+QUERY_CACHE_ENTRIES = 16
+
+
+@st.cache_resource(ttl=QUERY_CACHE_TTL, max_entries=QUERY_CACHE_ENTRIES)
+def query_data(start: datetime, end: Optional[datetime], version: int) -> pa.Table:
+    # Only the rows of the range, metadata columns only (no article bodies);
+    # `version` (articles received by the feed) invalidates the cache on new data.
+    # A resource, not data: sessions share the read-only table instead of unpickling copies
+    return pa.Table.from_pandas(loader.query(start=start, end=end), preserve_index=False)
+
+
+SEARCH_LIMIT = 5000
+
+
+@st.cache_resource(ttl=QUERY_CACHE_TTL, max_entries=QUERY_CACHE_ENTRIES)
+def search_data(text: str, start: Optional[datetime], end: Optional[datetime], version: int) -> pa.Table:
+    # Newest SEARCH_LIMIT matches of the full-text index (metadata columns only)
+    return pa.Table.from_pandas(loader.search(text, start=start, end=end, limit=SEARCH_LIMIT), preserve_index=False)
 
-if df.empty:
-    st.warning('No sentiment data found.')
-    st.stop()
 
 # Sidebar Time Filters
 st.sidebar.header('⏱ Time Range')
 
+rebuild = st.sidebar.button('Reload all data')
+if rebuild:
+    query_data.clear()
+    search_data.clear()
+
 time_filter = st.sidebar.radio(
     'Show news from:',
     ['All', 'Last 24 Hours', 'Last 48 Hours', 'Last 7 Days', 'Custom Range']
 )
 
-now = datetime.now()
+# Minute resolution keeps the query cache effective across reruns
+now = datetime.now().replace(second=0, microsecond=0)
+start, end = None, None
 
 if time_filter == 'Last 24 Hours':
-    df = df[df['publication_date'] >= now - timedelta(hours=24)]
+    start = now - timedelta(hours=24)
 
 elif time_filter == 'Last 48 Hours':
-    df = df[df['publication_date'] >= now - timedelta(hours=48)]
+    start = now - timedelta(hours=48)
 
 elif time_filter == 'Last 7 Days':
-    df = df[df['publication_date'] >= now - timedelta(days=7)]
+    start = now - timedelta(days=7)
 
 elif time_filter == 'Custom Range':
     date_range = st.sidebar.date_input('Select Range:', [])
     if len(date_range) == 2:
-        start, end = date_range
-        df = df[
-            (df['publication_date'] >= datetime.combine(start, datetime.min.time())) &
-            (df['publication_date'] <= datetime.combine(end, datetime.max.time()))
-        ]
-
-if df.empty:
-    st.warning('No news found for this time range.')
+        start = datetime.combine(date_range[0], datetime.min.time())
+        end = datetime.combine(date_range[1], datetime.max.time())
+
+# Keyword search (Persian full-text index)
+search_text = st.sidebar.text_input(
+    '🔎 Search news:',
+    disabled=not loader.has_search(),
+    help='Articles containing every word (hazm-normalized and stemmed).',
+).strip()
+
+version = feed.version if feed is not None else 0
+
+if search_text:
+    # Matches of the full-text index within the time range, newest first
+    table = search_data(search_text, start, end, version)
+    if table.num_rows >= SEARCH_LIMIT:
+        st.caption(f'Showing the newest {SEARCH_LIMIT} matches.')
+elif start is not None and loader.has_index():
+    # Bounded ranges read only their rows from the sentiment index
+    table = query_data(start, end, version)
+else:
+    table = load_data(rebuild)
+
+    if table.num_rows == 0:
+        st.warning('No sentiment data found.')
+        st.stop()
+
+    # Zero-copy slice of the date-sorted snapshot
+    table = time_slice(table, start, end)
+
+if table.num_rows == 0:
+    st.warning('No news found for this search.' if search_text else 'No news found for this time range.')
     st.stop()
 
 site_filter = st.sidebar.radio(
     'Show news from website:',
-    ['All'] + list(df['site_name'].unique())
+    ['All'] + unique_values(table, 'site_name')
 )
 
 if site_filter != 'All':
-    df = df[df['site_name'] == site_filter]
+    table = filter_equal(table, 'site_name', site_filter)
 
 # Sentiment Distribution
 st.subheader('📊 Sentiment Distribution')
 
-sent_counts = df['sentiment_label'].value_counts()
+sent_counts = value_counts(table, 'sentiment_label')
 
 fig1 = px.bar(
     sent_counts,
@@ -93,9 +185,6 @@ st.plotly_chart(fig1, width='stretch')
 # Sentiment Count Trend (Frequency Over Time)
 st.subheader('📈 Sentiment Frequency Trend Over Time')
 
-# Ensure publication_date is datetime
-df['publication_date'] = pd.to_datetime(df['publication_date'])
-
 
 # User selects timeframe
 time_options = {
@@ -116,12 +205,17 @@ selected_label = st.select_slider(
 # Convert selected label to Pandas resample rule
 time_rule = time_options[selected_label]
 
-# Group by day + sentiment and count number of news per sentiment per day
-trend_df = (
-    df.groupby([df['publication_date'].dt.floor(time_rule), 'sentiment_label'])
-      .size()
-      .reset_index(name='count')
-)
+if loader.has_index() and not search_text:
+    # Pre-aggregated 15-minute rollups of the sentiment index, summed to the rule
+    trend_df = loader.trend(
+        pd.Timedelta(time_rule).total_seconds(),
+        start=start,
+        end=end,
+        sites=None if site_filter == 'All' else [site_filter],
+    )
+else:
+    # Group by time bucket + sentiment and count number of news per sentiment per bucket
+    trend_df = floor_counts(table, time_rule)
 
 # Convert date back to datetime for plotly
 trend_df['publication_date'] = pd.to_datetime(trend_df['publication_date'])
@@ -140,8 +234,29 @@ st.plotly_chart(fig2, width='stretch')
 # Latest News Table
 st.subheader('🆕 Latest News')
 
+sort_options = {
+    'Publication date': 'publication_date',
+    'Confidence': 'sentiment_confidence',
+    'Site': 'site_name',
+    'Sentiment': 'sentiment_label',
+}
+PAGE_SIZE = 50
+
+col_sort, col_order, col_page = st.columns(3)
+sort_by = col_sort.selectbox('Sort by:', list(sort_options.keys()))
+descending = col_order.toggle('Descending', value=True)
+page_count = max(1, -(-table.num_rows // PAGE_SIZE))
+page = col_page.number_input('Page:', min_value=1, max_value=page_count, value=1, step=1)
+
+# Only the rows of the page are converted to pandas
+latest_df = paginate(table, sort_options[sort_by], not descending, int(page), PAGE_SIZE)
+
+# Bodies, reasons, categories and tags are read for the visible page only
+details = loader.load_details(list(latest_df['filename']))
+latest_df = latest_df.merge(details, on='filename', how='left')
+
 st.dataframe(
-    df.sort_values('publication_date', ascending=False)[[
+    latest_df[[
         'site_name',
         'publication_date',
         'title',
@@ -152,6 +267,7 @@ st.dataframe(
         'tags_str',
         'sentiment_reason',
         'url'
-    ]].head(50),
+    ]],
     width='stretch',
 )
+st.caption(f'Page {int(page)} of {page_count} ({table.num_rows} news)')
@@ -1,40 +1,258 @@
 import os
 import json
+import time
+import threading
 import pandas as pd
-from typing import List, Dict
+import pyarrow as pa
+import pyarrow.compute as pc
+from datetime import datetime
+from typing import List, Dict, Optional, Sequence, Tuple
+
+from storage.article_archive import ArticleArchive
+from storage.columnar_store import ColumnarReader
+from storage.search_index import SearchIndex
+from storage.sentiment_index import SentimentIndex
+from .snapshot import map_snapshot, write_snapshot
+
+
+# Columns kept in memory for charts, filters and sorting; bodies and reasons are read per page
+METADATA_COLUMNS = [
+    'filename', 'site_name', 'publication_date', 'publication_timestamp',
+    'title', 'url', 'sentiment_label', 'sentiment_confidence',
+]
+
+# Columnar store columns needed to build the metadata
+METADATA_READ_COLUMNS = ['key', 'site_name', 'publication_date', 'publication_timestamp', 'title', 'url', 'sentiment']
+
+# Columns read on demand for the visible rows (`load_details`)
+DETAIL_COLUMNS = ['filename', 'content', 'sentiment_reason', 'category_str', 'tags_str']
+
+
+# Low-cardinality string columns stored as pandas categoricals
+CATEGORY_COLUMNS = ['site_name', 'sentiment_label']
+
+
+def categorical(values: Sequence) -> pd.Categorical:
+    '''Convert values (or an existing categorical) to a categorical with sorted categories.'''
+    values = pd.Categorical(values)
+    if not values.categories.is_monotonic_increasing:
+        values = values.reorder_categories(values.categories.sort_values())
+    return values
+
+
+def metadata_frame(columns: Dict[str, Sequence]) -> pd.DataFrame:
+    '''
+    Build the typed metadata DataFrame from column arrays.
+
+    Each column is converted once, vectorized: `site_name` and
+    `sentiment_label` become categoricals with sorted categories (one small
+    code per row instead of a Python string), `sentiment_confidence` int8 (0-100, 0 if missing or
+    invalid), `publication_date` datetime64 and `publication_timestamp`
+    nullable Int64.
+
+    Args:
+        columns: Values of every `METADATA_COLUMNS` column (lists or arrays of equal length).
+
+    Returns:
+        The typed DataFrame.
+    '''
+    confidence = pd.to_numeric(pd.Series(columns['sentiment_confidence'], dtype=object), errors='coerce')
+    return pd.DataFrame({
+        'filename': pd.array(columns['filename'], dtype=object),
+        'site_name': categorical(columns['site_name']),
+        'publication_date': pd.to_datetime(pd.Series(columns['publication_date'], dtype=object),
+                                           format='ISO8601', errors='coerce'),
+        'publication_timestamp': pd.to_numeric(pd.Series(columns['publication_timestamp'], dtype=object),
+                                               errors='coerce').astype('Int64'),
+        'title': pd.array(columns['title'], dtype=object),
+        'url': pd.array(columns['url'], dtype=object),
+        'sentiment_label': categorical(columns['sentiment_label']),
+        'sentiment_confidence': confidence.fillna(0).clip(0, 100).to_numpy(dtype='int8'),
+    }, columns=METADATA_COLUMNS)
+
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    '''
+    Concatenate metadata frames, keeping the categorical columns categorical.
+
+    `pd.concat` falls back to object dtype when categories differ, so every
+    frame is first recoded to the union of the categories.
+
+    Args:
+        frames: Frames built by `metadata_frame` (not modified).
+
+    Returns:
+        The concatenated frame.
+    '''
+    if len(frames) > 1:
+        dtypes = {
+            column: pd.CategoricalDtype(
+                pd.Index([]).append([f[column].cat.categories for f in frames]).unique().sort_values())
+            for column in CATEGORY_COLUMNS
+        }
+        frames = [f.assign(**{c: f[c].cat.set_categories(d.categories) for c, d in dtypes.items()})
+                  for f in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+class MetadataColumns:
+    '''
+    Column-wise accumulator of article metadata.
+
+    Articles are appended field by field to one list per column while they
+    are read, so no per-article record is kept; `frame` converts the lists
+    with `metadata_frame`.
+    '''
+
+    def __init__(self):
+        '''Start with empty columns.'''
+        self.columns: Dict[str, List] = {column: [] for column in METADATA_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.columns['filename'])
+
+    def append(self, filename: str, article: Dict) -> None:
+        '''
+        Append the metadata of one stored article.
+
+        Args:
+            filename: Article file name (`<key>.json`).
+            article: Stored article with its `sentiment` result.
+        '''
+        sentiment = article.get('sentiment') if isinstance(article.get('sentiment'), dict) else {}
+        columns = self.columns
+        columns['filename'].append(filename)
+        columns['site_name'].append(article.get('site_name'))
+        columns['publication_date'].append(article.get('publication_date'))
+        columns['publication_timestamp'].append(article.get('publication_timestamp'))
+        columns['title'].append(article.get('title'))
+        columns['url'].append(article.get('url'))
+        columns['sentiment_label'].append(sentiment.get('sentiment'))
+        columns['sentiment_confidence'].append(sentiment.get('confidence'))
+
+    def frame(self) -> Optional[pd.DataFrame]:
+        '''Return the typed DataFrame of the appended articles (None if there are none).'''
+        return metadata_frame(self.columns) if len(self) else None
+
+
+def detail_record(filename: str, article: Optional[Dict]) -> Dict:
+    '''
+    Build the on-demand display columns (`DETAIL_COLUMNS`) of an article.
+
+    Args:
+        filename: Article file name (`<key>.json`).
+        article: Stored article, or None if it is missing.
+
+    Returns:
+        Record with the body, sentiment reason and joined categories and tags.
+    '''
+    article = article or {}
+    sentiment = article.get('sentiment') if isinstance(article.get('sentiment'), dict) else {}
+    category, tags = article.get('category'), article.get('tags')
+    return {
+        'filename': filename,
+        'content': article.get('content'),
+        'sentiment_reason': sentiment.get('reason'),
+        # Convert list → string for table display
+        'category_str': ', '.join(category) if isinstance(category, list) else '',
+        'tags_str': ', '.join(tags) if isinstance(tags, list) else '',
+    }
 
 
 class SentimentDataLoader:
     '''
-    Loader class for sentiment-analyzed news articles stored as JSON files.
+    Loader class for sentiment-analyzed news articles stored as JSON files
+    or in a columnar store.
 
-    This class reads all JSON files from a specified directory, extracts their contents,
+    This class reads all articles from a specified directory, extracts their contents,
     and returns a unified Pandas DataFrame. Each row represents a single article enriched
     with sentiment information.
 
+    `refresh` is the incremental variant of `load_all`: it keeps the DataFrame
+    built by the previous call together with a manifest of the files it was
+    built from (name -> mtime, size), and only reads files that are new or
+    changed since then. A long-lived instance (e.g. the dashboard's cached
+    resource) therefore refreshes in time proportional to the new articles,
+    plus one directory scan. It keeps only `METADATA_COLUMNS` in memory;
+    bodies, reasons, categories and tags of the displayed rows are read with
+    `load_details`.
+
+    Articles pushed by a change feed (`append_live`, see `LiveFeed`) are merged
+    by `snapshot` without scanning the directory; they are kept across
+    refreshes until their files are read.
+
+    `table` returns the same data as one immutable Arrow table shared by all
+    callers (dashboard sessions). With `snapshot_path` it is written to an
+    Arrow file whenever the data changed and memory-mapped read-only, so
+    sessions (and dashboard processes) share the page cache instead of
+    holding their own copies.
+
     Attributes:
         sentiments_dir (str):
             Directory path containing JSON files of sentiment-analyzed articles.
+        backend (str):
+            Storage backend of the directory: 'json' or 'columnar'.
+        index_path (str | None):
+            SQLite sentiment index used by the query methods.
+        snapshot_path (str | None):
+            Arrow file backing `table`, or None to keep the table in memory.
+        search_index_path (str | None):
+            Full-text index (`SearchIndex`) used by `search`.
     '''
 
-    def __init__(self, sentiments_dir: str = 'data/sentiments'):
+    def __init__(self, sentiments_dir: str = 'data/sentiments', backend: str = 'json', index_path: Optional[str] = None,
+                 snapshot_path: Optional[str] = None, search_index_path: Optional[str] = None):
         '''
         Initialize the loader with the directory containing sentiment JSON files.
 
         Args:
             sentiments_dir (str, optional):
-                Path to the directory containing JSON files.
+                Path to the directory containing JSON files (or the columnar store).
                 Defaults to 'data/sentiments'.
+            backend (str, optional):
+                'json' (one file per article) or 'columnar' (`ColumnarStore`).
+                Defaults to 'json'.
+            index_path (str, optional):
+                SQLite sentiment index (`SentimentIndex`) for filtered queries.
+            snapshot_path (str, optional):
+                Arrow file backing `table` (memory-mapped by the readers).
+            search_index_path (str, optional):
+                Full-text index (`SearchIndex`) for keyword searches.
         '''
         self.sentiments_dir = sentiments_dir
+        self.backend = backend
+        self.index_path = index_path
+        self.snapshot_path = snapshot_path
+        self.search_index_path = search_index_path
+
+        # Incremental state of `refresh`
+        self._lock = threading.Lock()
+        self._manifest: Dict[str, Tuple[int, int]] = {}
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._loose_df: Optional[pd.DataFrame] = None
+        self._df: Optional[pd.DataFrame] = None
+        self._refreshed_at: Optional[float] = None
+
+        # Pushed articles: not merged yet, and merged but not read from their files yet
+        self._pending = MetadataColumns()
+        self._live_df: Optional[pd.DataFrame] = None
+
+        # Shared Arrow table of `table` and the frame it was built from
+        self._table: Optional[pa.Table] = None
+        self._table_df: Optional[pd.DataFrame] = None
+
+        # Read-only full-text index, opened on the first search (loads the hazm models once)
+        self._search_lock = threading.Lock()
+        self._search: Optional[SearchIndex] = None
 
     def load_all(self) -> pd.DataFrame:
         '''
         Load all sentiment JSON files into a single Pandas DataFrame.
 
         Processing steps:
-            1. Iterates through all `.json` files in the `sentiments_dir`.
-            2. Reads each file as a dictionary and keeps the original filename as a reference.
+            1. Iterates through all `.json` files in the `sentiments_dir` and the
+               segments they were compacted into (`ArticleArchive`).
+            2. Reads each article as a dictionary and keeps the original filename as a reference.
             3. Aggregates all records into a list.
             4. Converts the list of dictionaries into a Pandas DataFrame.
             5. Converts the 'publication_date' column to datetime (if present).
@@ -44,22 +262,14 @@ class SentimentDataLoader:
                 DataFrame containing all loaded articles with sentiment data.
                 Returns an empty DataFrame if no files are found or an error occurs.
         '''
-        records: List[Dict] = []
-
-        for filename in os.listdir(self.sentiments_dir):
-            if not filename.endswith('.json'):
-                continue
+        if self.backend == 'columnar':
+            return self.load_columnar()
 
-            fpath = os.path.join(self.sentiments_dir, filename)
-
-            try:
-                with open(fpath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    data['filename'] = filename     # keep file reference
-                    records.append(data)
-
-            except Exception as e:
-                print(f'[Loader] Error reading file {filename}: {e}')
+        # Loose files and compacted segments
+        records: List[Dict] = [
+            dict(data, filename=f'{key}.json')      # keep file reference
+            for key, data in ArticleArchive(self.sentiments_dir).iter_articles()
+        ]
 
         if not records:
             return pd.DataFrame()
@@ -71,3 +281,377 @@ class SentimentDataLoader:
             df['publication_date'] = pd.to_datetime(df['publication_date'], errors='coerce')
 
         return df
+
+    def load_columnar(self) -> pd.DataFrame:
+        '''
+        Load all articles of the columnar store into a single Pandas DataFrame.
+
+        The documents have the same shape as the JSON files, including the
+        `filename` reference (`<key>.json`).
+
+        Returns:
+            pd.DataFrame:
+                DataFrame containing all loaded articles with sentiment data.
+                Returns an empty DataFrame if the store is empty.
+        '''
+        records: List[Dict] = [
+            dict(doc, filename=f'{key}.json')
+            for key, doc in ColumnarReader(self.sentiments_dir).iter_documents()
+        ]
+
+        if not records:
+            return pd.DataFrame()
+
+        df = pd.DataFrame(records)
+        df['publication_date'] = pd.to_datetime(df['publication_date'], errors='coerce')
+        return df
+
+    def has_index(self) -> bool:
+        '''Return True if the sentiment index exists and can answer queries.'''
+        return bool(self.index_path) and os.path.exists(self.index_path)
+
+    def query(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              sites: Optional[Sequence[str]] = None, labels: Optional[Sequence[str]] = None,
+              limit: Optional[int] = None) -> pd.DataFrame:
+        '''
+        Load only the articles matching the filters, from the sentiment index.
+
+        Time, site and label filters are evaluated by SQLite on its indexes, so
+        the cost depends on the matching rows, not on the stored history. Rows
+        carry `METADATA_COLUMNS` only; see `load_details` for the rest.
+
+        Args:
+            start: Earliest publication time (inclusive).
+            end: Latest publication time (inclusive).
+            sites: Site names to keep (all if None).
+            labels: Sentiment labels to keep (all if None).
+            limit: Maximum rows (newest first).
+
+        Returns:
+            pd.DataFrame:
+                The matching articles, newest first (empty if none match).
+        '''
+        index = SentimentIndex(self.index_path, readonly=True)
+        try:
+            rows = index.query(start=start, end=end, sites=sites, labels=labels, limit=limit,
+                               columns=METADATA_COLUMNS)
+        finally:
+            index.close()
+
+        return metadata_frame({column: [row[column] for row in rows] for column in METADATA_COLUMNS})
+
+    def has_search(self) -> bool:
+        '''Return True if the full-text index exists and can answer searches.'''
+        return bool(self.search_index_path) and os.path.exists(self.search_index_path)
+
+    def search(self, query: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+               sites: Optional[Sequence[str]] = None, labels: Optional[Sequence[str]] = None,
+               limit: Optional[int] = 1000) -> pd.DataFrame:
+        '''
+        Find the articles containing every term of a query, from the full-text index.
+
+        Args:
+            query: Search text (Persian, analyzed with hazm like the articles).
+            start: Earliest publication time (inclusive).
+            end: Latest publication time (inclusive).
+            sites: Site names to keep (all if None).
+            labels: Sentiment labels to keep (all if None).
+            limit: Maximum rows (newest first, None for all matches).
+
+        Returns:
+            pd.DataFrame:
+                `METADATA_COLUMNS` of the matching articles, newest first.
+        '''
+        with self._search_lock:
+            if self._search is None:
+                self._search = SearchIndex(self.search_index_path, readonly=True)
+            rows = self._search.search(query, start=start, end=end, sites=sites, labels=labels, limit=limit)
+
+        return metadata_frame({column: [row[column] for row in rows] for column in METADATA_COLUMNS})
+
+    def trend(self, bucket_seconds: int, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              sites: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        '''
+        Load article counts per time bucket and sentiment label from the index rollups.
+
+        Cost depends on the number of buckets in the range, not on the number
+        of articles.
+
+        Args:
+            bucket_seconds: Bucket size (a multiple of 15 minutes).
+            start: Earliest publication time (inclusive).
+            end: Latest publication time (inclusive).
+            sites: Site names to keep (all if None).
+
+        Returns:
+            pd.DataFrame:
+                Columns `publication_date` (bucket start), `sentiment_label`,
+                `count` and `mean_confidence`, ordered by bucket.
+        '''
+        index = SentimentIndex(self.index_path, readonly=True)
+        try:
+            rows = index.rollup(int(bucket_seconds), start=start, end=end, sites=sites)
+        finally:
+            index.close()
+
+        df = pd.DataFrame(rows, columns=['bucket', 'sentiment_label', 'count', 'mean_confidence'])
+        return df.rename(columns={'bucket': 'publication_date'})
+
+    def load_details(self, filenames: Sequence[str]) -> pd.DataFrame:
+        '''
+        Load the bodies and other display-only fields of a few articles (one table page).
+
+        Args:
+            filenames: Article file names (`<key>.json`, as in the `filename` column).
+
+        Returns:
+            pd.DataFrame:
+                `DETAIL_COLUMNS` of the requested articles (None/'' if missing).
+        '''
+        if self.backend == 'columnar':
+            keys = [name.removesuffix('.json') for name in filenames]
+            found = {
+                f'{key}.json': doc
+                for key, doc in ColumnarReader(self.sentiments_dir).iter_documents(
+                    keys=keys, columns=['key', 'content', 'sentiment', 'category', 'tags'])
+            }
+            return pd.DataFrame([detail_record(name, found.get(name)) for name in filenames], columns=DETAIL_COLUMNS)
+
+        archive = ArticleArchive(self.sentiments_dir)
+        records = []
+        for name in filenames:
+            try:
+                article = archive.get(name.removesuffix('.json'))
+            except Exception as e:
+                print(f'[Loader] Error reading file {name}: {e}')
+                article = None
+            records.append(detail_record(name, article))
+        return pd.DataFrame(records, columns=DETAIL_COLUMNS)
+
+    def refresh(self, rebuild: bool = False) -> pd.DataFrame:
+        '''
+        Return all articles, reading only the files added or changed since the last call.
+
+        Files are compared by name, modification time and size. Rows of deleted
+        files are dropped; a file that cannot be parsed (e.g. still being
+        written) is retried on the next call. Only `METADATA_COLUMNS` are kept.
+
+        Args:
+            rebuild: Forget the previous state and read everything again.
+
+        Returns:
+            pd.DataFrame:
+                Metadata of all loaded articles (a shallow copy, safe to add
+                columns to). Empty if no article is found.
+        '''
+        with self._lock:
+            if rebuild:
+                self._manifest, self._frames, self._loose_df, self._df = {}, {}, None, None
+
+            self._refresh()
+            return self._df.copy(deep=False) if self._df is not None else pd.DataFrame()
+
+    def append_live(self, article: Dict) -> None:
+        '''
+        Queue an article pushed by the change feed (merged by the next `snapshot` or `refresh`).
+
+        Args:
+            article: Stored article with its `filename` (`<key>.json`).
+        '''
+        with self._lock:
+            self._pending.append(article['filename'], article)
+
+    def snapshot(self, max_age_seconds: Optional[float] = None) -> pd.DataFrame:
+        '''
+        Return all articles including the pushed ones, scanning the directory only if needed.
+
+        Args:
+            max_age_seconds: Refresh from the directory if the last refresh is
+                older than this (None: only if nothing was loaded yet).
+
+        Returns:
+            pd.DataFrame:
+                Metadata of all loaded articles (a shallow copy). Empty if no
+                article is found.
+        '''
+        with self._lock:
+            self._update(max_age_seconds)
+            return self._df.copy(deep=False) if self._df is not None else pd.DataFrame()
+
+    def table(self, max_age_seconds: Optional[float] = None) -> pa.Table:
+        '''
+        Return all articles as one shared, read-only Arrow table.
+
+        The table is rebuilt only when the data changed since the previous
+        call; otherwise every caller gets the same object. Rows are sorted by
+        publication date (see `snapshot.time_slice`), and `site_name` and
+        `sentiment_label` are dictionary-encoded with sorted dictionaries.
+
+        Args:
+            max_age_seconds: As in `snapshot`.
+
+        Returns:
+            The table (memory-mapped from `snapshot_path` if set). Empty if
+            no article is found.
+        '''
+        with self._lock:
+            self._update(max_age_seconds)
+            if self._table is None or self._df is not self._table_df:
+                df = self._df if self._df is not None else metadata_frame({c: [] for c in METADATA_COLUMNS})
+                if self.snapshot_path:
+                    write_snapshot(df, self.snapshot_path)
+                    self._table = map_snapshot(self.snapshot_path)
+                else:
+                    self._table = pa.Table.from_pandas(
+                        df.sort_values('publication_date', na_position='last', kind='stable'), preserve_index=False)
+                self._table_df = self._df
+            return self._table
+
+    def _update(self, max_age_seconds: Optional[float]) -> None:
+        '''Refresh from the directory if stale, otherwise merge the pushed articles only.'''
+        if self._refreshed_at is None or (
+                max_age_seconds is not None and time.monotonic() - self._refreshed_at > max_age_seconds):
+            self._refresh()
+        else:
+            self._merge_pending()
+
+    def _refresh(self) -> None:
+        '''Refresh from the directory, then add back the pushed articles whose files were not read yet.'''
+        previous = self._df
+        if self.backend == 'columnar':
+            self._refresh_columnar()
+        else:
+            self._refresh_json()
+        self._refreshed_at = time.monotonic()
+
+        if self._live_df is not None and self._df is not previous:
+            if self._df is not None:
+                self._live_df = self._live_df[~self._live_df['filename'].isin(self._df['filename'])]
+            if self._live_df.empty:
+                self._live_df = None
+            else:
+                self._df = concat_frames([self._df, self._live_df]) if self._df is not None else self._live_df
+        self._merge_pending()
+
+    def _merge_pending(self) -> None:
+        '''Merge the queued pushed articles into the kept DataFrame.'''
+        new_df = self._pending.frame()
+        if new_df is None:
+            return
+        self._pending = MetadataColumns()
+        self._live_df = concat_frames([self._live_df, new_df]).drop_duplicates('filename', keep='last') \
+            if self._live_df is not None else new_df
+        self._df = concat_frames([self._df, new_df]).drop_duplicates('filename', keep='last') \
+            if self._df is not None else new_df
+
+    @staticmethod
+    def _arrow_frame(table: pa.Table) -> pd.DataFrame:
+        '''Build the metadata DataFrame of a columnar store file from its Arrow columns.'''
+        sentiment = table.column('sentiment')
+        # Dictionary-encoded in Arrow: no Python string per row for the categorical columns
+        return metadata_frame({
+            'filename': pc.binary_join_element_wise(table.column('key'), '.json', '').to_numpy(zero_copy_only=False),
+            'site_name': table.column('site_name').dictionary_encode().to_pandas(),
+            'publication_date': table.column('publication_date').to_numpy(zero_copy_only=False),
+            'publication_timestamp': table.column('publication_timestamp').to_pandas(),
+            'title': table.column('title').to_numpy(zero_copy_only=False),
+            'url': table.column('url').to_numpy(zero_copy_only=False),
+            'sentiment_label': pc.struct_field(sentiment, 'sentiment').dictionary_encode().to_pandas(),
+            'sentiment_confidence': pc.struct_field(sentiment, 'confidence').to_numpy(zero_copy_only=False),
+        })
+
+    def _refresh_json(self) -> None:
+        '''Merge new, changed and deleted JSON files and compacted segments into the kept DataFrame.'''
+        current: Dict[str, Tuple[int, int]] = {}
+        with os.scandir(self.sentiments_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and entry.is_file():
+                    stat = entry.stat()
+                    current[entry.name] = (stat.st_mtime_ns, stat.st_size)
+
+        # Segments packed by the compaction service (tracked by path)
+        archive = ArticleArchive(self.sentiments_dir)
+        for path in archive.segments.segments():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            current[path] = (stat.st_mtime_ns, stat.st_size)
+
+        changed = [name for name, signature in current.items() if self._manifest.get(name) != signature]
+        removed = self._manifest.keys() - current.keys()
+        if not changed and not removed and self._df is not None:
+            return
+
+        loose = MetadataColumns()
+        for name in changed:
+            if name.endswith('.seg'):
+                segment = MetadataColumns()
+                for key, doc in archive.iter_segment_articles(name):
+                    segment.append(f'{key}.json', doc)
+                self._frames[name] = segment.frame()
+                continue
+            try:
+                with open(os.path.join(self.sentiments_dir, name), 'r', encoding='utf-8') as f:
+                    loose.append(name, json.load(f))
+            except Exception as e:
+                print(f'[Loader] Error reading file {name}: {e}')
+                del current[name]       # retried on the next refresh
+        for name in removed:
+            self._frames.pop(name, None)
+
+        frames = []
+        if self._loose_df is not None:
+            stale = set(changed) | removed
+            frames.append(self._loose_df[~self._loose_df['filename'].isin(stale)] if stale else self._loose_df)
+        new_df = loose.frame()
+        if new_df is not None:
+            frames.append(new_df)
+        self._loose_df = concat_frames(frames) if frames else None
+
+        # Segments oldest first, then loose files: the most recent copy of a file wins
+        frames = [self._frames[p] for p in sorted(self._frames) if self._frames[p] is not None]
+        if frames:
+            if self._loose_df is not None:
+                frames.append(self._loose_df)
+            self._df = concat_frames(frames).drop_duplicates('filename', keep='last')
+        else:
+            self._df = self._loose_df
+        self._manifest = current
+        print(f'[Loader] Refreshed {self.sentiments_dir}: {len(changed)} new or changed, '
+              f'{len(removed)} removed, {len(current)} files and segments')
+
+    def _refresh_columnar(self) -> None:
+        '''Re-read only the columnar files added or rewritten (compacted) since the last call.'''
+        reader = ColumnarReader(self.sentiments_dir)
+        paths = [p for _, _, parts in reader.partitions() for p in parts] + reader.incoming_files()
+
+        current: Dict[str, Tuple[int, int]] = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            current[path] = (stat.st_mtime_ns, stat.st_size)
+
+        changed = [path for path, signature in current.items() if self._manifest.get(path) != signature]
+        removed = self._manifest.keys() - current.keys()
+        if not changed and not removed and self._df is not None:
+            return
+
+        for path in removed:
+            self._frames.pop(path, None)
+        for path in changed:
+            try:
+                table = reader.read_file(path, columns=METADATA_READ_COLUMNS)
+            except FileNotFoundError:
+                del current[path]       # compacted meanwhile, its rows are in a new part
+                continue
+            self._frames[path] = self._arrow_frame(table) if table.num_rows else None
+
+        # Partitions first, then micro-batches oldest first: the latest row of a key wins
+        frames = [self._frames[p] for p in paths if p in current and self._frames.get(p) is not None]
+        self._df = concat_frames(frames).drop_duplicates('filename', keep='last') if frames else None
+        self._manifest = current
+        print(f'[Loader] Refreshed {self.sentiments_dir}: {len(changed)} new or changed files, '
+              f'{len(removed)} removed, {len(current)} files')
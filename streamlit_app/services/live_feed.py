@@ -0,0 +1,63 @@
+import time
+import threading
+from typing import Any, Dict, Optional
+
+from utils.rabbitmq import RabbitMQClient
+from .data_loader import SentimentDataLoader
+
+
+class LiveFeed:
+    '''
+    Background subscriber of the sentiment results broadcast by `SentimentWorker`.
+
+    A daemon thread subscribes to the fanout exchange with its own RabbitMQ
+    connection (pika connections are not thread-safe) and queues every
+    received article in the loader (`SentimentDataLoader.append_live`). The
+    dashboard compares `version` with the version it last rendered and reruns
+    only when articles arrived. Articles broadcast while the feed is
+    disconnected are not received; the loader's periodic re-scan catches them.
+
+    Attributes:
+        loader: Loader receiving the articles.
+        exchange: Fanout exchange of the results.
+        reconnect_seconds: Delay before reconnecting after a failure.
+        version: Number of articles received so far.
+    '''
+
+    def __init__(self, loader: SentimentDataLoader, exchange: str = 'sentiment_updates', reconnect_seconds: float = 5):
+        '''
+        Initialize the feed (call `start` to subscribe).
+
+        Args:
+            loader: Loader receiving the articles.
+            exchange: Fanout exchange of the results.
+            reconnect_seconds: Delay before reconnecting after a failure.
+        '''
+        self.loader = loader
+        self.exchange = exchange
+        self.reconnect_seconds = reconnect_seconds
+        self.version: int = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        '''Start the subscriber thread (once).'''
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='live-feed', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        '''Subscribe, and reconnect after a delay whenever the connection fails.'''
+        while True:
+            try:
+                RabbitMQClient().subscribe(self.exchange, self._on_message)
+            except Exception as e:
+                print(f'[LiveFeed] Subscription to {self.exchange} failed: {e}')
+            time.sleep(self.reconnect_seconds)
+
+    def _on_message(self, article: Dict[str, Any]) -> None:
+        '''Queue one broadcast article in the loader.'''
+        if 'filename' not in article:
+            return
+        self.loader.append_live(article)
+        self.version += 1
@@ -0,0 +1,157 @@
+import os
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+
+
+def write_snapshot(df: pd.DataFrame, path: str) -> None:
+    '''
+    Write the metadata frame as an uncompressed Arrow (Feather v2) file, atomically.
+
+    Rows are sorted by publication date (missing dates last), so a time range
+    is a contiguous slice (`time_slice`). The file is written next to its
+    target and renamed over it: readers that mapped the previous file keep a
+    valid mapping.
+
+    Args:
+        df: Metadata frame (categorical columns become dictionary arrays).
+        path: Snapshot file.
+    '''
+    table = pa.Table.from_pandas(
+        df.sort_values('publication_date', na_position='last', kind='stable'), preserve_index=False)
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f'.{os.path.basename(path)}.{uuid.uuid4().hex[:6]}.tmp')
+    try:
+        # Uncompressed: record batches are used in place from the mapped file
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def map_snapshot(path: str) -> pa.Table:
+    '''
+    Memory-map a snapshot read-only.
+
+    The table's buffers point into the mapped file, so every reader of the
+    same file shares the operating system's page cache instead of holding
+    its own copy.
+
+    Args:
+        path: Snapshot file.
+
+    Returns:
+        The mapped table.
+    '''
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def time_slice(table: pa.Table, start: Optional[datetime] = None, end: Optional[datetime] = None) -> pa.Table:
+    '''
+    Select a publication time range of a snapshot without copying.
+
+    Args:
+        table: Snapshot (sorted by `publication_date`, missing dates last).
+        start: Earliest publication time (inclusive).
+        end: Latest publication time (inclusive).
+
+    Returns:
+        A zero-copy slice of the table.
+    '''
+    dates = table.column('publication_date')
+    first, last = 0, len(dates) - dates.null_count
+
+    # Sorted dates: the number of rows before a bound is its position
+    if start is not None:
+        first = pc.sum(pc.less(dates, start)).as_py() or 0
+    if end is not None:
+        last = pc.sum(pc.less_equal(dates, end)).as_py() or 0
+    return table.slice(first, max(last - first, 0))
+
+
+def filter_equal(table: pa.Table, column: str, value: str) -> pa.Table:
+    '''Keep the rows whose column equals the value (copies the kept rows only).'''
+    return table.filter(pc.equal(table.column(column), value))
+
+
+def unique_values(table: pa.Table, column: str) -> List[str]:
+    '''Return the sorted distinct values of a column present in the table.'''
+    return sorted(v for v in pc.unique(table.column(column)).to_pylist() if v is not None)
+
+
+def value_counts(table: pa.Table, column: str) -> pd.Series:
+    '''
+    Count the rows per value of a column, missing values excluded.
+
+    Args:
+        table: Metadata table.
+        column: Column to count.
+
+    Returns:
+        Counts indexed by value, largest first.
+    '''
+    counts = pc.value_counts(table.column(column))
+    series = pd.Series(counts.field('counts').to_numpy(), index=counts.field('values').to_pylist(), name='count')
+    return series[series.index.notna()].sort_values(ascending=False)
+
+
+def floor_counts(table: pa.Table, bucket: str) -> pd.DataFrame:
+    '''
+    Count the rows per publication time bucket and sentiment label.
+
+    Args:
+        table: Metadata table.
+        bucket: Bucket size as a pandas frequency (e.g. '15min', '1d').
+
+    Returns:
+        pd.DataFrame:
+            `publication_date` (bucket start), `sentiment_label` and `count`.
+    '''
+    buckets = pc.floor_temporal(table.column('publication_date'),
+                                multiple=int(pd.Timedelta(bucket).total_seconds()), unit='second')
+    counts = (
+        pa.table({'publication_date': buckets, 'sentiment_label': table.column('sentiment_label')})
+          .group_by(['publication_date', 'sentiment_label'])
+          .aggregate([([], 'count_all')])
+          .rename_columns(['publication_date', 'sentiment_label', 'count'])
+          .to_pandas()
+    )
+    return counts.dropna().sort_values('publication_date', ignore_index=True)
+
+
+def paginate(table: pa.Table, sort_by: str, ascending: bool, page: int, page_size: int) -> pd.DataFrame:
+    '''
+    Sort the metadata rows and convert one page of them to pandas.
+
+    Only the row order is computed over the whole table; the page rows are
+    the only ones copied.
+
+    Args:
+        table: Metadata table.
+        sort_by: Column to sort on.
+        ascending: Sort direction.
+        page: 1-based page number.
+        page_size: Rows per page.
+
+    Returns:
+        The rows of the page (empty past the last page).
+    '''
+    column = table.column(sort_by)
+    if pa.types.is_dictionary(column.type):
+        # Categories are kept sorted (see `metadata_frame`): codes order like the values
+        column = pa.chunked_array([chunk.indices for chunk in column.chunks], type=column.type.index_type)
+    order = pc.sort_indices(pa.table({'key': column}),
+                            sort_keys=[('key', 'ascending' if ascending else 'descending')],
+                            null_placement='at_end')
+    start = (max(page, 1) - 1) * page_size
+    return table.take(order[start:start + page_size]).to_pandas()
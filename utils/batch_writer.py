@@ -0,0 +1,215 @@
+import os
+import json
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from storage.segment_archive import SegmentWriter
+from storage.columnar_store import ColumnarStore
+
+# Control markers passed through the queue
+_STOP = object()
+
+
+class BatchWriter:
+    '''
+    Background writer of JSON documents, decoupled from the caller's thread.
+
+    Documents are handed over with `submit` and written by one daemon thread
+    in batches (everything queued at that moment, up to `batch_size`), so a
+    burst of items costs one batch instead of one blocking write each. Three
+    output modes are supported:
+        - 'files': one `<out_dir>/<filename>` JSON file per document (the
+          historical `data/raw` layout), optionally fsynced
+        - 'segment': documents appended to zstd-compressed segments under
+          `<out_dir>/segments/` (`SegmentWriter`), fsynced once per batch
+        - 'columnar': documents appended to the Parquet micro-batches of a
+          `ColumnarStore` at `<out_dir>`, compacted into site/day partitions
+
+    The queue is bounded: `submit` never blocks and returns False when it is
+    full, and the caller can then wait with `put` outside its event loop.
+
+    Attributes:
+        out_dir: Output directory.
+        mode: 'files', 'segment' or 'columnar'.
+        batch_size: Maximum documents written per batch.
+        fsync: Fsync every file in 'files' mode.
+        written: Documents written so far.
+        batches: Batches written so far.
+        errors: Documents that failed to be written.
+    '''
+
+    MODES = ('files', 'segment', 'columnar')
+
+    def __init__(self, out_dir: str, mode: str = 'files', max_queue: int = 1000, batch_size: int = 100,
+                 fsync: bool = False, segment_prefix: str = 'raw'):
+        '''
+        Initialize the writer and start its thread.
+
+        Args:
+            out_dir: Output directory.
+            mode: 'files', 'segment' or 'columnar'.
+            max_queue: Maximum queued documents (bounds memory).
+            batch_size: Maximum documents written per batch.
+            fsync: Fsync every file in 'files' mode.
+            segment_prefix: File name prefix of new segments or micro-batches.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        '''
+        if mode not in self.MODES:
+            raise ValueError(f'[BatchWriter] Unknown mode: {mode}')
+
+        self.out_dir = out_dir
+        self.mode = mode
+        self.batch_size = batch_size
+        self.fsync = fsync
+
+        self.written: int = 0
+        self.batches: int = 0
+        self.errors: int = 0
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.segment: Optional[SegmentWriter] = None
+        if mode == 'segment':
+            self.segment = SegmentWriter(os.path.join(out_dir, 'segments'), prefix=segment_prefix)
+        self.store: Optional[ColumnarStore] = None
+        if mode == 'columnar':
+            self.store = ColumnarStore(out_dir, prefix=segment_prefix)
+
+        self.queue: 'queue.Queue[Any]' = queue.Queue(maxsize=max_queue)
+        self.thread = threading.Thread(target=self._run, name='batch-writer', daemon=True)
+        self.thread.start()
+
+    def submit(self, filename: str, data: Dict[str, Any]) -> bool:
+        '''
+        Queue a document without blocking.
+
+        The document must not be modified by the caller afterwards.
+
+        Args:
+            filename: Output file name (`<name>.json`; its MD5 part keys segment records).
+            data: JSON-serializable document.
+
+        Returns:
+            False if the queue is full and the document was not queued.
+        '''
+        try:
+            self.queue.put_nowait((filename, data))
+            return True
+        except queue.Full:
+            return False
+
+    def put(self, filename: str, data: Dict[str, Any]) -> None:
+        '''
+        Queue a document, waiting for room (call from a worker thread).
+
+        Args:
+            filename: Output file name.
+            data: JSON-serializable document.
+        '''
+        self.queue.put((filename, data))
+
+    def flush(self) -> None:
+        '''
+        Block until every document queued so far is written.
+        '''
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        '''
+        Write the remaining documents and stop the thread (blocking).
+        '''
+        if not self.thread.is_alive():
+            return
+        self.queue.put(_STOP)
+        self.thread.join()
+        if self.segment is not None:
+            self.segment.close()
+        if self.store is not None:
+            self.store.close()
+
+    def _run(self) -> None:
+        '''Writer thread: take everything queued, write it as one batch.'''
+        while True:
+            try:
+                # Buffered columnar rows are flushed once they are old enough
+                timeout = self.store.flush_seconds if self.store is not None and self.store.buffered else None
+                entries = [self.queue.get(timeout=timeout)]
+            except queue.Empty:
+                self._flush_store()
+                continue
+            while len(entries) < self.batch_size:
+                try:
+                    entries.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            docs = [e for e in entries if isinstance(e, tuple)]
+            if docs:
+                self._write_batch(docs)
+
+            if any(isinstance(e, threading.Event) for e in entries):
+                self._flush_store()
+            for e in entries:
+                if isinstance(e, threading.Event):
+                    e.set()
+            if any(e is _STOP for e in entries):
+                return
+
+    def _write_batch(self, docs: List[Tuple[str, Dict[str, Any]]]) -> None:
+        '''Write one batch of documents in the configured mode.'''
+        if self.mode == 'segment':
+            appended = 0
+            for filename, data in docs:
+                try:
+                    key = filename.removesuffix('.json').rsplit('-', 1)[-1]
+                    payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+                    self.segment.append(key, payload, {'filename': filename})
+                    appended += 1
+                except Exception as e:
+                    self.errors += 1
+                    print(f'[BatchWriter] Failed to write {filename}: {e}')
+            # A failed flush (e.g. disk full) must not kill the thread: the queue would never drain
+            try:
+                self.segment.flush(fsync=True)
+                self.written += appended
+            except Exception as e:
+                self.errors += appended
+                print(f'[BatchWriter] Failed to flush segment batch: {e}')
+        elif self.mode == 'columnar':
+            for filename, data in docs:
+                try:
+                    self.store.append(filename.removesuffix('.json'), data)
+                    self.written += 1
+                except Exception as e:
+                    self.errors += 1
+                    print(f'[BatchWriter] Failed to write {filename}: {e}')
+            if self.store.flush_due():
+                self._flush_store()
+        else:
+            for filename, data in docs:
+                try:
+                    with open(os.path.join(self.out_dir, filename), 'w', encoding='utf-8') as f:
+                        json.dump(data, f, ensure_ascii=False, indent=2)
+                        if self.fsync:
+                            f.flush()
+                            os.fsync(f.fileno())
+                    self.written += 1
+                except Exception as e:
+                    self.errors += 1
+                    print(f'[BatchWriter] Failed to write {filename}: {e}')
+        self.batches += 1
+
+    def _flush_store(self) -> None:
+        '''Write the buffered columnar rows as one micro-batch.'''
+        if self.store is None:
+            return
+        pending = self.store.buffered
+        try:
+            self.store.flush()
+        except Exception as e:
+            self.errors += pending
+            print(f'[BatchWriter] Failed to flush micro-batch: {e}')
@@ -80,8 +80,8 @@ class ConfigManager:
             
                 A list of spider config objects:
                 [
-                    {'spider': 'isna', 'interval': 15},
-                    {'spider': 'irna', 'interval': 20},
+                    {'spider': 'isna', 'interval': 15, 'min_interval': 1, 'max_interval': 30, 'discovery': 'auto'},
+                    {'spider': 'irna', 'interval': 20, 'min_interval': 20, 'max_interval': 20, 'discovery': 'archive'},
                     ...
                 ]
         '''
@@ -89,9 +89,13 @@ class ConfigManager:
         for name, cfg in self.get_websites().items():
             if cfg['end_date']:
                 continue
+            interval = cfg.get('interval', 15)
             spider_configs.append({
                 'spider': name,
-                'interval': cfg.get('interval', 15)
+                'interval': interval,
+                'min_interval': cfg.get('min_interval', interval),
+                'max_interval': cfg.get('max_interval', interval),
+                'discovery': cfg.get('discovery') or 'auto'
             })
         return spider_configs
 
@@ -120,6 +124,95 @@ class ConfigManager:
             })
         return date_configs
 
+    def get_throttle_config(self, name: str) -> dict:
+        '''
+        Retrieve the adaptive throttling bounds of a website.
+
+        Args:
+            name: The website key within the `websites` section.
+
+        Returns:
+            dict: `min_delay`, `max_delay`, `min_concurrency` and/or
+            `max_concurrency` overrides (empty if missing).
+        '''
+        return (self.get_websites().get(name) or {}).get('throttle') or {}
+
+    def get_adaptive_interval_config(self) -> dict:
+        '''
+        Retrieve the adaptive crawl interval configuration section.
+
+        Returns:
+            dict: Adaptive scheduling parameters (empty if missing).
+        '''
+        return self.config.get('adaptive_interval') or {}
+
+    def get_backfill_config(self) -> dict:
+        '''
+        Retrieve the historical backfill configuration section.
+
+        Typically includes:
+            - Window size in hours
+            - Concurrency limits (per site and overall)
+            - Checkpoint file path
+
+        Returns:
+            dict: Backfill-related configuration values (empty if missing).
+        '''
+        return self.config.get('backfill') or {}
+
+    def get_preprocessing_config(self) -> dict:
+        '''
+        Retrieve the preprocessing configuration section.
+
+        Typically includes:
+            - Boilerplate stripping parameters
+            - Quality gate thresholds
+
+        Returns:
+            dict: Preprocessing-related configuration values (empty if missing).
+        '''
+        return self.config.get('preprocessing') or {}
+
+    def get_storage_config(self) -> dict:
+        '''
+        Retrieve the article storage configuration section.
+
+        Typically includes:
+            - Backend ('json' files or 'columnar' Parquet partitions)
+            - Micro-batch size, flush age and compaction frequency
+            - Sentiment index, dashboard snapshot and full-text index paths
+
+        Returns:
+            dict: Storage-related configuration values (empty if missing).
+        '''
+        return self.config.get('storage') or {}
+
+    def get_compaction_config(self) -> dict:
+        '''
+        Retrieve the small-file compaction and retention configuration section.
+
+        Typically includes:
+            - Pass interval, window size and grace period
+            - Directories with their retention in days
+
+        Returns:
+            dict: Compaction-related configuration values (empty if missing).
+        '''
+        return self.config.get('compaction') or {}
+
+    def get_live_updates_config(self) -> dict:
+        '''
+        Retrieve the live dashboard updates configuration section.
+
+        Typically includes:
+            - Whether finished sentiment results are broadcast
+            - Fanout exchange name and dashboard polling interval
+
+        Returns:
+            dict: Live-update-related configuration values (empty if missing).
+        '''
+        return self.config.get('live_updates') or {}
+
     def get_model_info(self) -> dict:
         '''
         Retrieve the model configuration section.
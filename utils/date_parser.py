@@ -1,14 +1,20 @@
+import re
 import jdatetime
-from datetime import datetime
-from typing import Union
+from email.utils import parsedate_to_datetime
+from zoneinfo import ZoneInfo
+from datetime import date, datetime, time as dt_time
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+# Local time of the news sites; all parsers return naive Tehran wall time
+TEHRAN = ZoneInfo('Asia/Tehran')
+
+# Persian and Arabic-Indic digits to English digits
+_DIGITS = str.maketrans('۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩', '0123456789' * 2)
 
 # Convert Persian digits to English digits
 def fa_to_en_numbers(s: str) -> str:
-    fa_numbers = "۰۱۲۳۴۵۶۷۸۹"
-    en_numbers = "0123456789"
-    for f, e in zip(fa_numbers, en_numbers):
-        s = s.replace(f, e)
-    return s
+    return s.translate(_DIGITS)
 
 # Mapping Persian month names to numbers
 month_map = {
@@ -17,45 +23,123 @@ month_map = {
     "آذر": 9, "دی": 10, "بهمن": 11, "اسفند": 12
 }
 
-def parse_date(date_str: str) -> Union[datetime, jdatetime.datetime]:
+# Short Persian date with month name: 10 azar(fa) 04 - 14:15
+_JALALI_MONTH_RE = re.compile(
+    r'^(\d{1,2})\s+(' + '|'.join(month_map) + r')\s+(\d{2,4})\s*-\s*(\d{1,2}):(\d{1,2})$')
+
+# Full Persian date: 1404-09-10 14:34
+_JALALI_NUMERIC_RE = re.compile(r'^(\d{2,4})[-/](\d{1,2})[-/](\d{1,2})\s+(\d{1,2}):(\d{1,2})')
+
+
+@lru_cache(maxsize=1024)
+def _jalali_day(year: int, month: int, day: int) -> date:
+    # Calendar conversion is the costly part and listing dates share few days
+    return jdatetime.date(year, month, day).togregorian()
+
+
+def _jalali_to_gregorian(year: int, month: int, day: int, hour: int, minute: int) -> datetime:
+    if year < 100:
+        year += 1400
+    return datetime.combine(_jalali_day(year, month, day), dt_time(hour, minute))
+
+
+def _parse_iso(date_str: str) -> datetime:
+    # ISO 8601 format (Gregorian), local wall time is kept
+    return datetime.fromisoformat(date_str).replace(tzinfo=None)
+
+
+def _parse_feed(date_str: str) -> datetime:
+    # RSS pubDate (RFC 822) or sitemap ISO 8601, converted to Tehran time
+    if date_str[:4].isdigit():
+        dt = datetime.fromisoformat(date_str)
+    else:
+        dt = parsedate_to_datetime(date_str)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(TEHRAN).replace(tzinfo=None)
+    return dt
+
+
+def _parse_jalali(date_str: str) -> datetime:
+    m = _JALALI_MONTH_RE.match(date_str)
+    if m:
+        day, month_name, year, hour, minute = m.groups()
+        return _jalali_to_gregorian(int(year), month_map[month_name], int(day), int(hour), int(minute))
+
+    m = _JALALI_NUMERIC_RE.match(date_str)
+    if m:
+        return _jalali_to_gregorian(*map(int, m.groups()))
+
+    raise ValueError(f"Unrecognized Jalali date format: {date_str}")
+
+
+def _parse_auto(date_str: str) -> datetime:
+    if "T" in date_str:
+        return _parse_iso(date_str)
+    return _parse_jalali(date_str)
+
+
+def _cached(parser: Callable[[str], datetime], maxsize: int = 4096) -> Callable[[str], datetime]:
+    # Listing pages repeat the same minute many times, so parsed results are memoized
+    @lru_cache(maxsize=maxsize)
+    def parse(date_str: str) -> datetime:
+        return parser(fa_to_en_numbers(date_str.strip()))
+    return parse
+
+
+# Registry of compiled parsers, selected per site with the spider's DATE_FORMAT
+DATE_PARSERS: Dict[str, Callable[[str], datetime]] = {
+    'iso': _cached(_parse_iso),
+    'jalali': _cached(_parse_jalali),
+    'feed': _cached(_parse_feed),
+    'auto': _cached(_parse_auto),
+}
+
+
+def get_date_parser(fmt: str = 'auto') -> Callable[[str], datetime]:
+    """
+    Return the memoized parser registered for a date format.
+
+    Args:
+        fmt: One of `DATE_PARSERS` ('iso', 'jalali', 'feed' or 'auto').
+
+    Returns:
+        A function mapping a date string to a naive Gregorian datetime.
+
+    Raises:
+        KeyError: If no parser is registered for the format.
+    """
+    return DATE_PARSERS[fmt]
+
+
+def parse_date(date_str: str, fmt: str = 'auto') -> datetime:
     """
     Parse a Persian or Gregorian date string and return the corresponding Gregorian datetime.
 
     Args:
         date_str: The date string in Persian or Gregorian format.
+        fmt: Registered format of the string ('iso', 'jalali', 'feed' or 'auto' to detect it).
 
     Returns:
-        Returns a Gregorian `datetime` object if the date is in Gregorian format, or a `jdatetime.datetime` object if the date is in Persian format.
+        A naive Gregorian `datetime` object.
 
     Raises:
-        ValueError: If the date format is unrecognized.
+        ValueError: If the date format is unrecognized or the date is invalid.
     """
-    date_str = fa_to_en_numbers(date_str.strip())
+    return get_date_parser(fmt)(date_str)
 
-    # ISO 8601 format (Gregorian)
-    if "T" in date_str:
-        dt = datetime.fromisoformat(date_str)
-        return dt.replace(tzinfo=None)
-    
-    # Short Persian date with month name: 10 azar(fa) 04 - 14:15
-    if "-" in date_str and any(m in date_str for m in month_map):
-        date_part, time_part = date_str.split(" - ")
-        day_str, month_name, year_str = date_part.split()
-        month = month_map[month_name]
-        year = int(year_str)
-        if year < 100:
-            year += 1400
-        hour, minute = map(int, time_part.split(":"))
-        return jdatetime.datetime(year, month, int(day_str), hour, minute).togregorian()
-
-    # Full Persian date: 1404-09-10 14:34
-    if "-" in date_str and " " in date_str:
-        date_part, time_part = date_str.split(" ")
-        year, month, day = map(int, date_part.split("-"))
-        if year < 100:
-            year += 1400
-        hour, minute = map(int, time_part.split(":"))
-        return jdatetime.datetime(year, month, day, hour, minute).togregorian()
-
-
-    raise ValueError(f"Unrecognized date format: {date_str}")
+
+def try_parse(date_str: str, fmt: str = 'auto') -> Optional[datetime]:
+    """
+    Non-raising variant of `parse_date`.
+
+    Args:
+        date_str: The date string in Persian or Gregorian format.
+        fmt: Registered format of the string ('iso', 'jalali', 'feed' or 'auto').
+
+    Returns:
+        A naive Gregorian `datetime` object, or None if the string cannot be parsed.
+    """
+    try:
+        return get_date_parser(fmt)(date_str)
+    except (ValueError, TypeError, AttributeError):
+        return None
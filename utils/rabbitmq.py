@@ -5,6 +5,7 @@ from dotenv import load_dotenv
 from typing import Optional, Any
 
 import pika.channel
+import pika.exceptions
 
 load_dotenv()
 
@@ -19,6 +20,7 @@ class RabbitMQClient:
         - Queue declaration (idempotent)
         - JSON-based message publishing
         - Message consumption with a callback function
+        - Broadcasting to fanout exchanges and subscribing to them
         - Optional persistent/durable queue configuration
 
     Attributes:
@@ -74,6 +76,14 @@ class RabbitMQClient:
         self.connection = pika.BlockingConnection(params)
         self.channel = self.connection.channel()
 
+    def ensure_connection(self) -> None:
+        '''
+        Reconnect if the connection or channel was closed (e.g. missed heartbeats
+        while a long-lived process was idle).
+        '''
+        if self.connection is None or self.connection.is_closed or self.channel is None or self.channel.is_closed:
+            self.connect()
+
     def declare_queue(self, queue_name: str) -> None:
         '''
         Declare a queue if it does not already exist.
@@ -85,6 +95,15 @@ class RabbitMQClient:
         '''
         self.channel.queue_declare(queue=queue_name, durable=self.durable)
 
+    def declare_exchange(self, exchange: str) -> None:
+        '''
+        Declare a fanout exchange if it does not already exist (idempotent).
+
+        Args:
+            exchange: Name of the exchange to declare.
+        '''
+        self.channel.exchange_declare(exchange=exchange, exchange_type='fanout', durable=self.durable)
+
     def publish(self, queue_name: str, message_dict: dict) -> None:
         '''
         Publish a JSON-serializable message to the specified queue.
@@ -96,15 +115,66 @@ class RabbitMQClient:
         Notes:
             - Messages are published as UTF-8 encoded JSON.
             - delivery_mode=2 ensures message persistence.
+            - A dropped connection is re-established once before giving up.
+        '''
+        body = json.dumps(message_dict, ensure_ascii=False).encode('utf-8')
+        properties = pika.BasicProperties(
+            delivery_mode=2  # persistent
+        )
+
+        try:
+            self.channel.basic_publish(exchange='', routing_key=queue_name, body=body, properties=properties)
+        except (pika.exceptions.AMQPConnectionError, pika.exceptions.AMQPChannelError):
+            self.connect()
+            self.channel.basic_publish(exchange='', routing_key=queue_name, body=body, properties=properties)
+
+    def broadcast(self, exchange: str, message_dict: dict) -> None:
+        '''
+        Publish a JSON-serializable message to every queue bound to a fanout exchange.
+
+        Args:
+            exchange: Fanout exchange to publish to.
+            message_dict: Dictionary that will be serialized as JSON.
+
+        Notes:
+            - Messages are transient (delivery_mode=1): they notify live
+              subscribers and are dropped if nobody is listening.
+            - A dropped connection is re-established once before giving up.
+        '''
+        body = json.dumps(message_dict, ensure_ascii=False).encode('utf-8')
+        properties = pika.BasicProperties(
+            delivery_mode=1  # transient
+        )
+
+        try:
+            self.channel.basic_publish(exchange=exchange, routing_key='', body=body, properties=properties)
+        except (pika.exceptions.AMQPConnectionError, pika.exceptions.AMQPChannelError):
+            self.connect()
+            self.channel.basic_publish(exchange=exchange, routing_key='', body=body, properties=properties)
+
+    def subscribe(self, exchange: str, callback: Any) -> None:
         '''
-        self.channel.basic_publish(
-            exchange='',
-            routing_key=queue_name,
-            body=json.dumps(message_dict, ensure_ascii=False).encode('utf-8'),
-            properties=pika.BasicProperties(
-                delivery_mode=2  # persistent
-            )
+        Consume the messages broadcast to a fanout exchange from now on.
+
+        A server-named exclusive queue is bound to the exchange; it is deleted
+        with the connection, so messages broadcast while disconnected are not
+        received. Messages are acknowledged on delivery.
+
+        Args:
+            exchange: Fanout exchange to subscribe to.
+            callback: Function with signature: callback(message_dict)
+        '''
+        self.declare_exchange(exchange)
+        queue = self.channel.queue_declare(queue='', exclusive=True).method.queue
+        self.channel.queue_bind(exchange=exchange, queue=queue)
+        self.channel.basic_consume(
+            queue=queue,
+            auto_ack=True,
+            on_message_callback=lambda ch, method, props, body:
+                callback(json.loads(body.decode('utf-8')))
         )
+        print(f' [*] Subscribed to exchange "{exchange}" ...')
+        self.channel.start_consuming()
 
     def consume(self, queue_name: str, callback: Any, prefetch: int = 1) -> None:
         '''
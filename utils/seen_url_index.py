@@ -0,0 +1,151 @@
+import os
+import math
+import mmap
+import fcntl
+import struct
+from typing import Tuple
+
+
+class SeenUrlIndex:
+    '''
+    Persistent, memory-mapped Bloom filter of already crawled article URLs.
+
+    Keys are the MD5 hex digests produced by `sanitize_filename`, so the index
+    agrees with the raw file naming. The file has a fixed size chosen from the
+    configured capacity and error rate; opening it is a single `mmap` call, so
+    load time and memory stay flat no matter how many URLs were added.
+
+    A Bloom filter has no false negatives: a URL reported as unseen is always
+    new. A small, configurable fraction of new URLs may be reported as seen.
+
+    Several instances (concurrent crawlers, other processes) may share the
+    file: the bits live in the shared mapping, and each instance adds only
+    the keys it added itself to the header count (under a file lock) on flush.
+
+    File layout:
+        header (40 bytes): magic, number of bits, number of hash functions, capacity, item count
+        body: the bit array
+
+    Attributes:
+        path: Index file path.
+        num_bits: Size of the bit array.
+        num_hashes: Number of hash functions.
+        capacity: Number of keys the file was sized for.
+    '''
+
+    MAGIC = b'SEENBLM1'
+    HEADER = struct.Struct('<8sQIQQ4x')
+
+    def __init__(self, path: str, capacity: int = 5_000_000, error_rate: float = 1e-4):
+        '''
+        Open the index file, creating it if needed.
+
+        When the file already exists, its own size parameters are used and
+        `capacity`/`error_rate` are ignored.
+
+        Args:
+            path: Index file path.
+            capacity: Expected number of distinct URLs.
+            error_rate: Target false-positive rate at full capacity.
+        '''
+        self.path = path
+
+        if not os.path.exists(path):
+            self._create(path, capacity, *self._optimal_size(capacity, error_rate))
+
+        self._file = open(path, 'r+b')
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+
+        magic, self.num_bits, self.num_hashes, self.capacity, _ = self.HEADER.unpack_from(self._mmap, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f'[SeenUrlIndex] {path} is not a seen-URL index file')
+        # Keys added by this instance since its last flush
+        self._added: int = 0
+        self._full: bool = False
+
+    @staticmethod
+    def _optimal_size(capacity: int, error_rate: float) -> Tuple[int, int]:
+        '''Return the (bits, hashes) pair for the given capacity and error rate.'''
+        num_bits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        num_bits = (num_bits + 7) // 8 * 8
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return num_bits, num_hashes
+
+    def _create(self, path: str, capacity: int, num_bits: int, num_hashes: int) -> None:
+        '''Create a zero-filled index file (sparse where the filesystem allows).'''
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, num_bits, num_hashes, capacity, 0))
+            f.truncate(self.HEADER.size + num_bits // 8)
+        os.replace(tmp_path, path)
+
+    def _positions(self, key: str) -> list:
+        '''Derive the bit positions of an MD5 hex key (double hashing).'''
+        digest = bytes.fromhex(key)
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, key: str) -> bool:
+        '''Return True if the key was (probably) added before.'''
+        mm = self._mmap
+        base = self.HEADER.size
+        for pos in self._positions(key):
+            if not mm[base + (pos >> 3)] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def add(self, key: str) -> bool:
+        '''
+        Add a key to the index.
+
+        Args:
+            key: MD5 hex digest of the URL.
+
+        Returns:
+            True if the key was not present before.
+        '''
+        mm = self._mmap
+        base = self.HEADER.size
+        added = False
+        for pos in self._positions(key):
+            offset = base + (pos >> 3)
+            bit = 1 << (pos & 7)
+            if not mm[offset] & bit:
+                mm[offset] |= bit
+                added = True
+
+        if added:
+            self._added += 1
+            if not self._full and len(self) >= self.capacity:
+                self._full = True
+                print(f'[SeenUrlIndex] {self.path} reached its capacity; false positives will rise')
+        return added
+
+    def _stored_count(self) -> int:
+        '''Return the item count in the shared header (flushed by every instance).'''
+        return self.HEADER.unpack_from(self._mmap, 0)[4]
+
+    def __len__(self) -> int:
+        '''Approximate number of distinct keys added (by every instance).'''
+        return self._stored_count() + self._added
+
+    def flush(self) -> None:
+        '''Add this instance's new keys to the header count and write dirty pages back to disk.'''
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+        try:
+            count = self._stored_count() + self._added
+            self.HEADER.pack_into(self._mmap, 0, self.MAGIC, self.num_bits, self.num_hashes, self.capacity, count)
+            self._added = 0
+            self._mmap.flush()
+        finally:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        '''Flush and release the memory map.'''
+        if self._mmap.closed:
+            return
+        self.flush()
+        self._mmap.close()
+        self._file.close()
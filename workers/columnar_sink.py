@@ -0,0 +1,69 @@
+from typing import Any, Dict, Optional, Tuple
+
+from storage.columnar_store import ColumnarStore
+
+
+class ColumnarSink:
+    '''
+    Columnar output of a RabbitMQ worker with acknowledgements deferred to the flush.
+
+    Articles are appended to the micro-batch buffer of a `ColumnarStore`; their
+    messages stay unacknowledged until the micro-batch is written, and are then
+    acknowledged at once (`multiple=True`). A crash therefore loses no article:
+    unacknowledged messages are redelivered and, being keyed by file name,
+    overwrite any copy that was already written.
+
+    The consumer's prefetch must be at least `batch_rows`, otherwise a batch can
+    only be completed by the flush timer.
+
+    Attributes:
+        store: Columnar store receiving the articles.
+        unacked: Channel and highest delivery tag not acknowledged yet.
+    '''
+
+    def __init__(self, store: ColumnarStore):
+        '''
+        Initialize the sink.
+
+        Args:
+            store: Columnar store receiving the articles.
+        '''
+        self.store = store
+        self.unacked: Optional[Tuple[Any, int]] = None
+
+    def save(self, ch: Any, method: Any, key: str, article: Dict[str, Any]) -> None:
+        '''
+        Buffer an article; its message is acknowledged by the flush that writes it.
+
+        Args:
+            ch: RabbitMQ channel of the message.
+            method: Message delivery method (contains delivery tag).
+            key: Article key (the raw file name).
+            article: Article to store.
+        '''
+        self.store.append(key, article)
+        self.unacked = (ch, method.delivery_tag)
+        if self.store.flush_due():
+            self.flush()
+
+    def flush(self) -> None:
+        '''Write the buffered articles and acknowledge their messages.'''
+        self.store.flush()
+        if self.unacked is not None:
+            ch, delivery_tag = self.unacked
+            ch.basic_ack(delivery_tag=delivery_tag, multiple=True)
+            self.unacked = None
+
+    def start_timer(self, connection: Any) -> None:
+        '''
+        Flush partial micro-batches every `flush_seconds` while the queue is idle.
+
+        Args:
+            connection: Blocking connection whose consumer loop runs the timer.
+        '''
+        def on_timer() -> None:
+            if self.store.buffered:
+                self.flush()
+            connection.call_later(self.store.flush_seconds, on_timer)
+
+        connection.call_later(self.store.flush_seconds, on_timer)
@@ -1,19 +1,24 @@
 import os
 import json
+import time
 from utils.rabbitmq import RabbitMQClient
-from preprocessing.clean_text import TextCleaner
-from typing import Any, Dict
+from preprocessing.pipeline import PreprocessPipeline
+from storage.columnar_store import ColumnarStore
+from workers.columnar_sink import ColumnarSink
+from typing import Any, Dict, Optional
 
 
 class PreprocessWorker:
     '''
     Class responsible for processing and cleaning news articles from a RabbitMQ queue.
 
-    It listens to an input queue, cleans the articles, saves them to files, 
-    and sends them to an output queue.
+    It listens to an input queue, cleans the articles, saves them to files
+    (or a columnar store), and sends them to an output queue. Articles rejected by the quality gate
+    are recorded with their reason code in a daily JSON Lines file of `reject_dir`
+    (`rejected-YYYY-MM-DD.jsonl`: key, site, URL, title, reason; no body) instead.
     '''
 
-    def __init__(self, input_queue: str = 'raw_news', output_queue: str = 'clean_news', out_dir: str = 'data/cleaned'):
+    def __init__(self, input_queue: str = 'raw_news', output_queue: str = 'clean_news', out_dir: str = 'data/cleaned', reject_dir: str = 'data/rejected', preprocess_config: Optional[dict] = None, storage_config: Optional[dict] = None):
         '''
         Initializes the PreprocessWorker with input and output queues and an output directory.
 
@@ -21,13 +26,39 @@ class PreprocessWorker:
             input_queue: The name of the input queue from which messages are consumed.
             output_queue: The name of the output queue where processed articles are sent.
             out_dir: The directory where cleaned articles are saved as JSON files.
+            reject_dir: The directory where articles rejected by the quality gate are recorded.
+            preprocess_config: The `preprocessing` section of the settings file.
+            storage_config: The `storage` section of the settings file (backend and micro-batch sizes).
+
+        Raises:
+            ValueError: If `report_every` is below 1.
         '''
         self.input_queue: str = input_queue
         self.output_queue: str = output_queue
+        self.reject_dir: str = reject_dir
         self.out_dir: str = out_dir
+        preprocess_config = preprocess_config or {}
+
+        self.report_every: int = preprocess_config.get('report_every', 500)
+        if not isinstance(self.report_every, int) or self.report_every < 1:
+            raise ValueError(f'[PreprocessWorker] report_every must be an integer >= 1, got {self.report_every!r}')
+        self.processed: int = 0
 
-        # Ensure output directory exists
+        # Ensure output directories exist
         os.makedirs(self.out_dir, exist_ok=True)
+        os.makedirs(self.reject_dir, exist_ok=True)
+
+        # Columnar output (acks deferred to the micro-batch flush), or JSON files
+        storage_config = storage_config or {}
+        self.sink: Optional[ColumnarSink] = None
+        if storage_config.get('backend', 'json') == 'columnar':
+            self.sink = ColumnarSink(ColumnarStore(
+                self.out_dir,
+                batch_rows=storage_config.get('batch_rows', 200),
+                flush_seconds=storage_config.get('flush_seconds', 30),
+                compact_every=storage_config.get('compact_every', 20),
+                prefix='cleaned',
+            ))
 
         # Singleton RabbitMQ client
         self.rabbit = RabbitMQClient()
@@ -36,13 +67,13 @@ class PreprocessWorker:
         self.rabbit.declare_queue(self.input_queue)
         self.rabbit.declare_queue(self.output_queue)
 
-        # Text cleaner instance
-        self.text_cleaner = TextCleaner()
+        # Boilerplate stripping, text cleaning and quality gate
+        self.pipeline = PreprocessPipeline(preprocess_config)
 
     def handle_message(self, ch: Any, method: Any, props: Any, article: Dict[str, Any]) -> None:
         '''
         Processes a single message from the input queue, cleans the article, saves it,
-        and publishes it to the output queue.
+        and publishes it to the output queue (or records it as rejected if it fails the quality gate).
 
         Args:
             ch: The channel object from RabbitMQ.
@@ -50,19 +81,50 @@ class PreprocessWorker:
             props: The properties associated with the message.
             article: The article dictionary containing raw data to be cleaned.
         '''
-        # Clean text fields
-        article['title'] = self.text_cleaner.clean(article['title'])
-        article['content'] = self.text_cleaner.clean(article['content'])
-        article['summary'] = self.text_cleaner.clean(article['summary'])
-
-        # Save cleaned file locally
-        self._save_to_file(article)
-
-        # Send cleaned message to next queue
-        self.rabbit.publish(self.output_queue, article)
+        reason = self.pipeline.process(article)
+
+        if reason:
+            # Skip the LLM for empty, tiny or non-article items
+            self._record_reject(article, reason)
+        elif self.sink is not None:
+            # Send cleaned message to next queue, store it in the micro-batch
+            self.rabbit.publish(self.output_queue, article)
+            stored = dict(article)
+            self.sink.save(ch, method, stored.pop('raw_filename'), stored)
+        else:
+            # Save cleaned file locally
+            self._save_to_file(article)
+
+            # Send cleaned message to next queue
+            self.rabbit.publish(self.output_queue, article)
+
+        # Acknowledge message (stored articles of the columnar sink are acknowledged on flush)
+        if self.sink is None or reason:
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+
+        self.processed += 1
+        if self.processed % self.report_every == 0:
+            self.pipeline.report()
+
+    def _record_reject(self, article: Dict[str, Any], reason: str) -> None:
+        '''
+        Appends a rejected article's reason code to the daily reject file.
 
-        # Acknowledge message
-        ch.basic_ack(delivery_tag=method.delivery_tag)
+        Args:
+            article: The rejected article.
+            reason: Reason code returned by the quality gate.
+        '''
+        record = {
+            'raw_filename': article.get('raw_filename'),
+            'site_name': article.get('site_name'),
+            'url': article.get('url'),
+            'title': article.get('title'),
+            'reject_reason': reason,
+            'rejected_at': int(time.time()),
+        }
+        filepath: str = os.path.join(self.reject_dir, f'rejected-{time.strftime("%Y-%m-%d")}.jsonl')
+        with open(filepath, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
 
     def _save_to_file(self, article: Dict[str, Any]) -> None:
         '''
@@ -84,8 +146,12 @@ class PreprocessWorker:
         '''
         Starts consuming messages from the input queue.
 
-        This method listens to the input queue and processes each message using 
+        This method listens to the input queue and processes each message using
         the handle_message callback function.
         '''
         print(f'[PreprocessWorker] Listening on queue: {self.input_queue}')
-        self.rabbit.consume(self.input_queue, callback=self.handle_message)
+        if self.sink is not None:
+            self.sink.start_timer(self.rabbit.connection)
+            self.rabbit.consume(self.input_queue, callback=self.handle_message, prefetch=self.sink.store.batch_rows)
+        else:
+            self.rabbit.consume(self.input_queue, callback=self.handle_message)
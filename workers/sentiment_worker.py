@@ -1,8 +1,12 @@
 import os
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from utils.rabbitmq import RabbitMQClient
+from storage.columnar_store import ColumnarStore
+from storage.search_index import SearchIndex
+from storage.sentiment_index import SentimentIndex
+from workers.columnar_sink import ColumnarSink
 from sentiment_engine.engine import SentimentEngine
 from sentiment_engine.ollama_client import OllamaClient
 from sentiment_engine.gemini_client import GeminiClient
@@ -16,8 +20,10 @@ class SentimentWorker:
     This worker:
         - Consumes cleaned articles from a RabbitMQ queue
         - Runs sentiment analysis using a configurable LLM provider
-        - Saves the enriched output to local storage
-        - Optionally publishes results to a downstream queue
+        - Saves the enriched output to local storage (JSON files or a columnar store)
+        - Upserts the result metadata into the SQLite sentiment index
+        - Adds the article to the Persian full-text search index
+        - Optionally broadcasts finished articles to a fanout exchange (live dashboard updates)
         - Updates the last-processed timestamp for each website
 
     Attributes:
@@ -25,15 +31,24 @@ class SentimentWorker:
             Name of the queue from which cleaned articles are consumed.
         output_queue:
             Name of the queue where sentiment-enriched articles may be published.
+        updates_exchange:
+            Fanout exchange finished articles are broadcast to, or None.
         out_dir:
             Directory where processed articles are saved.
+        sink:
+            Columnar output, or None when one JSON file is written per article.
+        index:
+            SQLite index of the results, or None if disabled.
+        search:
+            Full-text index of the results, or None if disabled.
         rabbit:
             Shared RabbitMQ client for message operations.
         engine:
             High-level LLM sentiment engine performing text analysis.
     '''
 
-    def __init__(self, model_info: dict, input_queue: str = 'clean_news', output_queue: str = 'sentiment_news', out_dir: str = 'data/sentiments'):
+    def __init__(self, model_info: dict, input_queue: str = 'clean_news', output_queue: str = 'sentiment_news', out_dir: str = 'data/sentiments', storage_config: Optional[dict] = None,
+                 updates_exchange: Optional[str] = None):
         '''
         Initialize the SentimentWorker and its underlying components.
 
@@ -48,6 +63,11 @@ class SentimentWorker:
                 Queue name to publish sentiment results to.
             out_dir:
                 Directory where enriched article JSON files will be saved.
+            storage_config:
+                The `storage` section of the settings file (backend, micro-batch
+                sizes, `index_path` and `search_index_path`).
+            updates_exchange:
+                Fanout exchange to broadcast finished articles to (None disables it).
 
         Raises:
             FileNotFoundError:
@@ -56,15 +76,38 @@ class SentimentWorker:
         self.input_queue: str = input_queue
         self.output_queue: str = output_queue
         self.out_dir: str = out_dir
+        self.updates_exchange: Optional[str] = updates_exchange
 
         os.makedirs(self.out_dir, exist_ok=True)
 
+        # Columnar output (acks deferred to the micro-batch flush), or JSON files
+        storage_config = storage_config or {}
+        self.sink: Optional[ColumnarSink] = None
+        if storage_config.get('backend', 'json') == 'columnar':
+            self.sink = ColumnarSink(ColumnarStore(
+                self.out_dir,
+                batch_rows=storage_config.get('batch_rows', 200),
+                flush_seconds=storage_config.get('flush_seconds', 30),
+                compact_every=storage_config.get('compact_every', 20),
+                prefix='sentiment',
+            ))
+
+        # Queryable metadata of the results (time, site and label indexes)
+        index_path: Optional[str] = storage_config.get('index_path')
+        self.index: Optional[SentimentIndex] = SentimentIndex(index_path) if index_path else None
+
+        # Keyword search over the results (hazm-analyzed, segmented by day)
+        search_index_path: Optional[str] = storage_config.get('search_index_path')
+        self.search: Optional[SearchIndex] = SearchIndex(search_index_path) if search_index_path else None
+
         # Singleton RabbitMQ client
         self.rabbit = RabbitMQClient()
 
         # Declare queues (idempotent)
         self.rabbit.declare_queue(self.input_queue)
         self.rabbit.declare_queue(self.output_queue)
+        if self.updates_exchange:
+            self.rabbit.declare_exchange(self.updates_exchange)
 
         # INIT SENTIMENT ENGINE
         prompt_template = open(model_info['prompt_template_path']).read()
@@ -85,9 +128,10 @@ class SentimentWorker:
         Steps:
             1. Perform sentiment analysis using the LLM engine
             2. Attach sentiment results to the article object
-            3. Save the enriched article locally
-            4. Update the last processed timestamp for the article's website
-            5. Acknowledge the message in RabbitMQ
+            3. Save the enriched article locally and add it to the indexes
+            4. Acknowledge the message in RabbitMQ (in columnar mode, once
+               its micro-batch is written)
+            5. Broadcast the article to the live updates exchange
 
         Args:
             ch: RabbitMQ channel object for acknowledgment.
@@ -110,11 +154,37 @@ class SentimentWorker:
 
         article['sentiment'] = sentiment_result
 
-        self._save_to_file(article)
+        key: str = article['raw_filename']
+        if self.index is not None:
+            self.index.upsert(key, article)
+        if self.search is not None:
+            self.search.add(key, article)
+
+        if self.sink is not None:
+            self.sink.save(ch, method, article.pop('raw_filename'), article)
+        else:
+            self._save_to_file(article)
+            ch.basic_ack(delivery_tag=method.delivery_tag)
 
-        # self.rabbit.publish(self.output_queue, article)
+        self._broadcast(key, article)
+
+    def _broadcast(self, key: str, article: Dict[str, Any]) -> None:
+        '''
+        Notify live subscribers (the dashboard) of a finished article.
 
-        ch.basic_ack(delivery_tag=method.delivery_tag)
+        Failures are logged only: the article is already stored, and
+        subscribers re-scan the storage periodically.
+
+        Args:
+            key: Article key (the raw file name).
+            article: The stored article.
+        '''
+        if not self.updates_exchange:
+            return
+        try:
+            self.rabbit.broadcast(self.updates_exchange, dict(article, filename=f'{key}.json'))
+        except Exception as e:
+            print(f'[SentimentWorker] Broadcast of {key} failed: {e}')
 
     def _save_to_file(self, article: Dict[str, Any]) -> None:
         '''
@@ -142,4 +212,8 @@ class SentimentWorker:
         The worker will listen indefinitely and process messages using `handle_message`.
         '''
         print(f'[SentimentWorker] Listening on queue: {self.input_queue}')
-        self.rabbit.consume(self.input_queue, callback=self.handle_message)
+        if self.sink is not None:
+            self.sink.start_timer(self.rabbit.connection)
+            self.rabbit.consume(self.input_queue, callback=self.handle_message, prefetch=self.sink.store.batch_rows)
+        else:
+            self.rabbit.consume(self.input_queue, callback=self.handle_message)